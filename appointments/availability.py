@@ -0,0 +1,139 @@
+from django.db.models import QuerySet
+from django.db import transaction
+from django.conf import settings
+
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Iterable, Optional
+from zoneinfo import ZoneInfo
+import threading
+import time
+
+from services.models import Service
+
+from .slots import free_slots
+
+
+def window(first_day: date, last_day: date) -> list[date]:
+    return [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+
+
+def compute_free_slots(location_ids: Iterable[int], days: list[date]) -> dict[tuple[int, date], list[dict]]:
+    """
+    the free slots of every service of the locations, grouped by (location, day), in one query
+    the day before is generated too, for the slots after midnight of an overnight opening
+    """
+    services = Service.objects.filter(provider_location__in=location_ids)
+    slots = free_slots(services, days[0] - timedelta(days=1), days[-1], None)
+    
+    grouped = {(location_id, day): [] for location_id in location_ids for day in days}
+    for slot in slots:
+        key = (slot["location_id"], slot["date"])
+        if key in grouped:
+            grouped[key].append(slot)
+    
+    return grouped
+
+
+class AvailabilityCache:
+    """
+    process local cache [(location id, day) => free slots of every service of the location]
+    
+    appointments.signals invalidates a location day after an appointment of it changes, and all the
+    days of a location after its opening hours or its services change; the ttl bounds how long
+    another process keeps an old entry, max_entries how many are kept (the oldest go first)
+    a search over more than max_locations doesn't go through the cache (see earliest_free_slots)
+    """
+    
+    def __init__(
+        self, ttl: float = 60, max_entries: int = 10000, max_locations: int = 20
+        , clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_locations = max_locations
+        self.clock = clock
+        self.generation = 0
+        self.entries: dict[tuple[int, date], tuple[float, list[dict]]] = {}
+        self.lock = threading.Lock()
+    
+    def slots(self, location_ids: list[int], first_day: date, last_day: date) -> dict[tuple[int, date], list[dict]]:
+        days = window(first_day, last_day)
+        keys = [(location_id, day) for location_id in location_ids for day in days]
+        
+        with self.lock:
+            now = self.clock()
+            found = {
+                key: entry[1] for key in keys
+                if (entry := self.entries.get(key)) is not None and entry[0] > now}
+            generation = self.generation
+        
+        missing = sorted({location_id for location_id, day in keys if (location_id, day) not in found})
+        if not missing:
+            return found
+        
+        computed = compute_free_slots(missing, days)
+        
+        with self.lock:
+            # an invalidation while computing makes these results old already, don't keep them
+            if self.generation == generation:
+                self.store(computed)
+        
+        return {**found, **computed}
+    
+    def store(self, computed: dict[tuple[int, date], list[dict]]) -> None:
+        """
+        the entries are kept in the order they were stored, the expired then the oldest ones are dropped
+        """
+        now = self.clock()
+        self.entries = {key: entry for key, entry in self.entries.items() if entry[0] > now and key not in computed}
+        self.entries.update({key: (now + self.ttl, slots) for key, slots in computed.items()})
+        
+        for key in list(self.entries)[:max(len(self.entries) - self.max_entries, 0)]:
+            del self.entries[key]
+    
+    def invalidate(self, location_id: int, day: Optional[date] = None) -> None:
+        with self.lock:
+            self.generation += 1
+            if day is not None:
+                self.entries.pop((location_id, day), None)
+                return
+            
+            for key in [key for key in self.entries if key[0] == location_id]:
+                del self.entries[key]
+    
+    def clear(self) -> None:
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+
+
+availability_cache = AvailabilityCache(**getattr(settings, "APPOINTMENT_AVAILABILITY", {}))
+
+
+def invalidate_on_commit(location_id: Optional[int], day: Optional[date] = None) -> None:
+    if location_id is not None:
+        transaction.on_commit(lambda: availability_cache.invalidate(location_id, day))
+
+
+def earliest_free_slots(services: QuerySet, first_day: date, last_day: date, limit: int) -> list[dict[str, Any]]:
+    """
+    the earliest `limit` free slots among the services
+    a few locations are read through the cache, a wider search is one query that keeps only
+    the earliest `limit` slots in the database
+    """
+    locations = dict(services.values_list("id", "provider_location"))
+    location_ids = sorted(set(locations.values()))
+    
+    if len(location_ids) > availability_cache.max_locations:
+        return free_slots(services, first_day, last_day, limit)
+    
+    by_location = availability_cache.slots(location_ids, first_day, last_day)
+    
+    # cached slots may have started since they were computed
+    now = datetime.now(ZoneInfo(settings.TIME_ZONE)).replace(tzinfo=None)
+    
+    slots = [
+        slot for location_slots in by_location.values() for slot in location_slots
+        if slot["service_id"] in locations and datetime.combine(slot["date"], slot["from_time"]) >= now]
+    slots.sort(key=lambda slot: (slot["date"], slot["from_time"], slot["service_id"]))
+    
+    return slots[:limit]
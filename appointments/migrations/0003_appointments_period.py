@@ -0,0 +1,45 @@
+# Generated by Django 4.2.6 on 2026-10-18 17:05
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.conf import settings
+from django.db import migrations, models
+
+
+# same ranges as appointments.models.appointment_period; an appointment overlapping an older one
+# of its service keeps a null period (not checked by the constraint) instead of failing the migration
+FILL_PERIOD = """
+UPDATE appointments_appointments AS appointment SET period = tstzrange(
+    (appointment.date + appointment.from_time) AT TIME ZONE %s
+    , (appointment.date + appointment.to_time) AT TIME ZONE %s
+    , '[)')
+WHERE appointment.to_time > appointment.from_time
+    AND (appointment.status = 'rejected' OR NOT EXISTS (
+        SELECT 1 FROM appointments_appointments AS older
+        WHERE older.service_id = appointment.service_id AND older.id < appointment.id
+            AND older.status <> 'rejected' AND older.date = appointment.date
+            AND older.from_time < appointment.to_time AND appointment.from_time < older.to_time))
+"""
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('appointments', '0002_appointments_diagonsis'),
+    ]
+    
+    operations = [
+        # equality on service_id in a GiST index
+        BtreeGistExtension(),
+        migrations.AddField(
+            model_name='appointments',
+            name='period',
+            field=django.contrib.postgres.fields.ranges.DateTimeRangeField(null=True),
+        ),
+        migrations.RunSQL([(FILL_PERIOD, [settings.TIME_ZONE, settings.TIME_ZONE])], migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='appointments',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('status', 'rejected'), _negated=True), expressions=[('service', '='), ('period', '&&')], name='appointment_no_overlap'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.6 on 2026-10-18 18:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# same counters as the rebuild_dashboard_counters command
+FILL_COUNTERS = """
+INSERT INTO appointments_appointmentcounters (provider_id, all_count, pending, accepted, rejected, day, day_count)
+SELECT location.service_provider_id
+    , COUNT(*)
+    , COUNT(*) FILTER (WHERE appointment.status = 'pending')
+    , COUNT(*) FILTER (WHERE appointment.status = 'accepted')
+    , COUNT(*) FILTER (WHERE appointment.status = 'rejected')
+    , (now() AT TIME ZONE %s)::date
+    , COUNT(*) FILTER (WHERE (appointment.created_at AT TIME ZONE %s)::date = (now() AT TIME ZONE %s)::date)
+FROM appointments_appointments AS appointment
+JOIN services_service AS service ON service.id = appointment.service_id
+JOIN service_providers_serviceproviderlocations AS location ON location.id = service.provider_location_id
+GROUP BY location.service_provider_id
+"""
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('service_providers', '0003_serviceproviderlocations_open_minutes'),
+        ('appointments', '0003_appointments_period'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='AppointmentCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('all_count', models.IntegerField(default=0)),
+                ('pending', models.IntegerField(default=0)),
+                ('accepted', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('day', models.DateField(null=True)),
+                ('day_count', models.IntegerField(default=0)),
+                ('provider', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='appointment_counters', to='service_providers.serviceprovider')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunSQL([(FILL_COUNTERS, [settings.TIME_ZONE] * 3)], migrations.RunSQL.noop),
+    ]
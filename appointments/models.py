@@ -1,7 +1,15 @@
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeOperators
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.utils.timezone import make_aware
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+
+from datetime import date, datetime, time
 
 from services.models import Service
+from service_providers.models import ServiceProvider
+from utils.status_counters import StatusCounters
 
 
 
@@ -19,14 +27,57 @@ class Appointments(models.Model):
     from_time = models.TimeField(null=False)
     to_time = models.TimeField(null=False)
     date = models.DateField(null=False)
+    # [date from_time, date to_time) in the project time zone, set by save() (see appointment_period)
+    period = DateTimeRangeField(null=True)
     status = models.CharField(
         max_length=15, choices=AppointmentStatus.choices, null=False
         , default=AppointmentStatus.PENDING)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        constraints = [
+            # two appointments of a service can't overlap unless one of them is rejected,
+            # checked by the database so concurrent bookings can't both be saved
+            ExclusionConstraint(
+                name="appointment_no_overlap"
+                , expressions=[("service", RangeOperators.EQUAL), ("period", RangeOperators.OVERLAPS), ]
+                , condition=~models.Q(status="rejected")),
+        ]
+    
     def __str__(self) -> str:
         return f"{self.service.en_title}, user: {self.user.email}"
+    
+    def save(self, *args, **kwargs) -> None:
+        self.period = appointment_period(self.date, self.from_time, self.to_time)
+        
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"date", "from_time", "to_time"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "period"}
+        
+        # appointments.signals locks the row in pre_save until the counters are updated in post_save
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+def appointment_period(day: date, from_time: time, to_time: time) -> DateTimeTZRange:
+    start, end = datetime.combine(day, from_time), datetime.combine(day, to_time)
+    if settings.USE_TZ:
+        start, end = make_aware(start), make_aware(end)
+    
+    # without USE_TZ the database session is in TIME_ZONE, so naive bounds are local times too
+    return DateTimeTZRange(start, end, "[)")
+
+
+class AppointmentCounters(StatusCounters):
+    """
+    appointments of a provider by status, kept up to date by appointments.signals
+    rebuild all records with: python manage.py rebuild_dashboard_counters
+    """
+    provider = models.OneToOneField(ServiceProvider, on_delete=models.CASCADE, related_name="appointment_counters")
+    
+    def __str__(self) -> str:
+        return f"{self.provider_id} -> all: {self.all_count}, pending: {self.pending}"
 
 
 class RejectedAppointments(models.Model):
@@ -1,6 +1,13 @@
 from rest_framework import serializers
 
+from django.db import transaction, IntegrityError
+
 from .models import Appointments, RejectedAppointments
+from . import slots
+from utils.query_plan import RelatedPathsMixin
+
+# postgres exclusion_violation, raised by the appointment_no_overlap constraint
+EXCLUSION_VIOLATION = "23P01"
 
 
 
@@ -8,7 +15,8 @@ class AppointmentSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Appointments
-        fields = "__all__"
+        # period is computed from date, from_time and to_time
+        exclude = ("period", )
     
     def __init__(self, instance=None, data=..., **kwargs):
         language = kwargs.get("language")
@@ -19,6 +27,30 @@ class AppointmentSerializer(serializers.ModelSerializer):
         
         super().__init__(instance, data, **kwargs)
     
+    def validate(self, attrs):
+        from_time = attrs.get("from_time", getattr(self.instance, "from_time", None))
+        to_time = attrs.get("to_time", getattr(self.instance, "to_time", None))
+        service = attrs.get("service", getattr(self.instance, "service", None))
+        
+        if from_time >= to_time:
+            raise serializers.ValidationError({"error": "to_time should be after from_time"})
+        
+        if not slots.within_opening_hours(service.provider_location, from_time, to_time):
+            raise serializers.ValidationError({"error": "the appointment is out of the location opening hours"})
+        
+        return attrs
+    
+    def save(self, **kwargs):
+        # the overlap is checked by the database, in a savepoint so the request transaction can go on
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError as error:
+            if getattr(error.__cause__, "sqlstate", None) != EXCLUSION_VIOLATION:
+                raise
+            
+            raise serializers.ValidationError({"error": "this time is already booked for this service"})
+    
     def to_representation(self, instance: Appointments):
         original_repr =  super().to_representation(instance)
         original_repr["user_email"] = instance.user.email
@@ -31,7 +63,8 @@ class AppointmentSerializer(serializers.ModelSerializer):
         return original_repr
 
 
-class ShowAppointmentsSerializer(serializers.ModelSerializer):
+class ShowAppointmentsSerializer(RelatedPathsMixin, serializers.ModelSerializer):
+    select_related_paths = ("user", "service__provider_location__service_provider", )
     
     class Meta:
         model = Appointments
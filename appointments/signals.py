@@ -0,0 +1,92 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from typing import Optional
+
+from service_providers.models import ServiceProviderLocations
+from services.models import Service
+from utils.status_counters import Changes, apply_changes, local_today
+
+from . import models
+from .availability import invalidate_on_commit
+
+
+
+# the appointment as it was before the update, memo from pre_save for post_save
+PREVIOUS_ATTRIBUTE = "_previous_state"
+
+
+def service_place(service_id: int) -> tuple[Optional[int], Optional[int]]:
+    """
+    (location id, provider id) of the service
+    """
+    place = Service.objects.filter(id=service_id).values_list(
+        "provider_location", "provider_location__service_provider").first()
+    return place or (None, None)
+
+
+def count(provider_id: Optional[int], old: Optional[str], new: Optional[str], create: bool = True) -> None:
+    if provider_id is not None:
+        changes = Changes()
+        changes.transition(provider_id, old, new)
+        apply_changes(models.AppointmentCounters, changes, local_today(), create=create)
+
+
+@receiver(pre_save, sender=models.Appointments)
+def remember_previous_state(sender, instance: models.Appointments, raw: bool = False, **kwargs):
+    """
+    the day, service or status of an appointment may be changed: its old day is free again
+    and its old status is counted one less
+    """
+    if raw or instance.pk is None:
+        return
+    
+    # locked until the save commits (Appointments.save is atomic): a concurrent update of the same
+    # appointment waits and then reads this one's status, so a transition is never counted twice
+    previous = sender.objects.select_for_update(of=("self", )).filter(pk=instance.pk).values_list(
+        "service", "service__provider_location", "service__provider_location__service_provider"
+        , "date", "status").first()
+    instance.__dict__[PREVIOUS_ATTRIBUTE] = previous
+    
+    if previous is not None:
+        invalidate_on_commit(previous[1], previous[3])
+
+
+@receiver(post_save, sender=models.Appointments)
+def appointment_saved(sender, instance: models.Appointments, created: bool, raw: bool = False, **kwargs):
+    if raw:
+        return
+    
+    previous = instance.__dict__.pop(PREVIOUS_ATTRIBUTE, None)
+    if previous is not None and previous[0] == instance.service_id:
+        location_id, provider_id = previous[1], previous[2]
+        count(provider_id, previous[4], instance.status)
+    else:
+        location_id, provider_id = service_place(instance.service_id)
+        if previous is not None:
+            # moved to a service of another provider
+            count(previous[2], previous[4], None)
+        count(provider_id, None, instance.status)
+    
+    invalidate_on_commit(location_id, instance.date)
+
+
+@receiver(post_delete, sender=models.Appointments)
+def appointment_deleted(sender, instance: models.Appointments, **kwargs):
+    location_id, provider_id = service_place(instance.service_id)
+    # don't create the counters here, the provider itself may be in the middle of a cascade delete
+    count(provider_id, instance.status, None, create=False)
+    invalidate_on_commit(location_id, instance.date)
+
+
+@receiver(post_save, sender=ServiceProviderLocations)
+def invalidate_location_availability(sender, instance: ServiceProviderLocations, raw: bool = False, **kwargs):
+    # opening hours
+    if not raw:
+        invalidate_on_commit(instance.id)
+
+
+@receiver([post_save, post_delete], sender=Service)
+def invalidate_service_availability(sender, instance: Service, raw: bool = False, **kwargs):
+    if not raw:
+        invalidate_on_commit(instance.provider_location_id)
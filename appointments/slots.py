@@ -0,0 +1,109 @@
+from rest_framework import exceptions
+
+from django.db.models import QuerySet
+from django.db import connection
+from django.conf import settings
+
+from datetime import date, datetime, time, timedelta
+from typing import Any, Optional
+from zoneinfo import ZoneInfo
+
+from service_providers.models import ServiceProviderLocations
+
+
+# every slot of every day of the window in the location opening hours, minus the slots
+# overlapping a pending or accepted appointment of the service (the exclusion constraint GiST index)
+FREE_SLOTS = """
+WITH days AS (
+    SELECT day::date AS day FROM generate_series(%s::date, %s::date, interval '1 day') AS day
+), slots AS (
+    SELECT service.id AS service_id, location.id AS location_id
+        , tstzrange(start, start + %s, '[)') AS period
+    FROM services_service AS service
+    JOIN service_providers_serviceproviderlocations AS location ON location.id = service.provider_location_id
+    CROSS JOIN days
+    CROSS JOIN LATERAL generate_series(
+        (days.day + location.opening) AT TIME ZONE %s
+        , ((days.day + location.closing
+            + CASE WHEN location.closing <= location.opening THEN interval '1 day' ELSE interval '0' END
+            ) AT TIME ZONE %s) - %s
+        , %s) AS start
+    WHERE service.id IN ({services})
+)
+SELECT slots.service_id, slots.location_id
+    , lower(slots.period) AT TIME ZONE %s, upper(slots.period) AT TIME ZONE %s
+FROM slots
+WHERE lower(slots.period) >= now() AND NOT EXISTS (
+    SELECT 1 FROM appointments_appointments AS appointment
+    WHERE appointment.service_id = slots.service_id AND appointment.status <> 'rejected'
+        AND appointment.period && slots.period)
+ORDER BY lower(slots.period), slots.service_id
+LIMIT %s
+"""
+
+
+def slot_length() -> timedelta:
+    return timedelta(minutes=settings.APPOINTMENT_SLOTS["slot_minutes"])
+
+
+def free_slots(
+    services: QuerySet, first_day: date, last_day: date, limit: Optional[int]) -> list[dict[str, Any]]:
+    """
+    the earliest free slots of the services, from first_day to last_day included, in one query
+    (all of them when limit is None)
+    returns [{service_id, location_id, date, from_time, to_time}] in the project time zone
+    """
+    services_sql, services_params = services.order_by().values("id").query.sql_with_params()
+    slot, time_zone = slot_length(), settings.TIME_ZONE
+    
+    params = [
+        first_day, last_day, slot, time_zone, time_zone, slot, slot
+        , *services_params, time_zone, time_zone, limit]
+    
+    with connection.cursor() as cursor:
+        cursor.execute(FREE_SLOTS.format(services=services_sql), params)
+        rows = cursor.fetchall()
+    
+    return [
+        {
+            "service_id": service_id
+            , "location_id": location_id
+            , "date": start.date()
+            , "from_time": start.time()
+            , "to_time": end.time()
+        }
+        for service_id, location_id, start, end in rows
+    ]
+
+
+def requested_days(query_params: dict[str, Any]) -> tuple[date, date]:
+    """
+    ?from=YYYY-MM-DD (default today) and ?days=N (default 7, at most APPOINTMENT_SLOTS max_days)
+    """
+    try:
+        first_day = (
+            date.fromisoformat(query_params["from"]) if query_params.get("from")
+            else datetime.now(ZoneInfo(settings.TIME_ZONE)).date())
+        days = int(query_params.get("days", 7))
+    except ValueError:
+        raise exceptions.ValidationError({"error": "from should be YYYY-MM-DD and days a number"})
+    
+    max_days = settings.APPOINTMENT_SLOTS["max_days"]
+    if not 1 <= days <= max_days:
+        raise exceptions.ValidationError({"error": f"days should be between 1 and {max_days}"})
+    
+    return first_day, first_day + timedelta(days=days - 1)
+
+
+def within_opening_hours(location: ServiceProviderLocations, from_time: time, to_time: time) -> bool:
+    """
+    the appointment is inside the opening hours, on the same day or after midnight of an overnight opening
+    """
+    opening = location.open_minutes
+    if opening is None:
+        return True
+    
+    start, end = from_time.hour * 60 + from_time.minute, to_time.hour * 60 + to_time.minute
+    
+    return any(
+        opening.lower <= start + shift and end + shift <= opening.upper for shift in (0, 24 * 60))
@@ -1,3 +1,41 @@
-from django.test import TestCase
+from hypothesis.extra.django import TestCase
 
-# Create your tests here.
+from datetime import date, time
+
+from appointments.availability import AvailabilityCache
+from appointments.slots import within_opening_hours
+from service_providers.models import ServiceProviderLocations, opening_minutes
+
+
+def location(opening: time, closing: time) -> ServiceProviderLocations:
+    return ServiceProviderLocations(
+        opening=opening, closing=closing, open_minutes=opening_minutes(opening, closing))
+
+
+class TestOpeningHours(TestCase):
+    def test_inside_the_day(self):
+        day = location(time(9), time(17))
+        
+        assert within_opening_hours(day, time(9), time(9, 30))
+        assert within_opening_hours(day, time(16, 30), time(17))
+        assert not within_opening_hours(day, time(8, 30), time(9, 30))
+        assert not within_opening_hours(day, time(16, 45), time(17, 15))
+    
+    def test_overnight_opening(self):
+        night = location(time(20), time(2))
+        
+        assert within_opening_hours(night, time(22), time(23))
+        assert within_opening_hours(night, time(0, 30), time(1))
+        assert not within_opening_hours(night, time(2), time(3))
+        assert not within_opening_hours(night, time(12), time(13))
+
+
+class TestAvailabilityCacheBound(TestCase):
+    def test_oldest_entries_are_dropped_past_max_entries(self):
+        cache = AvailabilityCache(ttl=60, max_entries=2, clock=lambda: 0.0)
+        days = [date(2026, 10, day) for day in (18, 19, 20)]
+        
+        for day in days:
+            cache.store({(1, day): []})
+        
+        assert list(cache.entries) == [(1, days[1]), (1, days[2])]
@@ -16,6 +16,9 @@ urlpatterns = [
     re_path(r"^provider/(\d{1,})?$"
             , appointments_views.all_provider_appointments, name="all_provider_appointments"),
     
+    path("slots/<int:service_id>/", appointments_views.service_free_slots, name="service_free_slots"),
+    path("availability/", appointments_views.available_slots, name="available_slots"),
+    
     path("location/<int:location_id>/"
         , appointments_views.all_location_appointments, name="location_appointments"),
     
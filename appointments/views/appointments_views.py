@@ -2,14 +2,19 @@ from rest_framework import status, decorators
 from rest_framework.response import Response
 from rest_framework import generics
 
-from django.db.models import Count, Q
 from django.http import HttpRequest
+from django.conf import settings
 
 from typing import Optional
 
 from utils.permission import authorization_with_method
-from appointments import models, serializers
-from notification.models import Notification
+from appointments import models, serializers, slots
+from appointments.availability import earliest_free_slots
+from services.models import Service
+from utils import geo
+from utils.status_counters import counts_of, local_today
+from core.pagination_classes.cursor_paginator import cursor_paginated_response
+from notification.dispatcher import notify
 
 
 
@@ -31,7 +36,7 @@ class CreateAppointment(generics.CreateAPIView):
         instance = self.perform_create(serializer)
         headers = self.get_success_headers(serializer.data)
         
-        Notification.objects.create(
+        notify(
             sender=request.user.email, sender_type="User"
             , receiver=instance.service.provider_location.service_provider.email
             , receiver_type="Service_Provider"
@@ -71,7 +76,7 @@ class AppointmentRUD(generics.RetrieveUpdateDestroyAPIView):
         if request.data.get("status"):
             ar_word = "مقبول" if request.data.get("status") == "accepted" else "مرفوض"
             business_name = instance.service.provider_location.service_provider.business_name
-            Notification.objects.create(
+            notify(
                 receiver_type="User", receiver=instance.user
                 , sender_type="Service_Provider", sender=business_name
                 , ar_content=f"موعدك {ar_word} مع {business_name}"
@@ -80,6 +85,52 @@ class AppointmentRUD(generics.RetrieveUpdateDestroyAPIView):
         return Response(serializer.data)
 
 
+@decorators.api_view(["GET", ])
+def service_free_slots(request: HttpRequest, service_id: int):
+    """
+    bookable slots of a service: its location opening hours cut in APPOINTMENT_SLOTS slot_minutes
+    minus the pending and accepted appointments
+    query_params = {from: YYYY-MM-DD, days: number}
+    """
+    first_day, last_day = slots.requested_days(request.query_params)
+    services = Service.objects.filter(id=service_id)
+    limit = settings.APPOINTMENT_SLOTS["max_slots"]
+    
+    return Response(slots.free_slots(services, first_day, last_day, limit), status=status.HTTP_200_OK)
+
+
+@decorators.api_view(["GET", ])
+def available_slots(request: HttpRequest):
+    """
+    the earliest free slots of a category services, across every location
+    query_params = {category: id (required), from: YYYY-MM-DD, days: number, limit: number
+                    , location_id: id or longitude, latitude & radius: meters}
+    the free slots of a location day are cached (appointments.availability)
+    """
+    query_params = request.query_params
+    if not query_params.get("category", "").isdigit():
+        return Response({"error": "category parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    limit = query_params.get("limit", "20")
+    if not limit.isdigit() or int(limit) < 1:
+        return Response({"error": "limit should be a positive number"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    first_day, last_day = slots.requested_days(query_params)
+    services = Service.objects.filter(category=query_params.get("category"))
+    
+    if query_params.get("location_id"):
+        services = services.filter(provider_location=query_params.get("location_id"))
+    
+    longitude, latitude = query_params.get("longitude"), query_params.get("latitude")
+    if longitude and latitude:
+        point, radius = geo.point_from(longitude, latitude), geo.radius_from(query_params.get("radius"))
+        services = services.filter(geo.within("provider_location__location", point, radius))
+    
+    limit = min(int(limit), settings.APPOINTMENT_SLOTS["max_slots"])
+    
+    return Response(earliest_free_slots(services, first_day, last_day, limit), status=status.HTTP_200_OK)
+
+
 @decorators.api_view(["GET", ])
 @authorization_with_method("view", "appointments")
 def all_location_appointments(request: HttpRequest, location_id: int):
@@ -121,6 +172,11 @@ def all_user_appointments(request: HttpRequest, user_id: Optional[int]):
 @decorators.api_view(["GET", ])
 @authorization_with_method("view", "appointments")
 def provider_appointments_dashborad(req: HttpRequest):
+    """
+    the provider counters (one row, see appointments.models.AppointmentCounters)
+    and the first page of its appointments, the next pages are loaded with the cursor links
+    today is the number of appointments booked today
+    """
     # this trick because maybe admin want to see or provider
     language = req.META.get("Accept-Language")
     provider_id = req.query_params.get("provider_id")
@@ -132,12 +188,9 @@ def provider_appointments_dashborad(req: HttpRequest):
     queryset = models.Appointments.objects.filter(
         service__provider_location__service_provider=provider_id)
     
-    stats = queryset.aggregate(
-        all=Count("id"), rejected=Count("id", filter=Q(status="rejected")),
-        accepted=Count("id", filter=Q(status="accepted")),
-        pended=Count("id", filter=Q(status="pending")))
+    counts = counts_of(models.AppointmentCounters, provider_id, local_today())
     
-    if req.query_params.get("appointment_stauts"):
+    if req.query_params.get("appointment_status"):
         appointment_status = req.query_params.get("appointment_status")
         if appointment_status not in ["pending", "accepted", "rejected"]:
             return Response(
@@ -147,13 +200,13 @@ def provider_appointments_dashborad(req: HttpRequest):
         appointment_filter = appointment_status
         queryset = queryset.filter(status=appointment_filter)
     
-    serializer = serializers.ShowAppointmentsSerializer(queryset, many=True, language=language)
-    
     response_data = {
         "stats": {
-            "all": stats["all"], "rejected": stats["rejected"],
-            "accepted": stats["accepted"], "pended": stats["pended"]
+            "all": counts["all"], "rejected": counts["rejected"],
+            "accepted": counts["accepted"], "pended": counts["pending"],
+            "today": counts["today"]
             },
-        "appointments": serializer.data
+        "appointments": cursor_paginated_response(
+            req, queryset, serializers.ShowAppointmentsSerializer, language=language).data
     }
     return Response(data=response_data, status=status.HTTP_200_OK)
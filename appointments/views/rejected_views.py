@@ -9,7 +9,7 @@ from typing import Optional
 from appointments import models, serializers
 
 from utils.permission import authorization_with_method
-from notification.models import Notification
+from notification.dispatcher import notify
 
 
 
@@ -25,7 +25,7 @@ class CreateRejectedAppointment(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         resp = super().create(request, *args, **kwargs)
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver="System", receiver_type="System"
             , en_content="A new rejected order added"
@@ -0,0 +1,69 @@
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Optional
+import json
+import os
+
+
+BUDGETS_FILE = Path(__file__).with_name("budgets.json")
+
+# BENCHMARK_UPDATE_BUDGETS=1 rewrites budgets.json from the measured run
+UPDATE_BUDGETS = os.getenv("BENCHMARK_UPDATE_BUDGETS") == "1"
+
+# wall time depends on the machine, queries don't, so only the time gets headroom
+TIME_FACTOR = float(os.getenv("BENCHMARK_TIME_FACTOR", "1.5"))
+BYTES_FACTOR = 1.1
+
+
+@dataclass
+class Measure:
+    status: int
+    queries: int
+    time_ms: float
+    bytes: int
+
+
+# filled by the tests, read by the terminal summary and the budgets update
+RESULTS: dict[str, Measure] = {}
+
+
+def load_budgets() -> dict[str, Optional[dict]]:
+    with open(BUDGETS_FILE, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_budgets(results: dict[str, Measure]) -> None:
+    budgets = load_budgets()
+    for name, measure in results.items():
+        budgets[name] = {
+            "queries": measure.queries
+            , "time_ms": round(measure.time_ms)
+            , "bytes": measure.bytes
+        }
+    
+    with open(BUDGETS_FILE, "w", encoding="utf-8") as file:
+        json.dump(dict(sorted(budgets.items())), file, indent=4)
+        file.write("\n")
+
+
+def over_budget(measure: Measure, budget: dict) -> list[str]:
+    """
+    returns a message for every limit the measure exceeds
+    """
+    errors = []
+    
+    if measure.queries > budget["queries"]:
+        errors.append(f"queries: {measure.queries} > {budget['queries']}")
+    
+    if measure.time_ms > budget["time_ms"] * TIME_FACTOR:
+        errors.append(f"time: {measure.time_ms:.0f}ms > {budget['time_ms']}ms x {TIME_FACTOR}")
+    
+    if measure.bytes > budget["bytes"] * BYTES_FACTOR:
+        errors.append(f"bytes: {measure.bytes} > {budget['bytes']} x {BYTES_FACTOR}")
+    
+    return errors
+
+
+def write_report(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({name: asdict(measure) for name, measure in RESULTS.items()}, file, indent=4)
@@ -0,0 +1,67 @@
+from rest_framework.test import APIClient
+
+import pytest
+import os
+
+from .budget import RESULTS, UPDATE_BUDGETS, load_budgets, save_budgets, write_report
+from .dataset import Dataset
+
+
+@pytest.fixture(scope="session")
+def dataset(django_db_setup, django_db_blocker) -> Dataset:
+    """
+    seeded once per run, the test database is dropped at the end of the session
+    """
+    with django_db_blocker.unblock():
+        return Dataset().build()
+
+
+@pytest.fixture
+def clients(dataset: Dataset) -> dict[str, APIClient]:
+    admin, patient = APIClient(), APIClient()
+    admin.force_authenticate(dataset.admin)
+    patient.force_authenticate(dataset.patients[0])
+    
+    return {"admin": admin, "patient": patient}
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    """
+    after the -m / -k deselection: the run stops before seeding the dataset when a selected endpoint
+    has no recorded budget, with the list to record instead of one failure per endpoint
+    """
+    if UPDATE_BUDGETS:
+        return
+    
+    budgets = load_budgets()
+    unrecorded = sorted({
+        item.callspec.params["name"] for item in items
+        if item.get_closest_marker("benchmark") and hasattr(item, "callspec")
+        and budgets.get(item.callspec.params.get("name")) is None})
+    
+    if unrecorded:
+        raise pytest.UsageError(
+            f"{len(unrecorded)} endpoints have no recorded budget ({', '.join(unrecorded)}), "
+            "record them against the PostGIS test database with: "
+            "BENCHMARK_UPDATE_BUDGETS=1 pytest benchmarks -m benchmark")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if UPDATE_BUDGETS and RESULTS:
+        save_budgets(RESULTS)
+    
+    # BENCHMARK_REPORT=<path> keeps the raw measures of the run
+    if os.getenv("BENCHMARK_REPORT") and RESULTS:
+        write_report(os.getenv("BENCHMARK_REPORT"))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not RESULTS:
+        return
+    
+    terminalreporter.section("endpoints benchmark")
+    terminalreporter.write_line(f"{'endpoint':<36}{'status':>8}{'queries':>10}{'time ms':>10}{'bytes':>12}")
+    for name, measure in RESULTS.items():
+        terminalreporter.write_line(
+            f"{name:<36}{measure.status:>8}{measure.queries:>10}{measure.time_ms:>10.0f}{measure.bytes:>12}")
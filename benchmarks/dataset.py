@@ -0,0 +1,282 @@
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.contrib.gis.geos import Point
+
+from datetime import date, time, timedelta
+from decimal import Decimal
+from io import StringIO
+import random
+import os
+
+from category.models import Category
+from service_providers.models import ServiceProvider, ServiceProviderLocations, opening_minutes
+from products.models import Product, ProductRates
+from services.models import Service, ServiceRates
+from orders.models import Orders, OrderItem, CartItems, RejectedOrders
+from appointments.models import Appointments, RejectedAppointments, appointment_period
+from deliveries.models import Delivery
+from notification.models import Notification
+from notification.inbox import rebuild_unread_counters
+
+
+Users = get_user_model()
+
+# BENCHMARK_SCALE=2 doubles every table
+SCALE = int(os.getenv("BENCHMARK_SCALE", "1"))
+
+PROVIDERS = 1000 * SCALE
+PATIENTS = 500 * SCALE
+LOCATIONS_PER_PROVIDER = 2
+PRODUCTS_PER_LOCATION = 2
+SERVICES_PER_LOCATION = 2
+RATES_PER_RECORD = 3
+ORDERS = 2000 * SCALE
+ITEMS_PER_ORDER = 2
+APPOINTMENTS = 4000 * SCALE
+NOTIFICATIONS = 5000 * SCALE
+BATCH_SIZE = 1000
+
+# dubai area, so the distance endpoints have something to sort
+CENTER = (55.2708, 25.2048)
+
+# permissions checked by authorization_with_method that no model defines
+LIST_PERMISSIONS = {
+    "list_orders": Orders
+    , "list_orderitems": OrderItem
+    , "list_servicerates": ServiceRates
+    , "list_appointments": Appointments
+    , "list_rejectedappointments": RejectedAppointments
+}
+
+
+class Dataset:
+    """
+    deterministic synthetic data for the benchmark suite
+    ids of the records used in the endpoints urls are kept on the instance
+    """
+    
+    def __init__(self, seed: int = 2024) -> None:
+        self.random = random.Random(seed)
+        self.password = make_password("benchmark_password")
+    
+    def build(self) -> "Dataset":
+        self.create_admin()
+        self.create_categories()
+        self.create_providers()
+        self.create_locations()
+        self.create_products()
+        self.create_services()
+        self.create_patients()
+        self.create_rates()
+        self.create_orders()
+        self.create_appointments()
+        self.create_notifications()
+        
+        # bulk_create skips the signals that keep these tables in sync
+        call_command("rebuild_rates_summary", batch_size=BATCH_SIZE, stdout=StringIO())
+        call_command("rebuild_search_index", batch_size=BATCH_SIZE, stdout=StringIO())
+        call_command("rebuild_dashboard_counters", batch_size=BATCH_SIZE, stdout=StringIO())
+        call_command("rebuild_daily_sales", batch_size=BATCH_SIZE, stdout=StringIO())
+        call_command("rebuild_platform_counters", stdout=StringIO())
+        return self
+    
+    def context(self) -> dict:
+        """
+        values used to fill the endpoints urls
+        """
+        return {
+            "category_id": self.categories[0].id
+            , "category_name": self.categories[0].en_name
+            , "provider_id": self.providers[0]
+            , "location_id": self.locations[0].id
+            , "product_id": self.products[0].id
+            , "service_id": self.services[0].id
+            , "user_id": self.patients[0].id
+            , "service_name": "service"
+            , "product_name": "product"
+            , "longitude": CENTER[0]
+            , "latitude": CENTER[1]
+        }
+    
+    def create_admin(self):
+        group = Group.objects.create(name="ADMIN")
+        
+        for codename, model in LIST_PERMISSIONS.items():
+            Permission.objects.get_or_create(
+                codename=codename, content_type=ContentType.objects.get_for_model(model)
+                , defaults={"name": f"Can list {model._meta.model_name}"})
+        
+        group.permissions.set(Permission.objects.all())
+        
+        self.admin = Users.objects.create(
+            email="admin@benchmark.com", phone="+971500000000", password=self.password
+            , user_type="ADMIN", is_active=True, is_staff=True)
+        self.admin.groups.add(group)
+    
+    def create_categories(self):
+        self.categories = Category.objects.bulk_create([
+            Category(en_name=name.lower(), ar_name=label) for name, label in Category.CategoryNames.choices
+        ])
+    
+    def create_providers(self):
+        """
+        ServiceProvider is a multi table child of Users, bulk_create can't save it
+        so the parent rows are bulk created and the child rows are saved raw
+        """
+        users = Users.objects.bulk_create([
+            Users(
+                email=f"provider_{i}@benchmark.com", phone=f"+9715{i:08d}", password=self.password
+                , user_type="SERVICE_PROVIDER", is_active=True)
+            for i in range(PROVIDERS)
+        ], batch_size=BATCH_SIZE)
+        
+        for i, user in enumerate(users):
+            provider = ServiceProvider(
+                users_ptr_id=user.id, user_id=user.id
+                , category=self.categories[i % len(self.categories)]
+                , business_name=f"provider {i}", bank_name="benchmark bank"
+                , iban=f"AE{i:020d}", swift_code=f"BNCH{i:08d}"
+                , account_status=ServiceProvider.AccountStatus.ACCEPTED)
+            provider.save_base(raw=True)
+        
+        self.providers = [user.id for user in users]
+    
+    def create_locations(self):
+        def point():
+            return Point(
+                CENTER[0] + self.random.uniform(-0.5, 0.5)
+                , CENTER[1] + self.random.uniform(-0.5, 0.5), srid=4326)
+        
+        self.locations = ServiceProviderLocations.objects.bulk_create([
+            ServiceProviderLocations(
+                service_provider_id=provider_id, location=point()
+                , opening=time(8), closing=time(20), open_minutes=opening_minutes(time(8), time(20))
+                , crew="benchmark crew")
+            for provider_id in self.providers for _ in range(LOCATIONS_PER_PROVIDER)
+        ], batch_size=BATCH_SIZE)
+    
+    def create_products(self):
+        self.products = Product.objects.bulk_create([
+            Product(
+                service_provider_location=location, quantity=1000
+                , en_title=f"product {location.id}-{i}", ar_title=f"منتج {location.id}-{i}"
+                , en_description="benchmark product", ar_description="منتج"
+                , images="", price=Decimal(self.random.randint(1, 500)))
+            for location in self.locations for i in range(PRODUCTS_PER_LOCATION)
+        ], batch_size=BATCH_SIZE)
+    
+    def create_services(self):
+        self.services = Service.objects.bulk_create([
+            Service(
+                provider_location=location, category=self.categories[location.id % len(self.categories)]
+                , en_title=f"service {location.id}-{i}", ar_title=f"خدمة {location.id}-{i}"
+                , en_description="benchmark service", ar_description="خدمة"
+                , image="", price=Decimal(self.random.randint(1, 500)))
+            for location in self.locations for i in range(SERVICES_PER_LOCATION)
+        ], batch_size=BATCH_SIZE)
+    
+    def create_patients(self):
+        group = Group.objects.create(name="USER")
+        
+        self.patients = Users.objects.bulk_create([
+            Users(
+                email=f"patient_{i}@benchmark.com", phone=f"+9716{i:08d}", password=self.password
+                , user_type="USER", is_active=True)
+            for i in range(PATIENTS)
+        ], batch_size=BATCH_SIZE)
+        
+        group.user_set.add(*self.patients)
+    
+    def create_rates(self):
+        def raters():
+            return self.random.sample(self.patients, RATES_PER_RECORD)
+        
+        ProductRates.objects.bulk_create([
+            ProductRates(product=product, user=user, rate=self.random.randint(0, 5))
+            for product in self.products for user in raters()
+        ], batch_size=BATCH_SIZE)
+        
+        ServiceRates.objects.bulk_create([
+            ServiceRates(service=service, user=user, rate=self.random.randint(0, 5))
+            for service in self.services for user in raters()
+        ], batch_size=BATCH_SIZE)
+    
+    def create_orders(self):
+        orders = Orders.objects.bulk_create([
+            Orders(patient=self.random.choice(self.patients)) for _ in range(ORDERS)
+        ], batch_size=BATCH_SIZE)
+        
+        statuses = OrderItem.StatusChoices.values
+        items = OrderItem.objects.bulk_create([
+            OrderItem(
+                order=order, product=product, quantity=1, price=product.price
+                , status=self.random.choice(statuses))
+            for order in orders for product in self.random.sample(self.products, ITEMS_PER_ORDER)
+        ], batch_size=BATCH_SIZE)
+        
+        Delivery.objects.bulk_create([
+            Delivery(order=item, delivered=self.random.random() < 0.5)
+            for item in items if item.status == OrderItem.StatusChoices.ACCEPTED
+        ], batch_size=BATCH_SIZE)
+        
+        RejectedOrders.objects.bulk_create([
+            RejectedOrders(order=item, reason="out of stock")
+            for item in items if item.status == OrderItem.StatusChoices.REJECTED
+        ], batch_size=BATCH_SIZE)
+        
+        CartItems.objects.bulk_create([
+            CartItems(patient=patient, product=self.random.choice(self.products))
+            for patient in self.patients for _ in range(2)
+        ], batch_size=BATCH_SIZE)
+    
+    def create_appointments(self):
+        statuses = Appointments.AppointmentStatus.values
+        
+        booked = set()
+        
+        def appointment():
+            while True:
+                hour = self.random.randint(8, 18)
+                service = self.random.choice(self.services)
+                day = date.today() + timedelta(days=self.random.randint(0, 30))
+                status = self.random.choice(statuses)
+                
+                # the same hour can't be booked twice (appointment_no_overlap), unless rejected
+                if status == Appointments.AppointmentStatus.REJECTED or (service.id, day, hour) not in booked:
+                    break
+            
+            if status != Appointments.AppointmentStatus.REJECTED:
+                booked.add((service.id, day, hour))
+            
+            return Appointments(
+                service=service, user=self.random.choice(self.patients)
+                , from_time=time(hour), to_time=time(hour + 1), date=day
+                , period=appointment_period(day, time(hour), time(hour + 1)), status=status)
+        
+        appointments = Appointments.objects.bulk_create(
+            [appointment() for _ in range(APPOINTMENTS)], batch_size=BATCH_SIZE)
+        
+        RejectedAppointments.objects.bulk_create([
+            RejectedAppointments(appointment=appointment, reason="fully booked")
+            for appointment in appointments
+            if appointment.status == Appointments.AppointmentStatus.REJECTED
+        ], batch_size=BATCH_SIZE)
+    
+    def create_notifications(self):
+        receivers = (
+            [("User", patient.email) for patient in self.patients]
+            + [("System", "System")])
+        
+        def notification():
+            receiver_type, receiver = self.random.choice(receivers)
+            return Notification(
+                sender="System", sender_type="System"
+                , receiver=receiver, receiver_type=receiver_type
+                , ar_content="إشعار", en_content="notification")
+        
+        Notification.objects.bulk_create(
+            [notification() for _ in range(NOTIFICATIONS)], batch_size=BATCH_SIZE)
+        rebuild_unread_counters()
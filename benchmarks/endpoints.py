@@ -0,0 +1,105 @@
+"""
+every list endpoint covered by the benchmark suite
+(name, url, client) where name is the key in budgets.json, url is formatted with Dataset.context()
+and client is the account the request is sent with ["admin", "patient"]
+
+not covered: products/distance/ (404 unless the name matches in the request language), services/category/<int>/
+(shadowed by services/category/<str>/) and orders/rejected/location/ (no location_id in the url)
+"""
+
+PRODUCTS = [
+    ("products.all", "/api/v1/products/all/", "admin")
+    , ("products.search", "/api/v1/products/search/?logitude={longitude}&latitude={latitude}", "admin")
+    , ("products.by_category", "/api/v1/products/category/{category_id}/", "admin")
+    , ("products.by_location", "/api/v1/products/location/{location_id}/", "admin")
+    , ("products.by_provider", "/api/v1/products/service_provider/{provider_id}/", "admin")
+    , ("products.price_range", "/api/v1/products/filter/price_range/?min_price=10&max_price=400", "admin")
+    , ("products.by_name", "/api/v1/products/product_name/?name={product_name}", "admin")
+    , ("products.category_by_name", "/api/v1/products/{category_name}/", "admin")
+    , ("products.provider_stats", "/api/v1/products/provider/stats/{provider_id}/", "admin")
+    , ("products.rates", "/api/v1/products/rates/", "admin")
+    , ("products.user_rates", "/api/v1/products/user/rates/{user_id}", "admin")
+    , ("products.provider_rates", "/api/v1/products/provider/rates/{provider_id}", "admin")
+    , ("products.product_rates", "/api/v1/products/{product_id}/rates/", "admin")
+]
+
+SERVICES = [
+    ("services.all", "/api/v1/services/all/", "admin")
+    , ("services.search", "/api/v1/services/search/{provider_id}/?min_price=10&max_price=400", "admin")
+    , ("services.by_name", "/api/v1/services/by_name/{service_name}/", "admin")
+    , ("services.by_distance"
+        , "/api/v1/services/distance/{service_name}/{longitude}/{latitude}/", "admin")
+    , ("services.category_by_name", "/api/v1/services/category/{category_name}/", "admin")
+    , ("services.provider", "/api/v1/services/provider/{provider_id}", "admin")
+    , ("services.provider_categories", "/api/v1/services/provider/categories/{provider_id}/", "admin")
+    , ("services.by_location", "/api/v1/services/provider/location/{location_id}/", "admin")
+    , ("services.provider_category", "/api/v1/services/provider/{provider_id}/{category_id}/", "admin")
+    , ("services.rates", "/api/v1/services/rates/all/", "admin")
+    , ("services.user_rates", "/api/v1/services/rates/user/{user_id}/", "admin")
+    , ("services.provider_rates", "/api/v1/services/rates/provider/{provider_id}/", "admin")
+    , ("services.location_rates", "/api/v1/services/rates/location/{location_id}/", "admin")
+    , ("services.service_rates", "/api/v1/services/{service_id}/rates/", "admin")
+]
+
+ORDERS = [
+    ("orders.all", "/api/v1/orders/all/", "admin")
+    , ("orders.all_export", "/api/v1/orders/all/?export=ndjson", "admin")
+    , ("orders.user", "/api/v1/orders/user/{user_id}", "admin")
+    , ("orders.user_cart", "/api/v1/orders/cart/user/{user_id}", "admin")
+    , ("orders.items", "/api/v1/orders/items/", "admin")
+    , ("orders.user_items", "/api/v1/orders/items/user/{user_id}", "admin")
+    , ("orders.provider_items", "/api/v1/orders/provider/items/?provider_id={provider_id}", "admin")
+    , ("orders.provider_stats", "/api/v1/orders/provider/stats/?provider_id={provider_id}", "admin")
+    , ("orders.rejected", "/api/v1/orders/rejected/", "admin")
+    , ("orders.user_rejected", "/api/v1/orders/rejected/user/{user_id}", "admin")
+    , ("orders.provider_rejected", "/api/v1/orders/rejected/provider/{provider_id}", "admin")
+    , ("orders.provider_report", "/api/v1/orders/provider/reports/items/?provider_id={provider_id}", "admin")
+    , ("orders.provider_report_export"
+        , "/api/v1/orders/provider/reports/items/?provider_id={provider_id}&export=csv", "admin")
+    , ("orders.location_report", "/api/v1/orders/location/reports/items/{location_id}/", "admin")
+    , ("orders.provider_sales"
+        , "/api/v1/orders/provider/reports/sales/?provider_id={provider_id}&period=month", "admin")
+    , ("orders.location_sales", "/api/v1/orders/location/reports/sales/{location_id}/?period=week", "admin")
+    , ("orders.user_report", "/api/v1/orders/user/reports/items/{user_id}", "admin")
+]
+
+APPOINTMENTS = [
+    ("appointments.provider", "/api/v1/appointments/provider/{provider_id}", "admin")
+    , ("appointments.location", "/api/v1/appointments/location/{location_id}/", "admin")
+    , ("appointments.user", "/api/v1/appointments/user/{user_id}", "admin")
+    , ("appointments.provider_dashboard"
+        , "/api/v1/appointments/provider/dashboard/?provider_id={provider_id}", "admin")
+    , ("appointments.rejected", "/api/v1/appointments/rejected/", "admin")
+    , ("appointments.user_rejected", "/api/v1/appointments/rejected/user/{user_id}", "admin")
+    , ("appointments.provider_rejected", "/api/v1/appointments/rejected/provider/{provider_id}", "admin")
+    , ("appointments.location_rejected"
+        , "/api/v1/appointments/rejected/location/{location_id}/", "admin")
+    , ("appointments.service_slots", "/api/v1/appointments/slots/{service_id}/?days=7", "admin")
+    , ("appointments.availability"
+        , "/api/v1/appointments/availability/?category={category_id}&longitude={longitude}&latitude={latitude}"
+        "&radius=20000&days=7", "admin")
+]
+
+DELIVERIES = [
+    ("deliveries.all", "/api/v1/delivery/", "admin")
+    , ("deliveries.provider", "/api/v1/delivery/provider/{provider_id}", "admin")
+    , ("deliveries.user", "/api/v1/delivery/user/{user_id}", "admin")
+]
+
+SERVICE_PROVIDERS = [
+    ("service_providers.nearest"
+        , "/api/v1/service_providers/locations/nearest/?longitude={longitude}&latitude={latitude}&k=20", "admin")
+    , ("service_providers.clusters", "/api/v1/service_providers/locations/clusters/?bbox=-180,-85,180,85&zoom=3", "admin")
+    , ("service_providers.stats", "/api/v1/service_providers/stats/{provider_id}/", "admin")
+]
+
+NOTIFICATIONS = [
+    ("notifications.all", "/api/v1/notifications/all/", "admin")
+    , ("notifications.user", "/api/v1/notifications/specific_user/", "patient")
+]
+
+USERS = [
+    ("users.stats", "/api/v1/users/stats/", "admin")
+]
+
+ENDPOINTS = PRODUCTS + SERVICES + ORDERS + APPOINTMENTS + DELIVERIES + SERVICE_PROVIDERS + NOTIFICATIONS + USERS
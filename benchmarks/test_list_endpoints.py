@@ -0,0 +1,48 @@
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+
+from time import perf_counter
+import pytest
+
+from .budget import RESULTS, UPDATE_BUDGETS, Measure, load_budgets, over_budget
+from .endpoints import ENDPOINTS
+
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+BUDGETS = load_budgets()
+
+
+@pytest.mark.parametrize("name, url, client", ENDPOINTS, ids=[endpoint[0] for endpoint in ENDPOINTS])
+def test_endpoint_budget(name, url, client, dataset, clients):
+    client = clients[client]
+    url = url.format(**dataset.context())
+    
+    # warm up, so per process caches (content types, url resolver) don't count
+    client.get(url)
+    
+    with CaptureQueriesContext(connection) as context:
+        start = perf_counter()
+        response = client.get(url)
+        # a streamed export runs its queries while its content is read
+        content = b"".join(response.streaming_content) if response.streaming else response.content
+        time_ms = (perf_counter() - start) * 1000
+    
+    measure = Measure(
+        status=response.status_code, queries=len(context.captured_queries)
+        , time_ms=time_ms, bytes=len(content))
+    RESULTS[name] = measure
+    
+    assert response.status_code == 200, f"{url} returned {response.status_code}"
+    
+    if UPDATE_BUDGETS:
+        return
+    
+    assert name in BUDGETS, f"{name} has no budget, record it with BENCHMARK_UPDATE_BUDGETS=1"
+    
+    # an unrecorded budget fails, a skipped endpoint would let any regression through
+    budget = BUDGETS[name]
+    assert budget is not None, f"{name} budget not recorded, measured {measure}, record it with BENCHMARK_UPDATE_BUDGETS=1"
+    
+    errors = over_budget(measure, budget)
+    assert not errors, f"{name} over budget: " + ", ".join(errors)
@@ -14,7 +14,7 @@ from .models import Category
 
 from service_providers.serializers import LocationSerializerSafe
 from service_providers.models import ServiceProviderLocations
-from notification.models import Notification
+from notification.dispatcher import notify
 
 
 
@@ -103,7 +103,7 @@ class CreateCategoryAPI(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         resp = super().create(request, *args, **kwargs)
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=request.user.email, receiver_type="System"
             , en_content=f"{resp.data['en_name']} category added"
@@ -125,7 +125,7 @@ class UpdateCategoryAPI(generics.UpdateAPIView):
     def perform_update(self, serializer):
         instance = serializer.save()
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=self.request.user.email, receiver_type="System"
             , en_content=f"{instance.en_name} category updated"
@@ -143,7 +143,7 @@ class DestroyCategoryAPI(generics.DestroyAPIView):
         return super().get_serializer(*args, **kwargs)
     
     def perform_destroy(self, instance: Category):
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=self.request.user.email, receiver_type="System"
             , en_content=f"{instance.en_name} category deleted"
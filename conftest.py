@@ -0,0 +1,23 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def synchronous_notifications(monkeypatch):
+    """
+    the tests run in a transaction that is never committed, so notifications are saved in the request
+    """
+    from notification.dispatcher import dispatcher
+    
+    monkeypatch.setattr(dispatcher, "asynchronous", False)
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    """
+    the invalidations wait for a commit the tests never make, so every test starts with an empty cache
+    """
+    from service_providers.stats import provider_stats_cache
+    from appointments.availability import availability_cache
+    
+    provider_stats_cache.clear()
+    availability_cache.clear()
@@ -0,0 +1,131 @@
+from django.db import DatabaseError
+from django.conf import settings
+
+from collections import OrderedDict
+from typing import Callable, Optional
+import threading
+import atexit
+import time
+
+from users.models import UserIP
+
+
+class LanguageCache:
+    """
+    in process, write behind cache for UserIP records [ip_address => language_code]
+    
+    - entries live for `ttl` seconds, the least recently used ones are evicted after `max_size`
+    - a language change is kept in `pending` and written later with the other changes in one upsert
+    - pending changes are written when `flush_batch` of them are waiting or every `flush_interval` seconds
+    """
+    
+    def __init__(
+        self, max_size: int = 10000, ttl: float = 300, flush_batch: int = 100
+        , flush_interval: float = 5, clock: Callable[[], float] = time.monotonic) -> None:
+        
+        self.max_size = max_size
+        self.ttl = ttl
+        self.flush_batch = flush_batch
+        self.flush_interval = flush_interval
+        self.clock = clock
+        
+        self.entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self.pending: dict[str, str] = {}
+        self.last_flush = clock()
+        self.lock = threading.Lock()
+    
+    def resolve(self, ip_address: str, language_code: str) -> str:
+        """
+        remembers the language for this ip, the database is read only on a miss
+        and a write is queued only when the language changed
+        """
+        with self.lock:
+            stored = self._get(ip_address)
+        
+        if stored is None:
+            stored = self._load(ip_address)
+        
+        with self.lock:
+            if stored != language_code:
+                self.pending[ip_address] = language_code
+            
+            self._set(ip_address, language_code)
+        
+        return language_code
+    
+    def flush_if_due(self) -> None:
+        with self.lock:
+            due = (
+                len(self.pending) >= self.flush_batch
+                or (self.pending and self.clock() - self.last_flush >= self.flush_interval))
+        
+        if not due:
+            return
+        
+        try:
+            self.flush()
+        except DatabaseError:
+            # the changes stay pending for the next flush, the response is already made
+            pass
+    
+    def flush(self) -> int:
+        """
+        writes the pending changes in one upsert, returns how many records were written
+        """
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.last_flush = self.clock()
+        
+        if not pending:
+            return 0
+        
+        try:
+            UserIP.objects.bulk_create(
+                [UserIP(ip_address=ip_address, language_code=code) for ip_address, code in pending.items()]
+                , update_conflicts=True, unique_fields=["ip_address"], update_fields=["language_code"])
+        except Exception:
+            # put them back unless a newer change came meanwhile
+            with self.lock:
+                self.pending = {**pending, **self.pending}
+            raise
+        
+        return len(pending)
+    
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.pending.clear()
+    
+    def _get(self, ip_address: str) -> Optional[str]:
+        # a pending change is newer than anything cached or stored
+        if ip_address in self.pending:
+            return self.pending[ip_address]
+        
+        entry = self.entries.get(ip_address)
+        if entry is None:
+            return None
+        
+        language_code, expires_at = entry
+        if expires_at <= self.clock():
+            del self.entries[ip_address]
+            return None
+        
+        self.entries.move_to_end(ip_address)
+        return language_code
+    
+    def _set(self, ip_address: str, language_code: str) -> None:
+        self.entries[ip_address] = (language_code, self.clock() + self.ttl)
+        self.entries.move_to_end(ip_address)
+        
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+    
+    def _load(self, ip_address: str) -> Optional[str]:
+        return UserIP.objects.filter(
+            ip_address=ip_address).values_list("language_code", flat=True).first()
+
+
+language_cache = LanguageCache(**getattr(settings, "LANGUAGE_CACHE", {}))
+
+# don't lose the changes still waiting when the process stops
+atexit.register(language_cache.flush)
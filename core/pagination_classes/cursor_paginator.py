@@ -0,0 +1,59 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework import exceptions
+
+from django.db.models import QuerySet
+from django.http import HttpRequest
+
+from typing import Union
+
+
+
+class CustomCursorPagination(CursorPagination):
+    """
+    keyset pagination for the large lists: opaque ?cursor= token, no COUNT(*) query
+    and the same cost for the first and the millionth page
+    
+    generic views choose the order with a `cursor_ordering` attribute (default "-id")
+    """
+    page_size = 9
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-id"
+    
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "cursor_ordering", None)
+        if ordering is None:
+            return super().get_ordering(request, queryset, view)
+        
+        return (ordering, ) if isinstance(ordering, str) else tuple(ordering)
+    
+    def decode_cursor(self, request):
+        # a tampered or outdated cursor is a bad request, not a missing page (404 in CursorPagination)
+        try:
+            return super().decode_cursor(request)
+        except exceptions.NotFound:
+            raise exceptions.ValidationError({"cursor": self.invalid_cursor_message})
+
+
+def custom_cursor_pagination_function(ordering: Union[str, tuple[str, ...]] = "-id", page_size: int = 9):
+    paginator = CustomCursorPagination()
+    paginator.ordering = ordering
+    paginator.page_size = page_size
+    return paginator
+
+
+def cursor_paginated_response(
+    request: HttpRequest, queryset: QuerySet, serializer_class, ordering="-id", **serializer_kwargs) -> Response:
+    """
+    for function views: paginate the queryset, serialize the page and return {next, previous, results}
+    the relations declared by the serializer (utils.query_plan) are fetched with the page
+    """
+    if hasattr(serializer_class, "plan_queryset"):
+        queryset = serializer_class.plan_queryset(queryset)
+    
+    paginator = custom_cursor_pagination_function(ordering)
+    page = paginator.paginate_queryset(queryset, request)
+    serializer = serializer_class(page, many=True, **serializer_kwargs)
+    
+    return paginator.get_paginated_response(serializer.data)
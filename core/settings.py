@@ -47,6 +47,7 @@ INSTALLED_APPS = [
     "services.apps.ServicesConfig",
     "products.apps.ProductsConfig",
     "orders.apps.OrdersConfig",
+    "search.apps.SearchConfig",
     "users.apps.UsersConfig",
 ]
 
@@ -64,6 +65,65 @@ MIDDLEWARE = [
     'core.middleware.language_middleware.language',
 ]
 
+# in process cache of UserIP used by the language middleware (core/middleware/language_cache.py)
+LANGUAGE_CACHE = {
+    "max_size": 10000 # ip addresses kept
+    , "ttl": 300 # seconds
+    , "flush_batch": 100 # language changes written in one query
+    , "flush_interval": 5 # seconds
+}
+
+# notifications are written by a background thread (notification/dispatcher.py)
+NOTIFICATION_DISPATCH = {
+    "asynchronous": bool(int(os.environ.get("NOTIFICATIONS_ASYNC", 1)))
+    , "batch_size": 500 # notifications written in one query
+    , "flush_interval": 0.5 # seconds
+}
+
+# server sent events of new notifications (notification/stream.py), seconds
+NOTIFICATION_STREAM = {
+    "heartbeat": 15
+    , "max_duration": 300
+    , "retry": 3 # client reconnect delay
+}
+
+# read notifications older than this are moved to the archive (manage.py archive_notifications)
+NOTIFICATION_RETENTION = {
+    "archive_after_days": int(os.environ.get("NOTIFICATION_ARCHIVE_AFTER_DAYS", 90))
+}
+
+# distance searches and map clusters (utils/geo.py), radiuses in meters
+GEO_SEARCH = {
+    "default_radius": 50000
+    , "max_radius": 500000
+    , "cluster_cells_per_tile": 4 # map clusters grid, per side of a 256px tile
+    , "cluster_max_zoom": 15 # from this zoom on the map gets the locations themselves
+    , "cluster_max_points": 500
+}
+
+# prices, categories and rates of every provider (service_providers/stats.py)
+PROVIDER_STATS = {
+    "ttl": 300 # seconds, invalidated earlier by the writes in this process
+}
+
+# bookable appointment slots (appointments/slots.py)
+APPOINTMENT_SLOTS = {
+    "slot_minutes": 30
+    , "max_days": 14 # days searched in one request
+    , "max_slots": 500 # slots returned in one request
+}
+
+# free slots of a location day, cached for the availability search (appointments/availability.py)
+APPOINTMENT_AVAILABILITY = {
+    "ttl": 60 # seconds, invalidated earlier by the appointment changes in this process
+    , "max_entries": 10000 # (location, day) entries kept
+    , "max_locations": 20 # wider searches skip the cache, one query keeps the earliest slots
+}
+
+EXPORT = {
+    "chunk_size": 2000 # rows read from the database cursor and serialized at a time
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated'
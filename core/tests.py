@@ -0,0 +1,157 @@
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+
+from hypothesis.extra.django import TestCase
+
+import base64
+import json
+
+from category.models import Category
+from core.middleware.language_cache import LanguageCache
+from core.pagination_classes.cursor_paginator import custom_cursor_pagination_function
+from products.models import Product
+from users.models import UserIP
+from utils import testing
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLanguageCache(TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.cache = LanguageCache(max_size=2, ttl=60, flush_batch=10, flush_interval=5, clock=self.clock)
+    
+    def test_same_language_costs_no_queries(self):
+        self.cache.resolve("10.0.0.1", "en")
+        self.cache.flush()
+        
+        with self.assertNumQueries(0):
+            assert self.cache.resolve("10.0.0.1", "en") == "en"
+            self.cache.flush_if_due()
+    
+    def test_changes_are_written_in_one_query(self):
+        UserIP.objects.create(ip_address="10.0.0.1", language_code="en")
+        
+        self.cache.resolve("10.0.0.1", "ar")
+        self.cache.resolve("10.0.0.2", "en")
+        
+        with self.assertNumQueries(1):
+            assert self.cache.flush() == 2
+        
+        assert UserIP.objects.get(ip_address="10.0.0.1").language_code == "ar"
+        assert UserIP.objects.get(ip_address="10.0.0.2").language_code == "en"
+    
+    def test_unchanged_language_is_not_written(self):
+        UserIP.objects.create(ip_address="10.0.0.1", language_code="ar")
+        
+        self.cache.resolve("10.0.0.1", "ar")
+        assert self.cache.flush() == 0
+    
+    def test_flush_after_interval(self):
+        self.cache.resolve("10.0.0.1", "ar")
+        self.cache.flush_if_due()
+        assert not UserIP.objects.filter(ip_address="10.0.0.1").exists()
+        
+        self.clock.now += 5
+        self.cache.flush_if_due()
+        assert UserIP.objects.filter(ip_address="10.0.0.1").exists()
+    
+    def test_expired_and_evicted_entries_are_reloaded(self):
+        for ip_address in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+            self.cache.resolve(ip_address, "en")
+        self.cache.flush()
+        
+        # 10.0.0.1 is the least recently used one
+        with self.assertNumQueries(1):
+            self.cache.resolve("10.0.0.1", "en")
+        
+        self.clock.now += 61
+        with self.assertNumQueries(1):
+            self.cache.resolve("10.0.0.1", "en")
+
+
+class TestSearchPage(TestCase):
+    def test_non_numeric_page_is_a_bad_request(self):
+        response = self.client.get("/api/v1/services_&_products/", {"page": "abc"})
+        
+        assert response.status_code == 400
+        assert "page" in response.json()["error"]
+
+
+class TestMergedSearchCursor(TestCase):
+    url = "/api/v1/services_&_products/merged/"
+    
+    def setUp(self) -> None:
+        category = Category.objects.create(en_name="pharmacy", ar_name="صيدلية")
+        location = testing.create_location(testing.create_provider(category))
+        
+        # most of them tie on the price, the id orders them
+        for price in ("10.00", "10.00", "10.00", "10.00", "5.00", "20.00"):
+            testing.create_product(location, price=price)
+        for price in ("10.00", "10.00", "7.50"):
+            testing.create_service(location, category, price=price)
+    
+    def test_pages_through_ties_without_skipping_or_repeating(self):
+        results, url, data = [], self.url, {"order": "price", "pagination_number": "2"}
+        while url:
+            response = self.client.get(url, data)
+            assert response.status_code == 200
+            
+            results += response.json()["results"]
+            url, data = response.json()["next"], None
+        
+        keys = [(result["kind"], result["id"]) for result in results]
+        assert len(keys) == len(set(keys)) == 9
+        assert [float(result["price"]) for result in results] == [5, 7.5, 10, 10, 10, 10, 10, 10, 20]
+    
+    def test_invalid_cursor_is_a_bad_request(self):
+        def cursor(data) -> str:
+            return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+        
+        for invalid in (
+            "not a cursor"
+            # a cursor of another order, and a key that isn't a price
+            , cursor({"order": "distance", "key": "10", "id": 1})
+            , cursor({"order": "price", "key": "cheap", "id": 1})):
+            response = self.client.get(self.url, {"order": "price", "cursor": invalid})
+            
+            assert response.status_code == 400
+            assert "cursor" in response.json()
+
+
+class TestCursorPagination(TestCase):
+    def setUp(self) -> None:
+        category = Category.objects.create(en_name="pharmacy", ar_name="صيدلية")
+        self.location = testing.create_location(testing.create_provider(category))
+    
+    def page(self, url: str) -> tuple[list[int], str]:
+        paginator = custom_cursor_pagination_function("price", page_size=2)
+        page = paginator.paginate_queryset(Product.objects.all(), Request(APIRequestFactory().get(url)))
+        return [product.id for product in page], paginator.get_next_link()
+    
+    def test_pages_through_ties_without_skipping_or_repeating(self):
+        products = [
+            testing.create_product(self.location, price=price)
+            for price in ("10.00", "10.00", "10.00", "5.00", "10.00", "20.00", "10.00")]
+        
+        ids, url = [], "/products/"
+        while url:
+            page, url = self.page(url)
+            ids += page
+        
+        assert sorted(ids) == sorted(product.id for product in products)
+        assert ids[0] == products[3].id and ids[-1] == products[5].id
+    
+    def test_invalid_cursor_is_a_bad_request(self):
+        testing.create_product(self.location)
+        
+        response = self.client.get("/api/v1/service_providers/locations/", {"cursor": "tampered"})
+        
+        assert response.status_code == 400
+        assert "cursor" in response.json()
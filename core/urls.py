@@ -17,6 +17,10 @@ urlpatterns = [
     # search in services
     path("api/v1/services_&_products/", views.search_in_services_products, name="search_in_services_products"),
     
+    # search in services and products as one ranked stream (cursor pagination)
+    path("api/v1/services_&_products/merged/"
+        , views.merged_search_in_services_products, name="merged_search_in_services_products"),
+    
     # users app
     path('api/v1/users/', include("users.urls", namespace="users")),
     
@@ -1,22 +1,28 @@
-from rest_framework import decorators, status
+from rest_framework import decorators, status, exceptions
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.response import Response
 
-from django.contrib.postgres.search import SearchVector, SearchQuery
-from django.contrib.gis.db.models.functions import Distance
-from django.db.models import Q, Avg, QuerySet
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models.functions import RowNumber, Cast
+from django.db.models import Q, F, Window, QuerySet
+from django.db.models import BigIntegerField, ExpressionWrapper, FloatField
 from django.contrib.gis.geos import Point
 from django.http import HttpRequest
 
 from functools import reduce
+from decimal import Decimal
 from typing import Any
-
-from core.pagination_classes.nine_element_paginator import custom_pagination_function
+import base64
+import json
 
 from services.serializers import RUDServicesSerializer
 from products.serializers import ProudctSerializer
+from search.models import SearchDocument
 from products.models import Product
 from services.models import Service
 from utils.catch_helper import catch
+from utils import geo
+from service_providers.helpers import requested_time, open_at
 
 
 @decorators.api_view(["GET", ])
@@ -25,74 +31,86 @@ def language_switcher(request: HttpRequest):
     return Response({"message": "language switched successfully"}, status=status.HTTP_200_OK)
 
 
-def check_category(query_params: dict[str, Any], services_queryset: QuerySet, products_queryset: QuerySet):
+def check_category(query_params: dict[str, Any], documents: QuerySet):
     """
     helper function for multiple filters api function
     """
-    category_ids = query_params.get("categories", None)
-    new_category_ids = catch(category_ids)
-    
-    services_q_expr = (Q(category__id=int(x)) for x in new_category_ids)
-    services_q_expr = reduce(lambda a, b: a | b, services_q_expr)
+    category_ids = catch(query_params.get("categories", None))
     
-    products_q_expr = (
-        Q(service_provider_location__service_provider__category__id=int(x)) for x in new_category_ids)
-    products_q_expr = reduce(lambda x, y: x | y, products_q_expr)
-    
-    return services_q_expr, products_q_expr, services_queryset, products_queryset
+    return Q(category__in=category_ids), documents
 
-def check_range(query_params: dict[str, Any], services_queryset: QuerySet, products_queryset: QuerySet):
+def check_range(query_params: dict[str, Any], documents: QuerySet):
     """
     helper function for multiple filters api function
     """
     min_price, max_price = query_params.get("range")[0][0], query_params.get("range")[1][0]
     min_price, max_price = float(min_price), float(max_price)
-    q_expr = Q(price__range=(min_price, max_price))
     
-    return q_expr, q_expr, services_queryset, products_queryset
+    return Q(price__range=(min_price, max_price)), documents
 
-def search_func(query_params: dict[str, Any], services_queryset: QuerySet, products_queryset: QuerySet):
+def search_func(query_params: dict[str, Any], documents: QuerySet):
+    """
+    matches the stored english and arabic search vector, ranks the documents by relevance
+    """
     words: str = query_params.get("search").split("_")
-    q_exprs = (Q(search=SearchQuery(word)) for word in words)
-    q_func = reduce(lambda x, y: x | y, q_exprs)
+    queries = (SearchQuery(word, config="english") | SearchQuery(word, config="arabic") for word in words)
+    query = reduce(lambda x, y: x | y, queries)
     
-    services_queryset = services_queryset.annotate(search=SearchVector("en_title", "ar_title"))
-    products_queryset = products_queryset.annotate(search=SearchVector("en_title", "ar_title"))
+    documents = documents.annotate(rank=SearchRank(F("document"), query))
     
-    return q_func, q_func, services_queryset, products_queryset
+    return Q(document=query), documents
 
-def check_rate(query_params: dict[str, Any], services_queryset: QuerySet, products_queryset: QuerySet):
+def check_rate(query_params: dict[str, Any], documents: QuerySet):
     rates = catch(query_params.get("rates"))
     
-    services_queryset = services_queryset.prefetch_related("service_rates")
-    services_queryset = services_queryset.annotate(avg_rate=Avg("service_rates__rate"))
-    
-    products_queryset = products_queryset.prefetch_related("product_rates")
-    products_queryset = products_queryset.annotate(avg_rate=Avg("product_rates__rate"))
-    
-    q_expr = (Q(avg_rate__gt=rate-0.5) & Q(avg_rate__lte=rate+0.5) for rate in rates)
+    q_expr = (Q(average_rate__gt=rate-0.5) & Q(average_rate__lte=rate+0.5) for rate in rates)
     q_expr = reduce(lambda x, y: x | y, q_expr)
     
-    return q_expr, q_expr, services_queryset, products_queryset
+    return q_expr, documents
 
-def check_distance(query_params: dict[str, Any], services_queryset: QuerySet, products_queryset: QuerySet):
-    location = Point(query_params.get("distance"), srid=4326)
+def check_distance(query_params: dict[str, Any], documents: QuerySet):
+    """
+    documents within the radius, with their distance in meters (nearest first through the GiST index)
+    """
+    location, radius = query_params.get("distance")
+    documents = documents.annotate(distance=geo.distance_to("location", location))
     
-    services_q_expr = Q(provider_location__location__distance_lt=(location, 1000000))
-    products_q_expr = Q(service_provider_location__location__distance_lt=(location, 1000000))
+    return geo.within("location", location, radius), documents
+
+def get_ordering(documents: QuerySet):
+    """
+    nearest first when a location is given, then the most relevant when searching, else the oldest
+    """
+    annotations = documents.query.annotations
+    if "distance" in annotations:
+        return F("distance").asc()
     
-    services_queryset = services_queryset.annotate(
-        distance=Distance("provider_location__location", location)).order_by("distance")
-    products_queryset = products_queryset.annotate(
-        distance=Distance("service_provider_location__location", location)).order_by("distance")
+    if "rank" in annotations:
+        return F("rank").desc()
     
-    return services_q_expr, products_q_expr, services_queryset, products_queryset
+    return F("object_id").asc()
+
+def check_open(query_params: dict[str, Any], documents: QuerySet):
+    """
+    open at the requested time (?open_at=HH:MM or ?open_now=true), overnight hours included
+    """
+    return open_at(query_params.get("open"), "open_minutes"), documents
 
 def get_pagination(pagination_number: int):
     a = pagination_number // 2
     b = pagination_number - a
     return a, b
 
+def requested_page(query_params: dict[str, Any]) -> int:
+    """
+    ?page=<int> (1 by default)
+    """
+    page = query_params.get("page", "1")
+    if not page.isdigit():
+        raise exceptions.ValidationError({"error": "page should be a positive number"})
+    
+    return max(int(page), 1)
+
 def get_callables(query_params: dict[str, Any]):
     new_query_params = query_params.copy()
     
@@ -103,10 +121,18 @@ def get_callables(query_params: dict[str, Any]):
     else:
         pagination_number = int(pagination_number[0])
     
-    # switching longitude and latitude to distance within query_params
+    # switching longitude, latitude and radius (meters) to distance within query_params
+    radius = new_query_params.pop("radius", [None])[0]
     if new_query_params.get("longitude") and new_query_params.get("latitude"):
         longitude, latitude = new_query_params.pop("longitude")[0], new_query_params.pop("latitude")[0]
-        new_query_params["distance"] = float(longitude), float(latitude)
+        new_query_params["distance"] = geo.point_from(longitude, latitude), geo.radius_from(radius)
+    
+    # switching open_at or open_now to the requested time within query_params
+    time_of_day = requested_time(new_query_params)
+    new_query_params.pop("open_at", None)
+    new_query_params.pop("open_now", None)
+    if time_of_day is not None:
+        new_query_params["open"] = time_of_day
     
     # switching min_price and max_price to price__range within query_params
     if new_query_params.get("min_price") and new_query_params.get("max_price"):
@@ -116,7 +142,7 @@ def get_callables(query_params: dict[str, Any]):
     callables_hashtable = {
         "distance": check_distance, "search": search_func,
         "rates": check_rate, "range": check_range,
-        "categories": check_category
+        "categories": check_category, "open": check_open
     }
     
     callables = [callables_hashtable[key] for key in new_query_params.keys()]
@@ -125,35 +151,170 @@ def get_callables(query_params: dict[str, Any]):
 @decorators.api_view(["GET", ])
 @decorators.permission_classes([])
 def search_in_services_products(request: HttpRequest):
-    # first we get the language and query_params, then we make main querysets
+    """
+    one query on the search documents table for both services and products
+    returns page N of services followed by page N of products (?page=<int>&pagination_number=<int>)
+    longitude & latitude keep the documents within ?radius=<meters> (settings.GEO_SEARCH), nearest first
+    """
+    # first we get the language and query_params, then we make the main queryset
     language, query_params = request.META.get("Accept-Language"), request.query_params
-    services_main_queryset, products_main_queryset = Service.objects, Product.objects
+    documents = SearchDocument.objects.all()
+    page = requested_page(query_params)
     
     # then we get the callabels which mapped with the served query_params, and take care of pagination num
+    query_params = query_params.copy()
+    query_params.pop("page", None)
     callables, query_params, pagination_number = get_callables(query_params)
     
-    # then we prepare the Q_exprs that will filter the querysets
+    # then we prepare the Q_exprs that will filter the documents
     # we stand on callabels and query_params from the last step
-    services_Q_exprs, products_Q_exprs = set(), set()
+    Q_exprs = set()
     for func in callables:
-        services_Q_expr, products_Q_expr, services_main_queryset, products_main_queryset = func(
-            query_params, services_main_queryset, products_main_queryset)
-        services_Q_exprs.add(services_Q_expr)
-        products_Q_exprs.add(products_Q_expr)
+        Q_expr, documents = func(query_params, documents)
+        Q_exprs.add(Q_expr)
     
-    # here we apply filtering (if exists) on the querysets
-    services_main_queryset = services_main_queryset.filter(*services_Q_exprs)
-    products_main_queryset = products_main_queryset.filter(*products_Q_exprs)
-    
-    # paginate the queryset under the client-side rules
+    # number the services and the products separately, then keep the requested page of each
     a, b = get_pagination(pagination_number)
-    services_paginator = custom_pagination_function(a)
-    paginated_services = services_paginator.paginate_queryset(services_main_queryset, request)
-    products_paginator = custom_pagination_function(b)
-    paginated_products = products_paginator.paginate_queryset(products_main_queryset, request)
+    documents = documents.filter(*Q_exprs).annotate(
+        row=Window(RowNumber(), partition_by=[F("kind")], order_by=get_ordering(documents)))
+    documents = documents.filter(
+        Q(kind=SearchDocument.Kinds.SERVICE, row__gt=(page - 1) * a, row__lte=page * a)
+        | Q(kind=SearchDocument.Kinds.PRODUCT, row__gt=(page - 1) * b, row__lte=page * b)
+        ).order_by("kind", "row").values_list("kind", "object_id")
+    
+    # hydrate the page records in the documents order
+    ids = {kind: [] for kind in SearchDocument.Kinds.values}
+    for kind, object_id in documents:
+        ids[kind].append(object_id)
+    
+    services = Service.objects.in_bulk(ids[SearchDocument.Kinds.SERVICE])
+    products = Product.objects.in_bulk(ids[SearchDocument.Kinds.PRODUCT])
+    paginated_services = [services[x] for x in ids[SearchDocument.Kinds.SERVICE] if x in services]
+    paginated_products = [products[x] for x in ids[SearchDocument.Kinds.PRODUCT] if x in products]
     
     # serializing the queryset data
     serialized_services = RUDServicesSerializer(paginated_services, many=True, language=language)
     serialized_products = ProudctSerializer(paginated_products, many=True, language=language)
     
     return Response(data=serialized_services.data + serialized_products.data, status=status.HTTP_200_OK)
+
+
+# merged search, services and products in one ranked stream with keyset (cursor) pagination
+# every order is an exact key (no floats), so the cursor compares exact values
+def relevance_key(point: Point):
+    rank = ExpressionWrapper(F("rank") * 1000000, output_field=FloatField())
+    return Cast(rank, BigIntegerField())
+
+def distance_key(point: Point):
+    # meters
+    return Cast(geo.distance_to("location", point), BigIntegerField())
+
+def price_key(point: Point):
+    # the column itself, so the (price, id) index serves the order
+    return F("price")
+
+MERGED_ORDERINGS = {
+    # order: (key, key type, descending)
+    "relevance": (relevance_key, int, True)
+    , "distance": (distance_key, int, False)
+    , "price": (price_key, Decimal, False)
+}
+
+
+def encode_cursor(order: str, key, document_id: int) -> str:
+    data = json.dumps({"order": order, "key": str(key), "id": document_id})
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+def decode_cursor(cursor: str, order: str) -> tuple[Any, int]:
+    """
+    returns (key, id) of the last document of the previous page
+    """
+    key_type = MERGED_ORDERINGS[order][1]
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        assert data["order"] == order
+        return key_type(data["key"]), int(data["id"])
+    except Exception:
+        raise exceptions.ValidationError({"cursor": "invalid cursor"})
+
+def keyset_filter(key, document_id: int, descending: bool) -> Q:
+    """
+    documents after (key, id) in the (key, id) order, id breaks the ties
+    """
+    after = Q(key__lt=key) if descending else Q(key__gt=key)
+    return after | Q(key=key, id__gt=document_id)
+
+
+@decorators.api_view(["GET", ])
+@decorators.permission_classes([])
+def merged_search_in_services_products(request: HttpRequest):
+    """
+    services and products ranked against each other in one stream
+    ?order=relevance|distance|price (relevance needs search, distance needs longitude & latitude)
+    &cursor=<next cursor of the previous page>, same filters as search_in_services_products
+    """
+    language, query_params = request.META.get("Accept-Language"), request.query_params.copy()
+    documents = SearchDocument.objects.all()
+    
+    order, cursor = query_params.pop("order", ["price"])[0], query_params.pop("cursor", [None])[0]
+    callables, query_params, pagination_number = get_callables(query_params)
+    
+    if order not in MERGED_ORDERINGS:
+        return Response(
+            {"error": f"order should be one of those: {list(MERGED_ORDERINGS)}"}
+            , status=status.HTTP_400_BAD_REQUEST)
+    
+    if order == "relevance" and "search" not in query_params:
+        return Response({"error": "relevance order needs a search"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if order == "distance" and "distance" not in query_params:
+        return Response(
+            {"error": "distance order needs longitude and latitude"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    Q_exprs = set()
+    for func in callables:
+        Q_expr, documents = func(query_params, documents)
+        Q_exprs.add(Q_expr)
+    
+    key, _, descending = MERGED_ORDERINGS[order]
+    point = query_params["distance"][0] if "distance" in query_params else None
+    documents = documents.filter(*Q_exprs).annotate(key=key(point))
+    
+    if cursor:
+        documents = documents.filter(keyset_filter(*decode_cursor(cursor, order), descending))
+    
+    # one extra document tells if there is a next page, no COUNT(*) needed
+    documents = list(documents.order_by(
+        F("key").desc() if descending else F("key").asc(), "id").values(
+        "id", "kind", "object_id", "key")[:pagination_number + 1])
+    
+    next_cursor = None
+    if len(documents) > pagination_number:
+        documents = documents[:pagination_number]
+        next_cursor = encode_cursor(order, documents[-1]["key"], documents[-1]["id"])
+    
+    # hydrate the records, then serialize them in the documents order
+    ids = {
+        kind: [doc["object_id"] for doc in documents if doc["kind"] == kind]
+        for kind in SearchDocument.Kinds.values
+    }
+    services = Service.objects.in_bulk(ids[SearchDocument.Kinds.SERVICE]).values()
+    products = Product.objects.in_bulk(ids[SearchDocument.Kinds.PRODUCT]).values()
+    
+    serialized = {
+        SearchDocument.Kinds.SERVICE: {
+            x["id"]: x for x in RUDServicesSerializer(list(services), many=True, language=language).data}
+        , SearchDocument.Kinds.PRODUCT: {
+            x["id"]: x for x in ProudctSerializer(list(products), many=True, language=language).data}
+    }
+    
+    results = [
+        {"kind": doc["kind"], **serialized[doc["kind"]][doc["object_id"]]}
+        for doc in documents if doc["object_id"] in serialized[doc["kind"]]
+    ]
+    
+    next_url = None
+    if next_cursor:
+        next_url = replace_query_param(request.build_absolute_uri(), "cursor", next_cursor)
+    
+    return Response({"next": next_url, "results": results}, status=status.HTTP_200_OK)
@@ -1,10 +1,12 @@
 from rest_framework import serializers
 
 from deliveries import models
+from utils.query_plan import RelatedPathsMixin
 
 
 
-class DeliverySerializer(serializers.ModelSerializer):
+class DeliverySerializer(RelatedPathsMixin, serializers.ModelSerializer):
+    select_related_paths = ("order__product", )
     
     class Meta:
         model = models.Delivery
@@ -0,0 +1,134 @@
+from django.db import DatabaseError, close_old_connections, transaction
+from django.conf import settings
+
+from typing import Optional
+import threading
+import logging
+import atexit
+import queue
+import time
+import os
+
+from .models import Notification
+from . import inbox, stream
+
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """
+    writes notifications out of the request
+    
+    - `send` queues the notification when the current transaction commits (nothing is sent for a rolled back one)
+    - a daemon worker thread collects up to `batch_size` of them or waits `flush_interval` seconds,
+      drops a notification queued twice (the same object) and writes the rest with one bulk_create
+      and one upsert of the unread counters (and tells the open streams, notification.stream),
+      two events with the same text are still two notifications
+    - with `asynchronous` False the notification is saved right away in the request (used by the tests)
+    """
+    
+    def __init__(self, asynchronous: bool = True, batch_size: int = 500, flush_interval: float = 0.5) -> None:
+        self.asynchronous = asynchronous
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        self.queue: queue.Queue[Notification] = queue.Queue()
+        self.worker: Optional[threading.Thread] = None
+        self.worker_pid: Optional[int] = None
+        self.lock = threading.Lock()
+    
+    def send(self, **fields) -> None:
+        notification = Notification(**fields)
+        
+        if not self.asynchronous:
+            notification.save()
+            return
+        
+        transaction.on_commit(lambda: self.enqueue(notification))
+    
+    def enqueue(self, notification: Notification) -> None:
+        self.start_worker()
+        self.queue.put(notification)
+    
+    def start_worker(self) -> None:
+        # a forked process (gunicorn, celery) gets a copy of the queue but not the thread
+        with self.lock:
+            if self.worker is not None and self.worker.is_alive() and self.worker_pid == os.getpid():
+                return
+            
+            if self.worker_pid != os.getpid():
+                self.queue = queue.Queue()
+            
+            self.worker_pid = os.getpid()
+            self.worker = threading.Thread(target=self.run, name="notification-dispatcher", daemon=True)
+            self.worker.start()
+    
+    def run(self) -> None:
+        while True:
+            batch = self.collect()
+            
+            # one retry, for a connection the database closed meanwhile
+            for attempt in range(2):
+                close_old_connections()
+                try:
+                    self.write(batch)
+                    break
+                except DatabaseError:
+                    if attempt:
+                        logger.exception("%s notifications were not written", len(batch))
+    
+    def collect(self) -> list[Notification]:
+        """
+        waits for a notification, then takes the ones coming in the next `flush_interval` seconds
+        """
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        return batch
+    
+    def flush(self) -> int:
+        """
+        writes everything waiting in the queue from the calling thread, returns how many were written
+        """
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        return self.write(batch)
+    
+    def write(self, batch: list[Notification]) -> int:
+        notifications = list({id(notification): notification for notification in batch}.values())
+        if notifications:
+            with transaction.atomic():
+                Notification.objects.bulk_create(notifications, batch_size=self.batch_size)
+                inbox.add_unread(notifications)
+                stream.publish(notifications)
+        
+        return len(notifications)
+
+
+dispatcher = NotificationDispatcher(**getattr(settings, "NOTIFICATION_DISPATCH", {}))
+
+# write the notifications still waiting when the process stops
+atexit.register(dispatcher.flush)
+
+
+def notify(**fields) -> None:
+    """
+    takes the Notification fields, see NotificationDispatcher.send
+    """
+    dispatcher.send(**fields)
@@ -0,0 +1,84 @@
+from django.db.models.functions import Greatest
+from django.db.models import Count, F
+from django.db import connection, transaction
+
+from collections import Counter
+from typing import Iterable
+
+from .models import Notification, UnreadCounter
+
+
+def inbox_of(user) -> tuple[str, str]:
+    """
+    (receiver_type, receiver) of the notifications sent to this user
+    """
+    hash_table = {
+        "ADMIN": ("System", "System")
+        , "USER": ("User", user.email)
+        , "SERVICE_PROVIDER": ("Service_Provider", user.email)
+    }
+    
+    return hash_table[user.user_type]
+
+
+def add_unread(notifications: Iterable[Notification]) -> None:
+    """
+    adds the new unread notifications to their receivers counters in one upsert
+    """
+    counts = Counter(
+        (notification.receiver_type, str(notification.receiver))
+        for notification in notifications if not notification.read)
+    if not counts:
+        return
+    
+    table = connection.ops.quote_name(UnreadCounter._meta.db_table)
+    values = ", ".join(["(%s, %s, %s)"] * len(counts))
+    params = [value for (receiver_type, receiver), count in counts.items() for value in (receiver_type, receiver, count)]
+    
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (receiver_type, receiver, count) VALUES {values} "
+            f"ON CONFLICT (receiver_type, receiver) DO UPDATE SET count = {table}.count + EXCLUDED.count"
+            , params)
+
+
+def refresh_unread(receiver_type: str, receiver: str) -> None:
+    """
+    recounts one receiver (an index only count), after a notification was edited or deleted
+    """
+    count = Notification.objects.filter(receiver_type=receiver_type, receiver=receiver, read=False).count()
+    UnreadCounter.objects.update_or_create(
+        receiver_type=receiver_type, receiver=receiver, defaults={"count": count})
+
+
+def unread_count(receiver_type: str, receiver: str) -> int:
+    count = UnreadCounter.objects.filter(
+        receiver_type=receiver_type, receiver=receiver).values_list("count", flat=True).first()
+    return count or 0
+
+
+def mark_all_read(receiver_type: str, receiver: str) -> int:
+    """
+    one UPDATE for the whole inbox, returns how many notifications were unread
+    the counter row is locked first so the notifications added meanwhile wait for the commit
+    and stay counted, only the ones marked read are subtracted
+    """
+    with transaction.atomic():
+        counter = UnreadCounter.objects.select_for_update().filter(receiver_type=receiver_type, receiver=receiver)
+        list(counter.values_list("id", flat=True))
+        
+        updated = Notification.objects.filter(
+            receiver_type=receiver_type, receiver=receiver, read=False).update(read=True)
+        if updated:
+            counter.update(count=Greatest(F("count") - updated, 0))
+    
+    return updated
+
+
+def rebuild_unread_counters() -> None:
+    UnreadCounter.objects.all().delete()
+    
+    counts = (
+        Notification.objects.filter(read=False).order_by()
+        .values("receiver_type", "receiver").annotate(count=Count("id")))
+    UnreadCounter.objects.bulk_create([UnreadCounter(**count) for count in counts], batch_size=1000)
@@ -0,0 +1,56 @@
+from django.core.management import BaseCommand, CommandParser
+from django.db import transaction
+from django.utils import timezone
+from django.conf import settings
+
+from datetime import timedelta
+
+from notification.models import Notification, ArchivedNotification
+
+
+ARCHIVED_FIELDS = (
+    "id", "sender", "sender_type", "receiver", "receiver_type", "ar_content", "en_content", "created_at")
+
+
+class Command(BaseCommand):
+    help = "move the read notifications older than --days to the archive table, batch by batch"
+    
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--days", type=int, default=settings.NOTIFICATION_RETENTION["archive_after_days"])
+        parser.add_argument("--batch_size", type=int, default=1000)
+        parser.add_argument("--max_batches", type=int, default=None, help="stop after this many batches")
+    
+    def handle(self, *args, **options):
+        batch_size, max_batches = options.get("batch_size"), options.get("max_batches")
+        before = timezone.now() - timedelta(days=options.get("days"))
+        
+        count, batches = 0, 0
+        while max_batches is None or batches < max_batches:
+            moved = self.archive_batch(before, batch_size)
+            if not moved:
+                break
+            
+            count, batches = count + moved, batches + 1
+        
+        self.stdout.write(f"{count} notifications archived")
+    
+    def archive_batch(self, before, batch_size: int) -> int:
+        """
+        one short transaction per batch, so the Notification table isn't locked for long;
+        rows locked by a request are left for the next run.
+        read notifications aren't in the unread counters, so those stay as they are
+        """
+        with transaction.atomic():
+            rows = list(
+                Notification.objects.select_for_update(skip_locked=True)
+                .filter(read=True, created_at__lt=before).order_by("id")
+                .values(*ARCHIVED_FIELDS)[:batch_size])
+            if not rows:
+                return 0
+            
+            ArchivedNotification.objects.bulk_create(
+                [ArchivedNotification(**row) for row in rows], ignore_conflicts=True)
+            Notification.objects.filter(id__in=[row["id"] for row in rows]).delete()
+        
+        return len(rows)
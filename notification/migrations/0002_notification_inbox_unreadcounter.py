@@ -0,0 +1,42 @@
+# Generated by Django 4.2.6 on 2026-10-18 13:40
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_unread(apps, schema_editor):
+    Notification = apps.get_model("notification", "Notification")
+    UnreadCounter = apps.get_model("notification", "UnreadCounter")
+    
+    counts = (
+        Notification.objects.filter(read=False).order_by()
+        .values("receiver_type", "receiver").annotate(count=Count("id")))
+    UnreadCounter.objects.bulk_create([UnreadCounter(**count) for count in counts], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('notification', '0001_initial'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='UnreadCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('receiver', models.CharField(max_length=255)),
+                ('receiver_type', models.CharField(choices=[('User', 'User'), ('System', 'System'), ('Service_Provider', 'Service_Provider')], max_length=32)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='unreadcounter',
+            constraint=models.UniqueConstraint(fields=('receiver_type', 'receiver'), name='unread_counter_receiver'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['receiver_type', 'receiver', 'read', 'created_at'], name='notification_inbox'),
+        ),
+        migrations.RunPython(count_unread, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.6 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0002_notification_inbox_unreadcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedNotification',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('sender', models.CharField(max_length=255)),
+                ('sender_type', models.CharField(choices=[('User', 'User'), ('System', 'System'), ('Service_Provider', 'Service_Provider')], max_length=32)),
+                ('receiver', models.CharField(max_length=255)),
+                ('receiver_type', models.CharField(choices=[('User', 'User'), ('System', 'System'), ('Service_Provider', 'Service_Provider')], max_length=32)),
+                ('ar_content', models.CharField(max_length=1023)),
+                ('en_content', models.CharField(max_length=1023)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['receiver_type', 'receiver', 'created_at'], name='archived_notification_inbox')],
+            },
+        ),
+    ]
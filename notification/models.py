@@ -18,5 +18,52 @@ class Notification(models.Model):
     en_content = models.CharField(max_length=1023, null=False)
     created_at = models.DateTimeField(auto_now_add=True) # null to be False
     
+    class Meta:
+        indexes = [
+            # the inbox of one receiver (notification.inbox)
+            models.Index(fields=["receiver_type", "receiver", "read", "created_at", ], name="notification_inbox"),
+        ]
+    
     def __str__(self) -> str:
         return f"{self.sender} -> {self.receiver}, read: {self.read}"
+
+
+class UnreadCounter(models.Model):
+    """
+    unread notifications of every receiver, maintained by notification.inbox
+    """
+    receiver = models.CharField(max_length=255)
+    receiver_type = models.CharField(choices=Notification.Types.choices, max_length=32, null=False)
+    count = models.PositiveIntegerField(default=0, null=False)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["receiver_type", "receiver", ], name="unread_counter_receiver"),
+        ]
+    
+    def __str__(self) -> str:
+        return f"{self.receiver_type} {self.receiver}: {self.count}"
+
+
+class ArchivedNotification(models.Model):
+    """
+    read notifications moved out of the Notification table by the archive_notifications command,
+    the id is the one the notification had
+    """
+    id = models.BigIntegerField(primary_key=True)
+    sender = models.CharField(max_length=255)
+    sender_type = models.CharField(choices=Notification.Types.choices, max_length=32, null=False)
+    receiver = models.CharField(max_length=255)
+    receiver_type = models.CharField(choices=Notification.Types.choices, max_length=32, null=False)
+    ar_content = models.CharField(max_length=1023, null=False)
+    en_content = models.CharField(max_length=1023, null=False)
+    created_at = models.DateTimeField(null=False)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=["receiver_type", "receiver", "created_at", ], name="archived_notification_inbox"),
+        ]
+    
+    def __str__(self) -> str:
+        return f"{self.sender} -> {self.receiver}, archived: {self.archived_at}"
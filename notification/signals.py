@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Notification
+from . import inbox, stream
+
+
+# notification.dispatcher writes with bulk_create (no signals) and updates the counters itself
+
+@receiver(post_save, sender=Notification)
+def count_saved_notification(sender, instance: Notification, created: bool, **kwargs):
+    if created:
+        inbox.add_unread([instance])
+        stream.publish([instance])
+    else:
+        inbox.refresh_unread(instance.receiver_type, instance.receiver)
+
+
+@receiver(post_delete, sender=Notification)
+def count_deleted_notification(sender, instance: Notification, **kwargs):
+    if not instance.read:
+        inbox.refresh_unread(instance.receiver_type, instance.receiver)
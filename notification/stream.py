@@ -0,0 +1,170 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from django.http import HttpRequest
+from django.db import connection
+from django.conf import settings
+
+from asgiref.sync import sync_to_async
+from typing import AsyncIterator, Iterable, Optional
+import asyncio
+import logging
+import json
+import time
+
+from psycopg.conninfo import make_conninfo
+import psycopg
+
+from .serializers import NotificationSerializer
+from .models import Notification
+
+
+logger = logging.getLogger(__name__)
+
+# postgres channel, the payload is the receiver key of a new notification
+CHANNEL = "new_notification"
+
+
+def receiver_key(receiver_type: str, receiver) -> str:
+    return f"{receiver_type}:{receiver}"
+
+
+def publish(notifications: Iterable[Notification]) -> None:
+    """
+    one NOTIFY per receiver in one query, postgres delivers them when the transaction commits
+    """
+    keys = sorted({receiver_key(notification.receiver_type, notification.receiver) for notification in notifications})
+    if not keys:
+        return
+    
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_notify(%s, key) FROM unnest(%s::text[]) AS key", [CHANNEL, keys])
+
+
+class NotificationListener:
+    """
+    one LISTEN connection per process (per event loop), shared by all the open streams
+    
+    every stream subscribes an asyncio.Event for its receiver, the listener sets the events of
+    the receiver named in each postgres notification; the streams read the new rows themselves
+    """
+    
+    def __init__(self, reconnect_delay: float = 5) -> None:
+        self.reconnect_delay = reconnect_delay
+        self.subscribers: dict[str, set[asyncio.Event]] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.task: Optional[asyncio.Task] = None
+    
+    def subscribe(self, key: str) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop or self.task is None or self.task.done():
+            self.loop, self.subscribers = loop, {}
+            self.task = loop.create_task(self.listen())
+        
+        event = asyncio.Event()
+        self.subscribers.setdefault(key, set()).add(event)
+        return event
+    
+    def unsubscribe(self, key: str, event: asyncio.Event) -> None:
+        events = self.subscribers.get(key, set())
+        events.discard(event)
+        if not events:
+            self.subscribers.pop(key, None)
+    
+    def dispatch(self, key: str) -> None:
+        """
+        wakes the streams of the receiver `key` only
+        """
+        for event in self.subscribers.get(key, ()):
+            event.set()
+    
+    async def listen(self) -> None:
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(connection_info(), autocommit=True) as listener:
+                    await listener.execute(f"LISTEN {CHANNEL}")
+                    
+                    async for notify in listener.notifies():
+                        self.dispatch(notify.payload)
+            except psycopg.Error:
+                logger.exception("notifications listener disconnected")
+            
+            # the streams poll meanwhile (heartbeat), nothing is lost
+            await asyncio.sleep(self.reconnect_delay)
+
+
+def connection_info() -> str:
+    settings_dict = connection.settings_dict
+    return make_conninfo(
+        dbname=settings_dict["NAME"], user=settings_dict["USER"] or None
+        , password=settings_dict["PASSWORD"] or None, host=settings_dict["HOST"] or None
+        , port=settings_dict["PORT"] or None)
+
+
+listener = NotificationListener()
+
+
+def stream_user(request: HttpRequest):
+    """
+    the user of a JWT (header) or of the session, None when not authenticated
+    """
+    try:
+        authenticated = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    
+    if authenticated is not None:
+        return authenticated[0]
+    
+    return request.user if request.user.is_authenticated else None
+
+
+def latest_id(receiver_type: str, receiver: str) -> int:
+    return Notification.objects.filter(
+        receiver_type=receiver_type, receiver=receiver).order_by("-id").values_list("id", flat=True).first() or 0
+
+
+def event_message(notification: dict) -> str:
+    """
+    a notification as a server sent event, its id is the Last-Event-ID of a reconnection
+    """
+    return f"id: {notification['id']}\nevent: notification\ndata: {json.dumps(notification, default=str)}\n\n"
+
+
+def new_notifications(receiver_type: str, receiver: str, last_id: int, language: Optional[str]) -> list[dict]:
+    queryset = Notification.objects.filter(
+        receiver_type=receiver_type, receiver=receiver, id__gt=last_id).order_by("id")[:100]
+    return NotificationSerializer(queryset, many=True, language=language).data
+
+
+async def notification_events(
+    receiver_type: str, receiver: str, last_id: int, language: Optional[str]) -> AsyncIterator[str]:
+    """
+    server sent events: the notifications after `last_id`, then every new one as it's written
+    
+    - a comment line every `heartbeat` seconds keeps proxies from closing the connection,
+      and the inbox is read again then in case a postgres notification was missed
+    - the stream ends after `max_duration` seconds, the browser EventSource reconnects
+      by itself with the Last-Event-ID header (so a client that went away doesn't keep a stream)
+    """
+    options = settings.NOTIFICATION_STREAM
+    key = receiver_key(receiver_type, receiver)
+    event = listener.subscribe(key)
+    deadline = time.monotonic() + options["max_duration"]
+    
+    try:
+        yield f"retry: {options['retry'] * 1000}\n\n"
+        
+        while time.monotonic() < deadline:
+            # cleared before reading, a notification written meanwhile sets it again
+            event.clear()
+            for notification in await sync_to_async(new_notifications)(receiver_type, receiver, last_id, language):
+                last_id = notification["id"]
+                yield event_message(notification)
+            
+            try:
+                await asyncio.wait_for(event.wait(), timeout=options["heartbeat"])
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+    finally:
+        listener.unsubscribe(key, event)
@@ -1,3 +1,145 @@
-from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
+from django.utils import timezone
+from django.db import connection
 
-# Create your tests here.
+from hypothesis.extra.django import TestCase, TransactionTestCase
+
+from datetime import timedelta
+from io import StringIO
+import asyncio
+import json
+
+import psycopg
+
+from .dispatcher import NotificationDispatcher
+from .models import Notification, ArchivedNotification, UnreadCounter
+from .inbox import unread_count, mark_all_read
+from . import stream
+
+
+def notification_fields(**fields) -> dict:
+    return {
+        "sender": "System", "sender_type": "System"
+        , "receiver": "1", "receiver_type": "User"
+        , "ar_content": "تم تأكيد العملية", "en_content": "Operation confirmed"
+        , **fields
+    }
+
+
+class TestNotificationDispatcher(TestCase):
+    def test_synchronous_send_saves_right_away(self):
+        dispatcher = NotificationDispatcher(asynchronous=False)
+        dispatcher.send(**notification_fields())
+        
+        assert Notification.objects.count() == 1
+    
+    def test_send_waits_for_the_commit(self):
+        dispatcher = NotificationDispatcher()
+        
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            dispatcher.send(**notification_fields())
+        
+        assert len(callbacks) == 1
+        assert dispatcher.queue.empty()
+    
+    def test_queued_notifications_are_written_in_one_query(self):
+        dispatcher = NotificationDispatcher()
+        for receiver in ("1", "2"):
+            dispatcher.queue.put(Notification(**notification_fields(receiver=receiver)))
+        
+        with CaptureQueriesContext(connection) as context:
+            assert dispatcher.flush() == 2
+        
+        # the notifications and the unread counters
+        assert [query["sql"].split()[0] for query in context.captured_queries].count("INSERT") == 2
+        assert sorted(Notification.objects.values_list("receiver", flat=True)) == ["1", "2"]
+    
+    def test_same_content_notifications_are_all_written(self):
+        # two bookings by the same user in the same flush
+        dispatcher = NotificationDispatcher()
+        for _ in range(2):
+            dispatcher.queue.put(Notification(**notification_fields(receiver="2")))
+        
+        assert dispatcher.flush() == 2
+        assert Notification.objects.filter(receiver="2").count() == 2
+        assert unread_count("User", "2") == 2
+    
+    def test_notification_queued_twice_is_written_once(self):
+        dispatcher = NotificationDispatcher()
+        notification = Notification(**notification_fields(receiver="2"))
+        dispatcher.queue.put(notification)
+        dispatcher.queue.put(notification)
+        
+        assert dispatcher.flush() == 1
+        assert unread_count("User", "2") == 1
+
+
+class TestInbox(TestCase):
+    def test_unread_counter_follows_the_notifications(self):
+        notifications = [
+            Notification.objects.create(**notification_fields(receiver="a@b.c")) for _ in range(3)]
+        assert unread_count("User", "a@b.c") == 3
+        
+        notifications[0].read = True
+        notifications[0].save()
+        notifications[1].delete()
+        assert unread_count("User", "a@b.c") == 1
+        
+        # savepoint, counter lock, notifications update, counter update, release
+        with self.assertNumQueries(5):
+            assert mark_all_read("User", "a@b.c") == 1
+        
+        assert unread_count("User", "a@b.c") == 0
+    
+    def test_mark_all_read_subtracts_only_the_updated_notifications(self):
+        Notification.objects.create(**notification_fields(receiver="a@b.c"))
+        # a notification counted by a concurrent writer that isn't visible yet
+        UnreadCounter.objects.filter(receiver_type="User", receiver="a@b.c").update(count=2)
+        
+        assert mark_all_read("User", "a@b.c") == 1
+        assert unread_count("User", "a@b.c") == 1
+
+
+class TestArchiveNotifications(TestCase):
+    def test_only_old_read_notifications_are_archived(self):
+        old, old_unread, recent = [
+            Notification.objects.create(**notification_fields(read=read)) for read in (True, False, True)]
+        Notification.objects.filter(id__in=[old.id, old_unread.id]).update(
+            created_at=timezone.now() - timedelta(days=100))
+        
+        call_command("archive_notifications", days=90, batch_size=1, stdout=StringIO())
+        
+        assert set(Notification.objects.values_list("id", flat=True)) == {old_unread.id, recent.id}
+        assert list(ArchivedNotification.objects.values_list("id", flat=True)) == [old.id]
+
+
+class TestNotificationStream(TransactionTestCase):
+    def test_event_message(self):
+        message = stream.event_message({"id": 7, "content": "Operation confirmed"})
+        
+        assert message.endswith("\n\n")
+        lines = message.split("\n")
+        assert lines[:2] == ["id: 7", "event: notification"]
+        assert json.loads(lines[2].removeprefix("data: ")) == {"id": 7, "content": "Operation confirmed"}
+    
+    def test_published_notification_reaches_its_receiver_only(self):
+        with psycopg.connect(stream.connection_info(), autocommit=True) as listening:
+            payloads = []
+            listening.add_notify_handler(lambda notify: payloads.append(notify.payload))
+            listening.execute(f"LISTEN {stream.CHANNEL}")
+            
+            # the test isn't in a transaction, the notification is sent right away
+            stream.publish([Notification(**notification_fields(receiver="1"))])
+            # and read with the result of the next query
+            listening.execute("SELECT 1")
+        
+        assert payloads == ["User:1"]
+        
+        listener = stream.NotificationListener()
+        listener.subscribers = {"User:1": {asyncio.Event()}, "User:2": {asyncio.Event()}}
+        for payload in payloads:
+            listener.dispatch(payload)
+        
+        assert [event.is_set() for event in listener.subscribers["User:1"]] == [True]
+        assert [event.is_set() for event in listener.subscribers["User:2"]] == [False]
@@ -8,6 +8,9 @@ app_name = "notification"
 urlpatterns = [
     # filter notifications for multiple user types
     path("specific_user/", views.your_notifications, name="your_notifications"),
+    path("specific_user/unread/", views.unread_notifications_count, name="unread_notifications_count"),
+    path("specific_user/read_all/", views.mark_all_notifications_read, name="mark_all_notifications_read"),
+    path("specific_user/stream/", views.notifications_stream, name="notifications_stream"),
     
     # RUD Notification
     path("<int:pk>/", views.RUDNotification.as_view(), name="notification_rud_funcitonality"),
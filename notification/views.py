@@ -2,9 +2,13 @@ from rest_framework import generics, decorators
 from rest_framework import status, permissions
 from rest_framework.response import Response
 
-from django.http import HttpRequest
+from django.http import HttpRequest, JsonResponse, StreamingHttpResponse
 
-from . import models, serializers
+from asgiref.sync import sync_to_async
+
+from core.pagination_classes.cursor_paginator import cursor_paginated_response
+
+from . import models, serializers, inbox, stream
 
 
 
@@ -35,21 +39,62 @@ class RUDNotification(generics.RetrieveUpdateDestroyAPIView):
 def all_notification(request: HttpRequest):
     language = request.META.get("Accept-Language")
     queryset = models.Notification.objects.all()
-    serializer = serializers.NotificationSerializer(queryset, many=True, language=language)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    
+    # newest first
+    return cursor_paginated_response(
+        request, queryset, serializers.NotificationSerializer, ordering="-id", language=language)
 
 
 @decorators.api_view(["GET", ])
 def your_notifications(request: HttpRequest):
+    """
+    the inbox of the user, newest first, ?read=false for the unread ones only
+    """
     language = request.META.get("Accept-Language")
-    user_type = request.user.user_type
-    hash_table = {
-        "ADMIN": ("System", "System")
-        , "USER": ("User", request.user.email)
-        , "SERVICE_PROVIDER": ("Service_Provider", request.user.email)
-    }
-    
-    queryset = models.Notification.objects.filter(
-        receiver_type=hash_table[user_type][0], receiver=hash_table[user_type][1])
-    serializer = serializers.NotificationSerializer(queryset, many=True, language=language)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    receiver_type, receiver = inbox.inbox_of(request.user)
+    
+    queryset = models.Notification.objects.filter(receiver_type=receiver_type, receiver=receiver)
+    read = request.query_params.get("read")
+    if read in ("true", "false"):
+        queryset = queryset.filter(read=read == "true")
+    
+    return cursor_paginated_response(
+        request, queryset, serializers.NotificationSerializer, ordering="-created_at", language=language)
+
+
+@decorators.api_view(["GET", ])
+def unread_notifications_count(request: HttpRequest):
+    receiver_type, receiver = inbox.inbox_of(request.user)
+    return Response({"unread": inbox.unread_count(receiver_type, receiver)}, status=status.HTTP_200_OK)
+
+
+@decorators.api_view(["POST", ])
+def mark_all_notifications_read(request: HttpRequest):
+    receiver_type, receiver = inbox.inbox_of(request.user)
+    updated = inbox.mark_all_read(receiver_type, receiver)
+    
+    return Response({"updated": updated}, status=status.HTTP_200_OK)
+
+
+async def notifications_stream(request: HttpRequest):
+    """
+    server sent events of the new notifications of the user (served by core/asgi.py),
+    starts after the Last-Event-ID header (or ?last_id), else after the latest notification
+    """
+    user = await sync_to_async(stream.stream_user)(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=status.HTTP_401_UNAUTHORIZED)
+    
+    receiver_type, receiver = inbox.inbox_of(user)
+    last_id = request.headers.get("Last-Event-ID") or request.GET.get("last_id")
+    if last_id is None or not last_id.isdigit():
+        last_id = await sync_to_async(stream.latest_id)(receiver_type, receiver)
+    
+    language = request.META.get("Accept-Language")
+    events = stream.notification_events(receiver_type, receiver, int(last_id), language)
+    
+    response = StreamingHttpResponse(events, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no" # nginx
+    return response
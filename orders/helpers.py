@@ -0,0 +1,69 @@
+from rest_framework.serializers import ValidationError
+
+from django.db.models import Case, F, When, Value
+from django.db import transaction
+
+from collections import Counter
+from typing import Iterable
+
+from products.models import Product
+from utils.status_counters import Changes, apply_changes, local_today
+from . import models
+
+
+
+def place_order(patient, items: Iterable[tuple[int, int]]) -> models.Orders:
+    """
+    creates the order and its items from (product_id, quantity) pairs in one transaction
+    
+    the products rows are locked together (ordered by id, so two checkouts can't deadlock),
+    the stock is checked and decremented in one UPDATE, the items are created in one INSERT
+    and counted in the providers dashboard counters in one upsert,
+    the queries are the same whatever the number of items
+    nothing is written when a product doesn't exist or doesn't have enough quantity
+    """
+    items = list(items)
+    quantities = Counter()
+    for product_id, quantity in items:
+        quantities[product_id] += quantity
+    
+    if not quantities:
+        raise ValidationError({"error": "order must have one item or more"})
+    
+    with transaction.atomic():
+        products = (
+            Product.objects.select_related(None).select_related("service_provider_location")
+            .select_for_update(of=("self", ))
+            .filter(id__in=quantities).order_by("id")
+            .only("id", "price", "quantity", "service_provider_location__service_provider"))
+        products = {product.id: product for product in products}
+        
+        missing = sorted(set(quantities) - set(products))
+        if missing:
+            raise ValidationError({"error": f"products {missing} do not exist"})
+        
+        short = [
+            {"product_id": product_id, "available": products[product_id].quantity, "requested": quantity}
+            for product_id, quantity in quantities.items() if products[product_id].quantity < quantity]
+        if short:
+            raise ValidationError({"error": "not enough quantity", "products": short})
+        
+        Product.objects.filter(id__in=quantities).update(quantity=F("quantity") - Case(
+            *[When(id=product_id, then=Value(quantity)) for product_id, quantity in quantities.items()]))
+        
+        order = models.Orders.objects.create(patient=patient)
+        models.OrderItem.objects.bulk_create([
+            models.OrderItem(
+                order=order, product_id=product_id, quantity=quantity
+                , price=round(products[product_id].price * quantity, 2))
+            for product_id, quantity in items
+        ])
+        
+        changes = Changes()
+        for product_id, _ in items:
+            changes.transition(
+                products[product_id].service_provider_location.service_provider_id
+                , None, models.OrderItem.StatusChoices.PENDING)
+        apply_changes(models.OrderItemCounters, changes, local_today())
+    
+    return order
@@ -0,0 +1,46 @@
+from django.core.management import BaseCommand, CommandParser
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.db import transaction
+
+from orders.models import OrderItem, DailySales
+
+
+class Command(BaseCommand):
+    help = "rebuild the daily sales of the accepted order items"
+    
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch_size", type=int, default=1000)
+    
+    def handle(self, *args, **options):
+        batch_size = options.get("batch_size")
+        
+        # one grouped query over the accepted items, the day is the day of their last update
+        queryset = OrderItem.objects.filter(status=OrderItem.StatusChoices.ACCEPTED).order_by().values(
+            "product"
+            , location=F("product__service_provider_location")
+            , provider=F("product__service_provider_location__service_provider")
+            , day=TruncDate("last_update")
+        ).annotate(
+            sold=Sum("quantity"), sold_revenue=Sum(F("price") * F("quantity")), sold_items=Count("id"))
+        
+        count, batch = 0, []
+        
+        with transaction.atomic():
+            DailySales.objects.all().delete()
+            
+            for sales in queryset.iterator(chunk_size=batch_size):
+                batch.append(DailySales(
+                    provider_id=sales["provider"], location_id=sales["location"], product_id=sales["product"]
+                    , day=sales["day"], quantity=sales["sold"], revenue=sales["sold_revenue"]
+                    , items_count=sales["sold_items"]))
+                
+                if len(batch) == batch_size:
+                    DailySales.objects.bulk_create(batch)
+                    count, batch = count + len(batch), []
+            
+            if batch:
+                DailySales.objects.bulk_create(batch)
+                count += len(batch)
+        
+        self.stdout.write(f"{count} DailySales records rebuilt")
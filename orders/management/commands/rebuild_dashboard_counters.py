@@ -0,0 +1,59 @@
+from django.core.management import BaseCommand, CommandParser
+from django.db.models import Count, F, Q
+from django.db import transaction
+
+from appointments.models import Appointments, AppointmentCounters
+from orders.models import OrderItem, OrderItemCounters
+from utils.status_counters import STATUSES, local_today
+
+
+class Command(BaseCommand):
+    help = "rebuild the appointments and order items dashboard counters of every provider"
+    
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch_size", type=int, default=1000)
+    
+    def handle(self, *args, **options):
+        batch_size = options.get("batch_size")
+        
+        targets = (
+            (Appointments, AppointmentCounters, "service__provider_location__service_provider", "created_at")
+            , (OrderItem, OrderItemCounters
+                , "product__service_provider_location__service_provider", "order__created_at")
+        )
+        
+        for counted_model, counters_model, provider_path, created_path in targets:
+            count = self.rebuild(counted_model, counters_model, provider_path, created_path, batch_size)
+            self.stdout.write(f"{count} {counters_model.__name__} records rebuilt")
+    
+    def rebuild(self, counted_model, counters_model, provider_path: str, created_path: str, batch_size: int) -> int:
+        """
+        one grouped query over all counted records, then replaces the counters batch by batch
+        """
+        today = local_today()
+        status_of = {status: status.upper() if counted_model is OrderItem else status for status in STATUSES}
+        
+        queryset = counted_model.objects.order_by().values(provider=F(provider_path)).annotate(
+            all_count=Count("id")
+            , day_count=Count("id", filter=Q(**{f"{created_path}__date": today}))
+            , **{status: Count("id", filter=Q(status=value)) for status, value in status_of.items()})
+        
+        count, batch = 0, []
+        
+        with transaction.atomic():
+            counters_model.objects.all().delete()
+            
+            for counters in queryset.iterator(chunk_size=batch_size):
+                batch.append(counters_model(
+                    **{key: value for key, value in counters.items() if key != "provider"}
+                    , provider_id=counters["provider"], day=today))
+                
+                if len(batch) == batch_size:
+                    counters_model.objects.bulk_create(batch)
+                    count, batch = count + len(batch), []
+            
+            if batch:
+                counters_model.objects.bulk_create(batch)
+                count += len(batch)
+        
+        return count
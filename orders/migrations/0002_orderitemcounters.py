@@ -0,0 +1,51 @@
+# Generated by Django 4.2.6 on 2026-10-18 18:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# same counters as the rebuild_dashboard_counters command, an item is created with its order
+FILL_COUNTERS = """
+INSERT INTO orders_orderitemcounters (provider_id, all_count, pending, accepted, rejected, day, day_count)
+SELECT location.service_provider_id
+    , COUNT(*)
+    , COUNT(*) FILTER (WHERE item.status = 'PENDING')
+    , COUNT(*) FILTER (WHERE item.status = 'ACCEPTED')
+    , COUNT(*) FILTER (WHERE item.status = 'REJECTED')
+    , (now() AT TIME ZONE %s)::date
+    , COUNT(*) FILTER (WHERE ("order".created_at AT TIME ZONE %s)::date = (now() AT TIME ZONE %s)::date)
+FROM orders_orderitem AS item
+JOIN orders_orders AS "order" ON "order".id = item.order_id
+JOIN products_product AS product ON product.id = item.product_id
+JOIN service_providers_serviceproviderlocations AS location ON location.id = product.service_provider_location_id
+GROUP BY location.service_provider_id
+"""
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('service_providers', '0003_serviceproviderlocations_open_minutes'),
+        ('orders', '0001_initial'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='OrderItemCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('all_count', models.IntegerField(default=0)),
+                ('pending', models.IntegerField(default=0)),
+                ('accepted', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('day', models.DateField(null=True)),
+                ('day_count', models.IntegerField(default=0)),
+                ('provider', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='order_item_counters', to='service_providers.serviceprovider')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunSQL([(FILL_COUNTERS, [settings.TIME_ZONE] * 3)], migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.6 on 2026-10-18 19:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# same rows as the rebuild_daily_sales command
+FILL_DAILY_SALES = """
+INSERT INTO orders_dailysales (provider_id, location_id, product_id, day, quantity, revenue, items_count)
+SELECT location.service_provider_id, location.id, item.product_id, (item.last_update AT TIME ZONE %s)::date
+    , SUM(item.quantity), SUM(item.price * item.quantity), COUNT(*)
+FROM orders_orderitem AS item
+JOIN products_product AS product ON product.id = item.product_id
+JOIN service_providers_serviceproviderlocations AS location ON location.id = product.service_provider_location_id
+WHERE item.status = 'ACCEPTED'
+GROUP BY 1, 2, 3, 4
+"""
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('service_providers', '0003_serviceproviderlocations_open_minutes'),
+        ('products', '__first__'),
+        ('orders', '0002_orderitemcounters'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='DailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('quantity', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('items_count', models.IntegerField(default=0)),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='service_providers.serviceproviderlocations')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='products.product')),
+                ('provider', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='service_providers.serviceprovider')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailysales',
+            constraint=models.UniqueConstraint(fields=('provider', 'location', 'product', 'day'), name='daily_sales_key'),
+        ),
+        migrations.AddIndex(
+            model_name='dailysales',
+            index=models.Index(fields=['provider', 'day'], name='daily_sales_provider'),
+        ),
+        migrations.AddIndex(
+            model_name='dailysales',
+            index=models.Index(fields=['location', 'day'], name='daily_sales_location'),
+        ),
+        migrations.RunSQL([(FILL_DAILY_SALES, [settings.TIME_ZONE])], migrations.RunSQL.noop),
+    ]
@@ -1,7 +1,9 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
 
 from products.models import Product
+from service_providers.models import ServiceProvider, ServiceProviderLocations
+from utils.status_counters import StatusCounters
 
 
 User = get_user_model()
@@ -25,6 +27,51 @@ class OrderItem(models.Model):
     price = models.DecimalField(null=False, max_digits=8, decimal_places=2, default=0)
     status = models.CharField(max_length=16, null=False, choices=StatusChoices.choices, default=StatusChoices.PENDING)
     last_update = models.DateTimeField(auto_now=True)
+    
+    def save(self, *args, **kwargs) -> None:
+        # orders.signals locks the row in pre_save until the counters and sales are updated in post_save
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class OrderItemCounters(StatusCounters):
+    """
+    order items of a provider by status, kept up to date by orders.helpers.place_order and orders.signals
+    rebuild all records with: python manage.py rebuild_dashboard_counters
+    """
+    provider = models.OneToOneField(ServiceProvider, on_delete=models.CASCADE, related_name="order_item_counters")
+    
+    def __str__(self) -> str:
+        return f"{self.provider_id} -> all: {self.all_count}, pending: {self.pending}"
+
+
+class DailySales(models.Model):
+    """
+    accepted order items of a product per day, kept up to date by orders.signals
+    the day is the local day of the item last_update (auto_now), the field the item reports filter on,
+    not the day it was accepted: a later save of an accepted item moves it to the day of that save
+    the sales reports read these rows instead of the items
+    rebuild all records with: python manage.py rebuild_daily_sales
+    """
+    provider = models.ForeignKey(ServiceProvider, on_delete=models.CASCADE, related_name="daily_sales")
+    location = models.ForeignKey(ServiceProviderLocations, on_delete=models.CASCADE, related_name="daily_sales")
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="daily_sales")
+    day = models.DateField(null=False)
+    quantity = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    items_count = models.IntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["provider", "location", "product", "day", ], name="daily_sales_key"),
+        ]
+        indexes = [
+            models.Index(fields=["provider", "day", ], name="daily_sales_provider"),
+            models.Index(fields=["location", "day", ], name="daily_sales_location"),
+        ]
+    
+    def __str__(self) -> str:
+        return f"{self.product_id} on {self.day}: {self.quantity} -> {self.revenue}"
 
 
 class CartItems(models.Model):
@@ -30,7 +30,7 @@ class HasPermission(permissions.BasePermission):
             codename = f"{method_name}_{model_name}"
         
         group = helpers.Groups()
-        result = group.has_permission(codename, request.user.groups.first())
+        result = group.has_permission(codename, helpers.user_group(request.user))
         return result
 
 
@@ -50,6 +50,6 @@ class ListItemsPermission(permissions.BasePermission):
         codename = f"list_orderitems"
         
         group = helpers.Groups()
-        result = group.has_permission(codename, request.user.groups.first())
+        result = group.has_permission(codename, helpers.user_group(request.user))
         
         return result
\ No newline at end of file
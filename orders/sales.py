@@ -0,0 +1,118 @@
+from rest_framework import exceptions
+
+from django.db.models import Sum, QuerySet
+from django.db.models.functions import Trunc
+from django.db import connection
+from django.conf import settings
+
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from utils.status_counters import local_today
+
+from .models import DailySales
+
+
+PERIODS = ("day", "week", "month", "year")
+
+# (provider id, location id, product id, day)
+SalesKey = tuple[int, int, int, date]
+
+
+def local_date(moment: datetime) -> date:
+    if moment.tzinfo is None:
+        return moment.date()
+    
+    return moment.astimezone(ZoneInfo(settings.TIME_ZONE)).date()
+
+
+class SalesChanges:
+    """
+    deltas of the daily sales, an accepted item counts on the day of its last update (as the item reports,
+    so a later save moves it from its previous day to today) as its quantity, its revenue
+    (the reports total_price) and one item
+    """
+    
+    def __init__(self) -> None:
+        self.deltas: defaultdict[SalesKey, list] = defaultdict(lambda: [0, Decimal(0), 0])
+    
+    def add(self, key: SalesKey, quantity: int, price: Decimal, sign: int = 1) -> None:
+        deltas = self.deltas[key]
+        deltas[0] += sign * quantity
+        deltas[1] += sign * price * quantity
+        deltas[2] += sign
+
+
+def apply_sales(changes: SalesChanges, create: bool = True) -> None:
+    """
+    adds the deltas to the daily sales in one query
+    without create the missing rows are not inserted (the product may be in the middle of a cascade delete)
+    """
+    rows = [(key, deltas) for key, deltas in changes.deltas.items() if any(deltas)]
+    if not rows:
+        return
+    
+    table = connection.ops.quote_name(DailySales._meta.db_table)
+    values = ", ".join(["(%s, %s, %s, %s::date, %s, %s::numeric, %s)"] * len(rows))
+    params = [value for key, deltas in rows for value in (*key, *deltas)]
+    columns = "provider_id, location_id, product_id, day, quantity, revenue, items_count"
+    
+    if create:
+        sql = (
+            f"INSERT INTO {table} ({columns}) VALUES {values} "
+            f"ON CONFLICT (provider_id, location_id, product_id, day) DO UPDATE SET "
+            f"quantity = {table}.quantity + EXCLUDED.quantity, revenue = {table}.revenue + EXCLUDED.revenue"
+            f", items_count = {table}.items_count + EXCLUDED.items_count")
+    else:
+        sql = (
+            f"UPDATE {table} SET quantity = {table}.quantity + change.quantity"
+            f", revenue = {table}.revenue + change.revenue, items_count = {table}.items_count + change.items_count "
+            f"FROM (VALUES {values}) AS change ({columns}) "
+            f"WHERE ({table}.provider_id, {table}.location_id, {table}.product_id, {table}.day)"
+            f" = (change.provider_id, change.location_id, change.product_id, change.day)")
+    
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def requested_range(query_params: dict[str, Any]) -> tuple[date, date, str]:
+    """
+    ?from=YYYY-MM-DD (default first day of this year) &to=YYYY-MM-DD (default today) &period=day|week|month|year
+    """
+    today = local_today()
+    try:
+        first_day = (
+            date.fromisoformat(query_params["from"]) if query_params.get("from")
+            else today.replace(month=1, day=1))
+        last_day = date.fromisoformat(query_params["to"]) if query_params.get("to") else today
+    except ValueError:
+        raise exceptions.ValidationError({"error": "from and to should be YYYY-MM-DD"})
+    
+    period = query_params.get("period", "month")
+    if period not in PERIODS:
+        raise exceptions.ValidationError({"error": f"period should be one of {list(PERIODS)}"})
+    
+    return first_day, last_day, period
+
+
+def sales_report(queryset: QuerySet, first_day: date, last_day: date, period: str) -> dict[str, Any]:
+    """
+    {totals: {quantity, revenue, items_count}, series: [{period, quantity, revenue, items_count}]}
+    two queries over the daily rows (a year is at most 366 rows per product)
+    """
+    queryset = queryset.filter(day__range=(first_day, last_day)).order_by()
+    sums = {
+        "quantity": Sum("quantity", default=0)
+        , "revenue": Sum("revenue", default=0)
+        , "items_count": Sum("items_count", default=0)
+    }
+    
+    series = (
+        queryset.annotate(period=Trunc("day", period)).values("period")
+        .annotate(**sums).order_by("period"))
+    
+    return {"totals": queryset.aggregate(**sums), "series": list(series)}
+
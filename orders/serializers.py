@@ -4,16 +4,24 @@ from django.db import models
 
 from typing import Any
 
-from . import models
+from . import models, helpers
+
+from utils.query_plan import RelatedPathsMixin
 
 from deliveries.models import Delivery
 
 
 """ **{ the below serializer used in orders_view views }** """ #
-class ItemsSerializer(serializers.ModelSerializer):
+class ItemsSerializer(RelatedPathsMixin, serializers.ModelSerializer):
     """
     to use in orders serializer only
     """
+    select_related_paths = ("order", "product", )
+    
+    # the products are fetched (and locked) together by orders.helpers.place_order
+    product = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=1, default=1)
+    
     class Meta:
         fields = ("id", "price", "quantity", "product", "last_update")
         model = models.OrderItem
@@ -39,7 +47,10 @@ class ItemsSerializer(serializers.ModelSerializer):
         }
 
 
-class OrdersSerializer(serializers.ModelSerializer): #
+class OrdersSerializer(RelatedPathsMixin, serializers.ModelSerializer): #
+    select_related_paths = ("patient", )
+    prefetch_related_paths = ("items__product", )
+    
     items = ItemsSerializer(many=True)
     
     class Meta:
@@ -55,29 +66,11 @@ class OrdersSerializer(serializers.ModelSerializer): #
     
     def create(self, validated_data: dict[str, Any]):
         """
-        first we create Order instance without price
-        then we make a list of order items
-        we use bulk create to create (one or more) OrderItmes objects related with the previous order instance
-        then we change the Order instance price with the sum of all OrderItems objects prices
-        and we return the Order instance
+        the order, its items and the products quantities are written in one transaction,
+        see orders.helpers.place_order
         """
-        patient_obj = validated_data.pop("patient")
-        order = models.Orders.objects.create(patient=patient_obj)
-        
-        OrdersItems = []
-        for OrderDict in validated_data.get("items"):
-            product, quantity = OrderDict["product"], OrderDict["quantity"] or 1
-            price = round(product.price * quantity, 2)
-            
-            product.quantity -= quantity
-            product.save()
-            
-            item = models.OrderItem(order=order, product=product, quantity=quantity, price=price)
-            OrdersItems.append(item)
-        
-        models.OrderItem.objects.bulk_create(OrdersItems)
-        
-        return order
+        items = [(item["product"], item["quantity"]) for item in validated_data.get("items")]
+        return helpers.place_order(validated_data.pop("patient"), items)
     
     def to_representation(self, instance: models.Orders):
         items_queryset = instance.items.all()
@@ -92,7 +85,8 @@ class OrdersSerializer(serializers.ModelSerializer): #
 
 
 """ **{ serializer below user in cart views classes and functions}** """ #
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(RelatedPathsMixin, serializers.ModelSerializer):
+    select_related_paths = ("patient", "product", )
     
     class Meta:
         model = models.CartItems
@@ -122,7 +116,8 @@ class CartSerializer(serializers.ModelSerializer):
             }
 
 
-class SpecificItemSerialzier(serializers.ModelSerializer):
+class SpecificItemSerialzier(RelatedPathsMixin, serializers.ModelSerializer):
+    select_related_paths = ("order__patient", "product__service_provider_location", )
     
     class Meta:
         model = models.OrderItem
@@ -161,7 +156,8 @@ class SpecificItemSerialzier(serializers.ModelSerializer):
         }
 
 
-class ReportItemSerialzier(serializers.ModelSerializer):
+class ReportItemSerialzier(RelatedPathsMixin, serializers.ModelSerializer):
+    select_related_paths = ("order__patient", "product", )
     
     class Meta:
         model = models.OrderItem
@@ -190,7 +186,8 @@ class ReportItemSerialzier(serializers.ModelSerializer):
         }
 
 
-class RejectedOrderSerializer(serializers.ModelSerializer):
+class RejectedOrderSerializer(RelatedPathsMixin, serializers.ModelSerializer):
+    select_related_paths = ("order__order__patient", )
     
     class Meta:
         model = models.RejectedOrders
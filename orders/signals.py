@@ -0,0 +1,96 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from typing import Optional
+
+from products.models import Product
+from utils.status_counters import Changes, apply_changes, local_today
+
+from . import models
+from .sales import SalesChanges, apply_sales, local_date
+
+
+# the item before the update, memo from pre_save for post_save
+PREVIOUS_ATTRIBUTE = "_previous_state"
+PREVIOUS_FIELDS = (
+    "status", "product", "product__service_provider_location"
+    , "product__service_provider_location__service_provider", "quantity", "price", "last_update")
+
+ACCEPTED = models.OrderItem.StatusChoices.ACCEPTED
+
+
+def product_place(product_id: int) -> tuple[Optional[int], Optional[int]]:
+    """
+    (location id, provider id) of the product
+    """
+    place = Product.objects.filter(id=product_id).values_list(
+        "service_provider_location", "service_provider_location__service_provider").first()
+    return place or (None, None)
+
+
+def count(provider_id: Optional[int], old: Optional[str], new: Optional[str], create: bool = True) -> None:
+    if provider_id is not None:
+        changes = Changes()
+        changes.transition(provider_id, old, new)
+        apply_changes(models.OrderItemCounters, changes, local_today(), create=create)
+
+
+@receiver(pre_save, sender=models.OrderItem)
+def remember_previous_state(sender, instance: models.OrderItem, raw: bool = False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    
+    # locked until the save commits (OrderItem.save is atomic): a concurrent update of the same item
+    # waits and then reads this one's status, so a transition is never counted twice
+    previous = sender.objects.select_for_update(of=("self", )).filter(
+        pk=instance.pk).values(*PREVIOUS_FIELDS).first()
+    instance.__dict__[PREVIOUS_ATTRIBUTE] = previous
+
+
+@receiver(post_save, sender=models.OrderItem)
+def item_saved(sender, instance: models.OrderItem, created: bool, raw: bool = False, **kwargs):
+    """
+    the items of an order are counted by place_order, its bulk_create sends no signal
+    """
+    if raw:
+        return
+    
+    previous = instance.__dict__.pop(PREVIOUS_ATTRIBUTE, None)
+    location_id, provider_id = product_place(instance.product_id)
+    previous_provider_id = previous and previous["product__service_provider_location__service_provider"]
+    
+    if previous is None:
+        count(provider_id, None, instance.status)
+    elif previous_provider_id == provider_id:
+        count(provider_id, previous["status"], instance.status)
+    else:
+        count(previous_provider_id, previous["status"], None)
+        count(provider_id, None, instance.status)
+    
+    sales = SalesChanges()
+    if previous is not None and previous["status"] == ACCEPTED:
+        sales.add(
+            (previous_provider_id, previous["product__service_provider_location"]
+                , previous["product"], local_date(previous["last_update"]))
+            , previous["quantity"], previous["price"], sign=-1)
+    
+    if instance.status == ACCEPTED and location_id is not None:
+        sales.add(
+            (provider_id, location_id, instance.product_id, local_date(instance.last_update))
+            , instance.quantity, instance.price)
+    
+    apply_sales(sales)
+
+
+@receiver(post_delete, sender=models.OrderItem)
+def item_deleted(sender, instance: models.OrderItem, **kwargs):
+    # don't create the counters and sales here, the provider itself may be in the middle of a cascade delete
+    location_id, provider_id = product_place(instance.product_id)
+    count(provider_id, instance.status, None, create=False)
+    
+    if instance.status == ACCEPTED and location_id is not None:
+        sales = SalesChanges()
+        sales.add(
+            (provider_id, location_id, instance.product_id, local_date(instance.last_update))
+            , instance.quantity, instance.price, sign=-1)
+        apply_sales(sales, create=False)
@@ -1,3 +1,201 @@
-from django.test import TestCase
+from django.contrib.auth.models import Group, Permission
+from django.contrib.auth import get_user_model
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 
-# Create your tests here.
+from rest_framework.serializers import ValidationError
+from rest_framework.test import APIClient
+
+from hypothesis.extra.django import TestCase
+
+from datetime import date
+from decimal import Decimal
+
+from category.models import Category
+from orders import models
+from orders.helpers import place_order
+from orders.sales import SalesChanges
+from products.models import Product
+from service_providers.models import ServiceProvider
+from utils.export import csv_lines
+from utils.status_counters import Changes
+from utils import testing
+
+Users = get_user_model()
+
+
+class MarketplaceData:
+    """
+    a provider with one location, its products and a patient for the orders tests
+    """
+    
+    def setUp(self) -> None:
+        category = Category.objects.create(en_name="pharmacy", ar_name="صيدلية")
+        provider_id = testing.create_provider(category, account_status=ServiceProvider.AccountStatus.ACCEPTED)
+        
+        self.location = testing.create_location(provider_id)
+        self.patient = Users.objects.create(
+            email="patient@test.com", phone="+971500000002", password="password"
+            , user_type="USER", is_active=True)
+    
+    def create_product(self, quantity: int, price: str = "10.00") -> Product:
+        return testing.create_product(self.location, quantity, price)
+
+
+class TestStatusCountersChanges(TestCase):
+    def test_creation_counts_all_and_today(self):
+        changes = Changes()
+        changes.transition(1, None, "PENDING", count=3)
+        
+        assert changes.deltas[1] == {"all_count": 3, "day_count": 3, "pending": 3}
+    
+    def test_status_change_moves_one_count(self):
+        changes = Changes()
+        changes.transition(1, "PENDING", "ACCEPTED")
+        changes.transition(1, "ACCEPTED", "ACCEPTED")
+        
+        assert changes.deltas[1] == {"pending": -1, "accepted": 1}
+    
+    def test_deletion_doesnt_change_today(self):
+        changes = Changes()
+        changes.transition(1, "REJECTED", None)
+        
+        assert changes.deltas[1] == {"all_count": -1, "rejected": -1}
+
+
+class TestSalesChanges(TestCase):
+    def test_unchanged_accepted_item_cancels_out(self):
+        key = (1, 2, 3, date(2026, 10, 18))
+        
+        sales = SalesChanges()
+        sales.add(key, 2, Decimal("10.50"), sign=-1)
+        sales.add(key, 2, Decimal("10.50"))
+        
+        assert not any(sales.deltas[key])
+    
+    def test_revenue_is_price_times_quantity(self):
+        key = (1, 2, 3, date(2026, 10, 18))
+        
+        sales = SalesChanges()
+        sales.add(key, 3, Decimal("10.50"))
+        
+        assert sales.deltas[key] == [3, Decimal("31.50"), 1]
+
+
+class TestCsvExport(TestCase):
+    def test_nested_rows_become_columns(self):
+        rows = [
+            {"order_id": 1, "patient": {"id": 2}, "order_items": [{"product": 3}]}
+            , {"order_id": 4, "patient": {"id": 5}, "order_items": []}
+        ]
+        
+        assert list(csv_lines(iter(rows))) == [
+            "order_id,patient.id,order_items\r\n"
+            , '1,2,"[{""product"": 3}]"\r\n'
+            , "4,5,[]\r\n"
+        ]
+
+
+class TestReportExport(MarketplaceData, TestCase):
+    def test_user_report_streams_one_csv_row_per_item(self):
+        product = self.create_product(quantity=10)
+        order = models.Orders.objects.create(patient=self.patient)
+        for quantity in (1, 2):
+            models.OrderItem.objects.create(order=order, product=product, quantity=quantity, price=product.price)
+        
+        client = APIClient()
+        client.force_authenticate(self.patient)
+        response = client.get(f"/api/v1/orders/user/reports/items/{self.patient.id}?export=csv")
+        
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/csv"
+        
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert lines[0].split(",") == [
+            "id", "order_id", "user_id", "user_email", "product_id", "product_title"
+            , "quantity", "unit_price", "total_price", "status", "last_update"]
+        assert len(lines) == 3
+
+
+class TestPlaceOrder(MarketplaceData, TestCase):
+    def quantities(self, *products: Product) -> list[int]:
+        return [Product.objects.get(id=product.id).quantity for product in products]
+    
+    def test_short_stock_rejects_the_whole_order(self):
+        enough, short = self.create_product(quantity=5), self.create_product(quantity=1)
+        
+        with self.assertRaises(ValidationError):
+            place_order(self.patient, [(enough.id, 2), (short.id, 3)])
+        
+        assert self.quantities(enough, short) == [5, 1]
+        assert not models.Orders.objects.exists()
+    
+    def test_missing_product_rejects_the_order(self):
+        product = self.create_product(quantity=5)
+        
+        with self.assertRaises(ValidationError):
+            place_order(self.patient, [(product.id, 1), (product.id + 1000, 1)])
+        
+        assert self.quantities(product) == [5]
+        assert not models.Orders.objects.exists()
+    
+    def test_stock_is_decremented_by_the_ordered_quantity(self):
+        first, second = self.create_product(quantity=5), self.create_product(quantity=3)
+        
+        order = place_order(self.patient, [(first.id, 2), (second.id, 3), (first.id, 1)])
+        
+        assert self.quantities(first, second) == [2, 0]
+        assert sorted(order.items.values_list("product_id", "quantity")) == sorted(
+            [(first.id, 2), (second.id, 3), (first.id, 1)])
+    
+    def test_queries_dont_grow_with_the_items(self):
+        products = [self.create_product(quantity=10) for _ in range(4)]
+        
+        with CaptureQueriesContext(connection) as one_item:
+            place_order(self.patient, [(products[0].id, 1)])
+        
+        with self.assertNumQueries(len(one_item.captured_queries)):
+            place_order(self.patient, [(product.id, 1) for product in products])
+
+
+class TestCheckoutCart(MarketplaceData, TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        group = Group.objects.create(name="USER")
+        group.permissions.add(Permission.objects.get(codename="add_orders"))
+        self.patient.groups.add(group)
+        
+        self.client = APIClient()
+        self.client.force_authenticate(self.patient)
+    
+    def checkout(self):
+        return self.client.post("/api/v1/orders/cart/checkout/")
+    
+    def test_checkout_creates_the_order_and_empties_the_cart(self):
+        first, second = self.create_product(quantity=5), self.create_product(quantity=5)
+        models.CartItems.objects.create(patient=self.patient, product=first, quantity=2)
+        models.CartItems.objects.create(patient=self.patient, product=second, quantity=1)
+        
+        response = self.checkout()
+        
+        assert response.status_code == 201
+        order = models.Orders.objects.get(patient=self.patient)
+        assert sorted(order.items.values_list("product_id", "quantity")) == sorted([(first.id, 2), (second.id, 1)])
+        assert not models.CartItems.objects.filter(patient=self.patient).exists()
+    
+    def test_empty_cart_is_rejected(self):
+        response = self.checkout()
+        
+        assert response.status_code == 400
+        assert not models.Orders.objects.exists()
+    
+    def test_short_stock_keeps_the_cart(self):
+        product = self.create_product(quantity=1)
+        models.CartItems.objects.create(patient=self.patient, product=product, quantity=3)
+        
+        response = self.checkout()
+        
+        assert response.status_code == 400
+        assert models.CartItems.objects.filter(patient=self.patient).count() == 1
+        assert Product.objects.get(id=product.id).quantity == 1
+        assert not models.Orders.objects.exists()
@@ -18,6 +18,7 @@ router.register("rejected", rejected_orders_views.RejectedOrdersViewSet, basenam
 urlpatterns = [
     # cart
     re_path(r"^cart/user/(\d{1,})?$", cart_views.user_cart, name="user_cart"),
+    path("cart/checkout/", cart_views.checkout_cart, name="checkout_cart"),
     
     # order
     path("<int:pk>/", orders_views.RetrieveDestroyOrders.as_view(), name="specific_order"),
@@ -41,6 +42,8 @@ urlpatterns = [
     # items reporst
     path("provider/reports/items/", reports.provider_report, name="provider_report"),
     path("location/reports/items/<int:location_id>/", reports.location_report, name="location_report"),
+    path("provider/reports/sales/", reports.provider_sales, name="provider_sales"),
+    path("location/reports/sales/<int:location_id>/", reports.location_sales, name="location_sales"),
     re_path(r"^user/reports/items/(\d{1,})?$", reports.user_report, name="user_report"),
 
 ]
@@ -3,12 +3,13 @@ from rest_framework.response import Response
 from rest_framework import status
 
 from django.http import HttpRequest
+from django.db import transaction
 
 from typing import Optional
 
-from notification.models import Notification
+from notification.dispatcher import notify
 from utils.permission import authorization
-from orders import models, serializers
+from orders import models, serializers, helpers
 
 
 
@@ -30,7 +31,7 @@ class CartView(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver_type="User", receiver=request.user.id
             , ar_content="تم إضافة منتج جديد إلى قائمتك, بانتظار تأكيدك لعملية الشراء"
@@ -50,7 +51,7 @@ class CartView(viewsets.ModelViewSet):
     def update(self, request, *args, **kwargs):
         resp = super().update(request, *args, **kwargs)
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver_type="User", receiver=request.user.id
             , ar_content="تم التعديل على العنصر"
@@ -61,7 +62,7 @@ class CartView(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         resp = super().destroy(request, *args, **kwargs)
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver_type="User", receiver=request.user.id
             , ar_content="تم حذف العنصر من قائمة الانتظار"
@@ -82,3 +83,32 @@ def user_cart(request: HttpRequest, user_id: Optional[int]):
     serializer = serializers.CartSerializer(queryset, many=True, language=language)
     
     return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@decorators.api_view(["POST", ])
+@authorization("orders")
+def checkout_cart(request: HttpRequest):
+    """
+    turns the whole cart of the user into one order, the cart rows are locked so
+    the same cart can't be checked out twice at the same time
+    """
+    language = request.META.get("Accept-Language")
+    
+    with transaction.atomic():
+        cart = list(
+            models.CartItems.objects.select_for_update()
+            .filter(patient=request.user.id).order_by("id").values_list("id", "product_id", "quantity"))
+        if not cart:
+            return Response({"error": "your cart is empty"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        order = helpers.place_order(request.user, [(product_id, quantity) for _, product_id, quantity in cart])
+        models.CartItems.objects.filter(id__in=[cart_id for cart_id, _, _ in cart]).delete()
+    
+    notify(
+        sender="System", sender_type="System"
+        , receiver=request.user.id, receiver_type="User"
+        , ar_content="تم تأكيد العملية"
+        , en_content="Operation confirmed")
+    
+    serializer = serializers.OrdersSerializer(order, language=language)
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -2,16 +2,17 @@ from rest_framework import generics, decorators
 from rest_framework.response import Response
 from rest_framework import status
 
-from django.db.models import Count, Q
 from django.http import HttpRequest
 
-from datetime import datetime
 from typing import Optional
 
 from orders import models, serializers
 
 from utils.permission import HasPermission, authorization_with_method, authorization
-from notification.models import Notification
+from core.pagination_classes.cursor_paginator import cursor_paginated_response
+from utils.export import export_format, streaming_export
+from notification.dispatcher import notify
+from utils.status_counters import counts_of, local_today
 
 
 
@@ -44,7 +45,7 @@ class RetrieveDestroyUpdateItem(generics.RetrieveUpdateDestroyAPIView):
         self.perform_update(serializer)
         
         business_name = instance.product.service_provider_location.service_provider.business_name
-        Notification.objects.create(
+        notify(
             sender=f"{business_name}", sender_type="Service_Provider"
             , receiver=f"{serializer.data.get('user_email')}", receiver_type="User"
             , en_content=f"your order {serializer.data.get('status')}"
@@ -62,9 +63,13 @@ def list_all_items(request: HttpRequest):
     language = request.META.get("Accept-Language")
     
     queryset = models.OrderItem.objects.all()
-    serializer = serializers.SpecificItemSerialzier(queryset, many=True, language=language)
     
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    export = export_format(request)
+    if export:
+        return streaming_export(queryset, serializers.SpecificItemSerialzier, export, "items", language=language)
+    
+    return cursor_paginated_response(
+        request, queryset, serializers.SpecificItemSerialzier, ordering="id", language=language)
 
 
 @decorators.api_view(["GET", ])
@@ -105,6 +110,11 @@ def provider_items(request: HttpRequest):
 @decorators.api_view(["GET", ])
 @authorization_with_method("list", "orderitems")
 def provider_orders_dashboard(req: HttpRequest):
+    """
+    the provider counters (one row, see orders.models.OrderItemCounters)
+    and the first page of its items, the next pages are loaded with the cursor links
+    last is the number of items ordered today
+    """
     language = req.META.get("Accept-Language")
     query_params = req.query_params.copy()
     try:
@@ -112,20 +122,13 @@ def provider_orders_dashboard(req: HttpRequest):
     except:
         provider_id = req.user.id
     
-    queryset = models.OrderItem.objects.filter(
-        product__service_provider_location__service_provider=provider_id)
-    
-    if not queryset.exists():
+    counts = counts_of(models.OrderItemCounters, provider_id, local_today())
+    if not counts["all"]:
         return Response(
         {"message": "No product request came to this service provider"}, status=status.HTTP_404_NOT_FOUND)
     
-    aggregations = queryset.aggregate(
-        last=Count("id", filter=Q(last_update__day=datetime.now().day)),
-        pended=Count("id", filter=Q(status="PENDING")),
-        accepted=Count("id", filter=Q(status="ACCEPTED")),
-        rejected=Count("id", filter=Q(status="REJECTED")),
-        all=Count("id")
-        )
+    queryset = models.OrderItem.objects.filter(
+        product__service_provider_location__service_provider=provider_id)
     
     if req.query_params.get("order_status"):
         order_status = req.query_params.get("order_status")
@@ -139,14 +142,15 @@ def provider_orders_dashboard(req: HttpRequest):
     
     response_data = {
         "stats": {
-            "all": aggregations["all"],
-            "last": aggregations["last"],
-            "pended": aggregations["pended"],
-            "accepted": aggregations["accepted"],
-            "rejected": aggregations["rejected"]
+            "all": counts["all"],
+            "last": counts["today"],
+            "pended": counts["pending"],
+            "accepted": counts["accepted"],
+            "rejected": counts["rejected"]
             },
         
-        "orders": serializers.SpecificItemSerialzier(queryset, many=True, language=language).data
+        "orders": cursor_paginated_response(
+            req, queryset, serializers.SpecificItemSerialzier, language=language).data
         }
     
     return Response(data=response_data, status=status.HTTP_200_OK)
@@ -8,8 +8,10 @@ from typing import Optional
 
 from orders import serializers, models
 
-from notification.models import Notification
+from notification.dispatcher import notify
 from utils.permission import authorization, authorization_with_method, HasPermission
+from core.pagination_classes.cursor_paginator import cursor_paginated_response
+from utils.export import export_format, streaming_export
 
 
 
@@ -19,8 +21,12 @@ def list_all_orders(request: HttpRequest):
     language = request.META.get("Accept-Language")
     queryset = models.Orders.objects.all()
     
-    serializer = serializers.OrdersSerializer(queryset, many=True, language=language)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    export = export_format(request)
+    if export:
+        return streaming_export(queryset, serializers.OrdersSerializer, export, "orders", language=language)
+    
+    return cursor_paginated_response(
+        request, queryset, serializers.OrdersSerializer, ordering="id", language=language)
 
 
 class CreateOrder(generics.CreateAPIView):
@@ -38,7 +44,7 @@ class CreateOrder(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         resp = super().create(request, *args, **kwargs)
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=request.user.id, receiver_type="User"
             , ar_content="تم تأكيد العملية"
@@ -7,9 +7,10 @@ from django.db.models import F
 
 from typing import Optional
 
-from orders import models, serializers
+from orders import models, serializers, sales
 
 from utils.permission import authorization_with_method
+from utils.export import export_format, streaming_export
 
 
 
@@ -34,6 +35,11 @@ def provider_report(request: HttpRequest):
         product__service_provider_location__service_provider=provider_id
         , status="ACCEPTED", **additional_fields).annotate(total_price= F("price") * F("quantity"))
     
+    export = export_format(request)
+    if export:
+        return streaming_export(
+            queryset, serializers.ReportItemSerialzier, export, f"provider_{provider_id}_report", language=language)
+    
     serializer = serializers.ReportItemSerialzier(queryset, many=True, language=language)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -53,10 +59,56 @@ def location_report(request: HttpRequest, location_id: int):
         product__service_provider_location=location_id, status="ACCEPTED"
         , **additional_fields).annotate(total_price= F("price") * F("quantity"))
     
+    export = export_format(request)
+    if export:
+        return streaming_export(
+            queryset, serializers.ReportItemSerialzier, export, f"location_{location_id}_report", language=language)
+    
     serializer = serializers.ReportItemSerialzier(queryset, many=True, language=language)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@decorators.api_view(["GET", ])
+@authorization_with_method("list", "orderitems")
+def provider_sales(request: HttpRequest):
+    """
+    sales totals and series of a provider, read from the daily sales (orders.models.DailySales)
+    query_params = {provider_id, from: YYYY-MM-DD, to: YYYY-MM-DD, period: day|week|month|year
+                    , location_id, product_id}
+    """
+    query_params = request.query_params
+    try:
+        provider_id = int(query_params.get("provider_id"))
+    except:
+        provider_id = request.user.id
+    
+    first_day, last_day, period = sales.requested_range(query_params)
+    queryset = models.DailySales.objects.filter(provider=provider_id)
+    
+    for param in ("location_id", "product_id"):
+        if query_params.get(param):
+            queryset = queryset.filter(**{param: query_params.get(param)})
+    
+    return Response(sales.sales_report(queryset, first_day, last_day, period), status=status.HTTP_200_OK)
+
+
+@decorators.api_view(["GET", ])
+@authorization_with_method("list", "orderitems")
+def location_sales(request: HttpRequest, location_id: int):
+    """
+    sales totals and series of a location, read from the daily sales (orders.models.DailySales)
+    query_params = {from: YYYY-MM-DD, to: YYYY-MM-DD, period: day|week|month|year, product_id}
+    """
+    query_params = request.query_params
+    first_day, last_day, period = sales.requested_range(query_params)
+    queryset = models.DailySales.objects.filter(location=location_id)
+    
+    if query_params.get("product_id"):
+        queryset = queryset.filter(product_id=query_params.get("product_id"))
+    
+    return Response(sales.sales_report(queryset, first_day, last_day, period), status=status.HTTP_200_OK)
+
+
 @decorators.api_view(["GET", ])
 def user_report(request: HttpRequest, user_id: Optional[int]):
     language = request.META.get("Accept-Language")
@@ -64,6 +116,12 @@ def user_report(request: HttpRequest, user_id: Optional[int]):
     
     queryset = models.OrderItem.objects.filter(
         order__patient=user_id).annotate(total_price= F("price") * F("quantity"))
+    
+    export = export_format(request)
+    if export:
+        return streaming_export(
+            queryset, serializers.ReportItemSerialzier, export, f"user_{user_id}_report", language=language)
+    
     serializer = serializers.ReportItemSerialzier(queryset, many=True, language=language)
     
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,67 @@
+from django.contrib.auth.models import Group
+
+from typing import Callable, Optional
+import threading
+import time
+
+
+
+class GroupPermissionsCache:
+    """
+    process local cache [group id => frozenset of permission codenames]
+    
+    permissions.signals bumps the version on every group, permission or membership change
+    so entries cached before it are never used again; the ttl bounds how long another process
+    (that didn't get the signal) keeps an old entry
+    """
+    
+    def __init__(self, ttl: float = 60, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self.clock = clock
+        self.version = 0
+        self.entries: dict[int, tuple[int, float, frozenset[str]]] = {}
+        self.lock = threading.Lock()
+    
+    def codenames(self, group_id: int) -> frozenset[str]:
+        with self.lock:
+            version, expires_at, codenames = self.entries.get(group_id, (None, 0, None))
+            current_version = self.version
+        
+        if version == current_version and expires_at > self.clock():
+            return codenames
+        
+        codenames = frozenset(
+            Group.permissions.through.objects.filter(
+                group_id=group_id).values_list("permission__codename", flat=True))
+        
+        with self.lock:
+            # a change while loading makes this result old already, don't keep it
+            if self.version == current_version:
+                self.entries[group_id] = (current_version, self.clock() + self.ttl, codenames)
+        
+        return codenames
+    
+    def invalidate(self) -> None:
+        with self.lock:
+            self.version += 1
+            self.entries.clear()
+
+
+group_permissions_cache = GroupPermissionsCache()
+
+
+# memo of the user group for the current request (request.user is built for every request)
+USER_GROUP_ATTRIBUTE = "_permission_group"
+
+
+def user_group(user) -> Optional[Group]:
+    """
+    the first group of the user, queried once per request
+    """
+    if not user.is_authenticated:
+        return None
+    
+    if USER_GROUP_ATTRIBUTE not in user.__dict__:
+        user.__dict__[USER_GROUP_ATTRIBUTE] = user.groups.order_by("pk").first()
+    
+    return user.__dict__[USER_GROUP_ATTRIBUTE]
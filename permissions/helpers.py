@@ -2,6 +2,8 @@ from django.contrib.auth.models import Group, Permission
 from django.contrib.auth import get_user_model
 from django.db.models.query import QuerySet
 
+from .cache import group_permissions_cache, user_group
+
 
 Users = get_user_model()
 
@@ -48,12 +50,11 @@ class Groups:
         return Group.objects.prefetch_related("permissions").get(id=group_id).permissions
     
     def has_permission(self, perm_name: str, group: Group) -> bool: #
-        permission = group.permissions.filter(codename=perm_name)
-        if not permission.exists():
-            print("not exists")
+        # one query per group until a permission change, see permissions.cache
+        if group is None:
             return False
         
-        return True
+        return perm_name in group_permissions_cache.codenames(group.pk)
     
     def add_permission(self, perm_id: int, group_id: str) -> str: #
         group = Group.objects.prefetch_related("permissions").get(id=group_id)
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.contrib.auth.models import Group, Permission
+from django.contrib.auth import get_user_model
+from django.dispatch import receiver
+
+from .cache import group_permissions_cache
+
+
+Users = get_user_model()
+
+
+
+@receiver([post_save, post_delete], sender=Group)
+@receiver([post_save, post_delete], sender=Permission)
+def invalidate_on_change(sender, **kwargs):
+    group_permissions_cache.invalidate()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+@receiver(m2m_changed, sender=Users.groups.through)
+def invalidate_on_membership_change(sender, action: str, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        group_permissions_cache.invalidate()
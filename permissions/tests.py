@@ -1,3 +1,29 @@
-from django.test import TestCase
+from django.contrib.auth.models import Group, Permission
+from hypothesis.extra.django import TestCase
 
-# Create your tests here.
+from .cache import group_permissions_cache
+from .helpers import Groups
+
+
+class TestGroupPermissionsCache(TestCase):
+    def setUp(self) -> None:
+        group_permissions_cache.invalidate()
+        self.group = Group.objects.create(name="TESTERS")
+        self.permission = Permission.objects.first()
+    
+    def test_permissions_are_queried_once(self):
+        with self.assertNumQueries(1):
+            Groups().has_permission("missing", self.group)
+            Groups().has_permission("missing", self.group)
+    
+    def test_permission_changes_are_seen(self):
+        assert not Groups().has_permission(self.permission.codename, self.group)
+        
+        self.group.permissions.add(self.permission)
+        assert Groups().has_permission(self.permission.codename, self.group)
+        
+        self.group.permissions.remove(self.permission)
+        assert not Groups().has_permission(self.permission.codename, self.group)
+    
+    def test_no_group_has_no_permission(self):
+        assert not Groups().has_permission(self.permission.codename, None)
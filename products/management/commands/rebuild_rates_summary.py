@@ -0,0 +1,54 @@
+from django.core.management import BaseCommand, CommandParser
+from django.db import transaction
+
+from products.models import Product, ProductRatesSummary
+from services.models import Service, ServiceRatesSummary
+from utils.rates_summary import rates_aggregations, summary_fields
+
+
+class Command(BaseCommand):
+    help = "rebuild the products and services rates summaries in bulk"
+    
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch_size", type=int, default=1000)
+    
+    def handle(self, *args, **options):
+        batch_size = options.get("batch_size")
+        
+        targets = (
+            (Product, ProductRatesSummary, "product", "product_rates__")
+            , (Service, ServiceRatesSummary, "service", "service_rates__")
+        )
+        
+        for rated_model, summary_model, field_name, prefix in targets:
+            count = self.rebuild(rated_model, summary_model, field_name, prefix, batch_size)
+            self.stdout.write(f"{count} {summary_model.__name__} records rebuilt")
+    
+    def rebuild(self, rated_model, summary_model, field_name: str, prefix: str, batch_size: int) -> int:
+        """
+        one grouped query over all rated records, then upserts the summaries batch by batch
+        """
+        queryset = rated_model.objects.select_related(None).order_by().values("id").annotate(
+            **rates_aggregations(prefix))
+        
+        update_fields = list(summary_fields({key: 0 for key in rates_aggregations()}).keys())
+        count, batch = 0, []
+        
+        def flush(batch):
+            summary_model.objects.bulk_create(
+                batch, update_conflicts=True
+                , unique_fields=[field_name], update_fields=update_fields)
+        
+        with transaction.atomic():
+            for stats in queryset.iterator(chunk_size=batch_size):
+                batch.append(summary_model(**{f"{field_name}_id": stats["id"]}, **summary_fields(stats)))
+                
+                if len(batch) == batch_size:
+                    flush(batch)
+                    count, batch = count + len(batch), []
+            
+            if batch:
+                flush(batch)
+                count += len(batch)
+        
+        return count
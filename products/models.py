@@ -1,10 +1,19 @@
+from django.db.models.query import QuerySet
 from django.db.models import Avg
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 
 from service_providers.models import ServiceProviderLocations
+from utils.rates_summary import RatesSummary, rates_aggregations, summary_fields
 
 
+class ProductManager(models.Manager):
+    def get_queryset(self) -> QuerySet:
+        # ProudctSerializer reads all of these for every row
+        result = super().get_queryset()
+        return result.select_related(
+            "rates_summary", "service_provider_location__service_provider__category")
+
 
 class Product(models.Model):
     service_provider_location = models.ForeignKey(
@@ -20,6 +29,8 @@ class Product(models.Model):
     created_at = models.DateField(auto_now_add=True)
     updated_at = models.DateField(auto_now=True)
     
+    objects = ProductManager()
+    
     def __str__(self) -> str:
         category = self.service_provider_location.service_provider.category
         return f"prt_id: {self.id}, prt_en_title: {self.en_title}, prt_category: {category}"
@@ -47,3 +58,32 @@ class ProductRates(models.Model):
     
     def __str__(self) -> str:
         return f"{self.user.email} -> {self.product.en_title}"
+
+
+class ProductRatesSummary(RatesSummary):
+    """
+    precomputed product rates, kept up to date by products.signals
+    rebuild all records with: python manage.py rebuild_rates_summary
+    """
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, related_name="rates_summary")
+    
+    def __str__(self) -> str:
+        return f"{self.product_id} -> avg: {self.average_rate}, count: {self.rates_count}"
+    
+    @classmethod
+    def refresh(cls, product_id: int, create: bool = True):
+        """
+        the summary row is locked before the rates are aggregated, so concurrent rate writes
+        refresh it one after the other and the last one aggregates all of them
+        """
+        summary = cls.objects.filter(product_id=product_id)
+        
+        with transaction.atomic():
+            if create:
+                cls.objects.bulk_create([cls(product_id=product_id)], ignore_conflicts=True)
+            
+            if not summary.select_for_update().values_list("id", flat=True):
+                return
+            
+            stats = ProductRates.objects.filter(product=product_id).aggregate(**rates_aggregations())
+            summary.update(**summary_fields(stats))
@@ -30,6 +30,6 @@ class HasPermissionOrReadOnly(permissions.BasePermission):
             codename = f"{method_name}_{model_name}"
         
         group = helpers.Groups()
-        result = group.has_permission(codename, request.user.groups.first())
+        result = group.has_permission(codename, helpers.user_group(request.user))
         
         return result
\ No newline at end of file
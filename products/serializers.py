@@ -1,12 +1,16 @@
 from rest_framework import serializers
 
+from django.core.exceptions import ObjectDoesNotExist
+
 from . import models
 
 from service_providers.models import ServiceProviderLocations
+from utils.query_plan import RelatedPathsMixin
 
 
 
-class RateSerializer(serializers.ModelSerializer):
+class RateSerializer(RelatedPathsMixin, serializers.ModelSerializer):
+    select_related_paths = ("user", "product", )
     
     class Meta:
         model = models.ProductRates
@@ -64,6 +68,7 @@ class ProudctSerializer(serializers.ModelSerializer):
     
     def to_representation(self, instance: models.Product):
         category = instance.service_provider_location.service_provider.category
+        rates = self.get_rates_summary(instance)
         
         return {
             "id": instance.id
@@ -78,12 +83,21 @@ class ProudctSerializer(serializers.ModelSerializer):
             , "price": instance.price
             , "discount_ammount": instance.discount_ammount
             , "rates": {
-                "avg_rate": instance.average_rating
-                , "5": instance.product_rates.filter(rate=5).count()
-                , "4": instance.product_rates.filter(rate=4).count()
-                , "3": instance.product_rates.filter(rate=3).count()
-                , "2": instance.product_rates.filter(rate=2).count()
-                , "1": instance.product_rates.filter(rate=1).count()
-                , "0": instance.product_rates.filter(rate=0).count()
+                "avg_rate": rates.average_rate
+                , "5": rates.stars_5
+                , "4": rates.stars_4
+                , "3": rates.stars_3
+                , "2": rates.stars_2
+                , "1": rates.stars_1
+                , "0": rates.stars_0
             }
         }
+    
+    def get_rates_summary(self, instance: models.Product) -> models.ProductRatesSummary:
+        """
+        the summary is select_related by the Product manager, products without rates have no summary
+        """
+        try:
+            return instance.rates_summary
+        except ObjectDoesNotExist:
+            return models.ProductRatesSummary(product=instance)
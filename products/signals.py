@@ -0,0 +1,71 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from . import models
+
+from service_providers import stats
+
+
+
+# the product of the rate before the update, memo from pre_save for the post_save receivers
+# (search.signals reads it too, so it isn't popped)
+PREVIOUS_ATTRIBUTE = "_previous_product_id"
+# the location of the product before the update, memo from pre_save for invalidate_provider_stats
+PREVIOUS_LOCATION_ATTRIBUTE = "_previous_location_id"
+LOCATION_FIELDS = {"service_provider_location", "service_provider_location_id"}
+
+
+def rated_products(instance: models.ProductRates) -> list[int]:
+    """
+    the product of the rate, and its previous product when the rate was moved to another one
+    """
+    previous = instance.__dict__.get(PREVIOUS_ATTRIBUTE)
+    return [instance.product_id] + ([previous] if previous not in (None, instance.product_id) else [])
+
+
+@receiver(pre_save, sender=models.ProductRates)
+def remember_previous_product(sender, instance: models.ProductRates, raw: bool = False, **kwargs):
+    instance.__dict__[PREVIOUS_ATTRIBUTE] = None if raw or instance.pk is None else (
+        sender.objects.filter(pk=instance.pk).values_list("product", flat=True).first())
+
+
+@receiver(post_save, sender=models.ProductRates)
+def refresh_rates_summary_on_save(sender, instance: models.ProductRates, **kwargs):
+    # in id order, two rates moved between the same products lock their summaries in the same order
+    for product_id in sorted(rated_products(instance)):
+        models.ProductRatesSummary.refresh(product_id)
+
+
+@receiver(post_delete, sender=models.ProductRates)
+def refresh_rates_summary_on_delete(sender, instance: models.ProductRates, **kwargs):
+    # don't create a summary here, the product itself may be in the middle of a cascade delete
+    models.ProductRatesSummary.refresh(instance.product_id, create=False)
+
+
+@receiver(pre_save, sender=models.Product)
+def remember_previous_location(
+    sender, instance: models.Product, raw: bool = False, update_fields=None, **kwargs):
+    if raw or instance.pk is None:
+        return
+    
+    # a save of other fields (the stock, the title) can't move it
+    if update_fields is not None and not LOCATION_FIELDS & set(update_fields):
+        return
+    
+    instance.__dict__[PREVIOUS_LOCATION_ATTRIBUTE] = sender.objects.filter(
+        pk=instance.pk).values_list("service_provider_location", flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=models.Product)
+def invalidate_provider_stats(sender, instance: models.Product, raw: bool = False, **kwargs):
+    # a product moved to another provider's location leaves the stats of both providers
+    previous = instance.__dict__.pop(PREVIOUS_LOCATION_ATTRIBUTE, None)
+    if not raw:
+        stats.invalidate_on_commit(*stats.locations_providers(instance.service_provider_location_id, previous))
+
+
+@receiver([post_save, post_delete], sender=models.ProductRates)
+def invalidate_provider_stats_on_rate(sender, instance: models.ProductRates, raw: bool = False, **kwargs):
+    if not raw:
+        stats.invalidate_on_commit(*models.Product.objects.filter(
+            id__in=rated_products(instance)).values_list("service_provider_location__service_provider", flat=True))
@@ -1,3 +1,47 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
 
-# Create your tests here.
+from hypothesis.extra.django import TestCase
+
+from category.models import Category
+from utils import testing
+
+from .models import Product, ProductRates, ProductRatesSummary
+
+Users = get_user_model()
+
+
+class TestRatesSummary(TestCase):
+    def setUp(self) -> None:
+        category = Category.objects.create(en_name="pharmacy", ar_name="صيدلية")
+        location = testing.create_location(testing.create_provider(category))
+        
+        self.products = [testing.create_product(location) for _ in range(2)]
+        self.patient = Users.objects.create(
+            email="patient@test.com", phone="+971500000002", password="password", user_type="USER")
+    
+    def summary(self, product: Product) -> tuple[int, float]:
+        summary = ProductRatesSummary.objects.get(product=product)
+        return summary.rates_count, summary.average_rate
+    
+    def test_moved_rate_refreshes_both_products(self):
+        first, second = self.products
+        rate = ProductRates.objects.create(product=first, user=self.patient, rate=4)
+        assert self.summary(first) == (1, 4)
+        
+        rate.product = second
+        rate.save()
+        
+        assert self.summary(first) == (0, 0)
+        assert self.summary(second) == (1, 4)
+    
+    def test_refresh_creates_a_missing_summary(self):
+        first, _ = self.products
+        ProductRates.objects.create(product=first, user=self.patient, rate=3)
+        ProductRatesSummary.objects.filter(product=first).delete()
+        
+        ProductRatesSummary.refresh(first.id)
+        assert self.summary(first) == (1, 3)
+        
+        ProductRatesSummary.objects.filter(product=first).delete()
+        ProductRatesSummary.refresh(first.id, create=False)
+        assert not ProductRatesSummary.objects.filter(product=first).exists()
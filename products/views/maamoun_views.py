@@ -3,12 +3,9 @@ from rest_framework import permissions, status
 from rest_framework.response import Response
 
 from django.contrib.postgres.search import SearchVector, SearchQuery
-from django.contrib.gis.db.models.functions import Distance
-from django.db.models import Q, Avg, Min, Max
-from django.contrib.gis.geos import Point
+from django.db.models import Q, Avg
 from django.http import HttpRequest
 
-from collections import defaultdict
 from functools import reduce
 from typing import Any
 
@@ -17,25 +14,31 @@ from products import permissions as local_permissions
 from products import models, serializers
 
 from core.pagination_classes.nine_element_paginator import CustomPagination
+from core.pagination_classes.cursor_paginator import CustomCursorPagination
 from utils.catch_helper import catch
-from notification.models import Notification
+from utils import geo
+from notification.dispatcher import notify
+from service_providers.stats import provider_stats_cache
 
 
 
 class AllProducts(generics.ListAPIView):
     """
-        An api that lists all products
+        An api that lists all products (cursor paginated)
     """
     permission_classes = (local_permissions.HasPermissionOrReadOnly, )
     serializer_class = serializers.ProudctSerializer
+    pagination_class = CustomCursorPagination
+    cursor_ordering = "id"
     queryset = models.Product.objects
     
     def list(self, request, *args, **kwargs):
         language = request.META.get("Accept-Language")
         
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True, language=language)
-        return Response(serializer.data)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True, language=language)
+        return self.get_paginated_response(serializer.data)
 
 
 class CreateProduct(generics.CreateAPIView):
@@ -51,7 +54,7 @@ class CreateProduct(generics.CreateAPIView):
         request.data["images"] = new_file_names
         resp = super().create(request, *args, **kwargs)
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=request.user.email, receiver_type="Service_Provider"
             , en_content="a new product added to your specified location"
@@ -97,7 +100,7 @@ class RUDProduct(generics.RetrieveUpdateDestroyAPIView):
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=request.user.email, receiver_type="Service_Provider"
             , en_content="product information edited"
@@ -108,7 +111,7 @@ class RUDProduct(generics.RetrieveUpdateDestroyAPIView):
     def perform_destroy(self, instance):
         DeleteFiles().delete_files(instance.images)
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=self.request.user.email, receiver_type="Service_Provider"
             , en_content="the product deleted"
@@ -202,37 +205,14 @@ def products_price_range(request: HttpRequest):
 @decorators.api_view(["GET", ])
 @decorators.permission_classes([])
 def provider_products_statistics(request: HttpRequest, provider_id: int):
-    # all_cat = Category.objects.annotate(num_of_services=Count("services", filter=Q(services__gt=1)))
-    # for cat in all_cat: cat.id, cat.ar_name, cat.en_name, cat.num_services
     """
-    number of services for each categories available in specific provider
-    returns {category_id, category_name, services_count}
+    prices range and rates of the products of specific provider
+    returns {prices: {min_price, max_price}, rates: {star: products count}}
+    computed in SQL and cached per provider, see service_providers.stats
     """
-    queryset = models.Product.objects.filter(service_provider_location__service_provider=provider_id)
-    prices = queryset.aggregate(min_price=Min("price"), max_price=Max("price"))
-    
-    def sizing_rates():
-        # first we filtered the provider services
-        # then we aggregate similar services and find it's average rate
-        queryset = models.ProductRates.objects.filter(
-        product__service_provider_location__service_provider=provider_id).values(
-            "product").annotate(avg_rate=Avg("rate"))
-        
-        limits = { (4.5, 5): 5, (3.5, 4.5): 4, (2.5, 3.5): 3, (1.5, 2.5): 2, (0.5, 1.5): 1, (0, 0.5): 0 }
-        rates = defaultdict(int)
-        
-        for query in queryset:
-            for limit in limits:
-                if query["avg_rate"] >= limit[0] and query["avg_rate"] < limit[1]:
-                    rates[limits[limit]] += 1
-                    break
-        
-        return rates
-    
-    data = {}
+    stats = provider_stats_cache.stats(provider_id)["products"]
     
-    data["prices"] = {"min_price": prices["min_price"], "max_price": prices["max_price"]}
-    data["rates"] = sizing_rates()
+    data = {"prices": stats["prices"], "rates": stats["rates"]}
     
     return Response(data, status=status.HTTP_200_OK)
 
@@ -267,13 +247,13 @@ def multiple_filters(request: HttpRequest):
 def check_distance(params: dict[str, Any], q_expressions: set):
     longitude, latitude = params.get("logitude"), params.get("latitude")
     if longitude and latitude:
-        longitude, latitude = float(longitude), float(latitude)
-        location = Point(longitude, latitude)
-        q_exp=Q(service_provider_location__location__distance_lt=(location, 1000000))
+        location = geo.point_from(longitude, latitude)
+        radius = geo.radius_from(params.get("radius"))
+        q_exp = geo.within("service_provider_location__location", location, radius)
         q_expressions.add(q_exp)
         
         queryset = models.Product.objects.annotate(
-            distance=Distance("service_provider_location__location", location)
+            distance=geo.distance_to("service_provider_location__location", location)
                 ).order_by("distance")
     
     else:
@@ -7,7 +7,7 @@ from django.http import HttpRequest
 
 from typing import Optional
 
-from notification.models import Notification
+from notification.dispatcher import notify
 from products import models, serializers
 
 
@@ -30,7 +30,7 @@ class CreateRate(generics.CreateAPIView):
                 "message": "this user already rates this product, he can't rate it again"
             }, status=status.HTTP_403_FORBIDDEN)
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=request.user.email, receiver_type="User"
             , ar_content="تمت إضافة التقييم"
@@ -62,7 +62,7 @@ class RatesViewSet(viewsets.ModelViewSet):
     def update(self, request, *args, **kwargs):
         resp = super().update(request, *args, **kwargs)
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=request.user.email, receiver_type="User"
             , ar_content="تم تعديل التقييم"
@@ -74,7 +74,7 @@ class RatesViewSet(viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
     
     def perform_destroy(self, instance):
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=self.request.user.email, receiver_type="User"
             , ar_content="تم حذف التقييم"
@@ -1,12 +1,11 @@
 from rest_framework import decorators, status, permissions
 from rest_framework.response import Response
 
-from django.contrib.gis.db.models.functions import Distance
-from django.contrib.gis.geos import Point
 from django.http import HttpRequest
 from django.db.models import Q
 
 from products import models as pmodels, serializers as pserializer
+from utils import geo
 
 
 
@@ -17,6 +16,7 @@ def products_by_distance(request: HttpRequest):
         An api to list products filtered by distance ordered for nearest to farthest.
         lat and lon are required
         ?latitude=<integer> & longitude=<integer> 
+        ?radius=<meters> (optional, settings.GEO_SEARCH)
     """
     language = request.META.get("Accept-Language")
     latitude, longitude = request.query_params.get('latitude'), request.query_params.get('longitude')
@@ -27,12 +27,13 @@ def products_by_distance(request: HttpRequest):
             {'error': 'Latitude and longitude parameters are required'}
             , status=status.HTTP_400_BAD_REQUEST)
     
-    location = Point(float(longitude), float(latitude), srid=4326)
+    location = geo.point_from(longitude, latitude)
+    radius = geo.radius_from(request.query_params.get("radius"))
     Q_expression = Q(en_title__icontains=product_name) if language=="en" else Q(ar_title__icontains=product_name)
     
-    products = pmodels.Product.objects.filter(en_title__icontains=Q_expression,
-        service_provider_location__location__distance_lt=(location, 1000000)
-        ).annotate(distance=Distance('service_provider_location__location', location)).order_by('distance')
+    products = pmodels.Product.objects.filter(Q_expression,
+        geo.within("service_provider_location__location", location, radius)
+        ).annotate(distance=geo.distance_to("service_provider_location__location", location)).order_by("distance")
     
     if not products.exists():
         return Response(
@@ -0,0 +1,47 @@
+from django.core.management import BaseCommand, CommandParser
+from django.db import transaction
+
+from products.models import Product
+from services.models import Service
+from search.models import SearchDocument
+
+
+class Command(BaseCommand):
+    help = "rebuild the services & products search documents"
+    
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch_size", type=int, default=1000)
+    
+    def handle(self, *args, **options):
+        batch_size = options.get("batch_size")
+        
+        with transaction.atomic():
+            # documents of deleted records
+            SearchDocument.objects.filter(kind=SearchDocument.Kinds.SERVICE).exclude(
+                object_id__in=Service.objects.values("id")).delete()
+            SearchDocument.objects.filter(kind=SearchDocument.Kinds.PRODUCT).exclude(
+                object_id__in=Product.objects.values("id")).delete()
+            
+            services = Service.objects.order_by().iterator(chunk_size=batch_size)
+            count = self.index(services, SearchDocument.from_service, batch_size)
+            self.stdout.write(f"{count} services indexed")
+            
+            products = Product.objects.order_by().iterator(chunk_size=batch_size)
+            count = self.index(products, SearchDocument.from_product, batch_size)
+            self.stdout.write(f"{count} products indexed")
+    
+    def index(self, records, to_document, batch_size: int) -> int:
+        count, batch = 0, []
+        
+        for record in records:
+            batch.append(to_document(record))
+            
+            if len(batch) == batch_size:
+                SearchDocument.upsert(batch, batch_size)
+                count, batch = count + len(batch), []
+        
+        if batch:
+            SearchDocument.upsert(batch, batch_size)
+            count += len(batch)
+        
+        return count
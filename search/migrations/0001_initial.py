@@ -0,0 +1,42 @@
+# Generated by Django 4.2.6 on 2026-10-18 11:40
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('category', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('service', 'Service'), ('product', 'Product')], max_length=8)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('en_title', models.CharField(max_length=128)),
+                ('ar_title', models.CharField(max_length=128)),
+                ('document', django.contrib.postgres.search.SearchVectorField(null=True)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('location', django.contrib.gis.db.models.fields.PointField(null=True, srid=4326)),
+                ('average_rate', models.FloatField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='category.category')),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['document'], name='search_document_gin'), models.Index(fields=['kind', 'price'], name='search_document_price'), models.Index(fields=['kind', 'average_rate'], name='search_document_rate')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='search_document_object'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='searchdocument',
+            index=models.Index(fields=['price', 'id'], name='search_document_price_id'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.6 on 2026-10-18 15:05
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_searchdocument_search_document_price_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='searchdocument',
+            name='location',
+            field=django.contrib.gis.db.models.fields.PointField(geography=True, null=True, srid=4326),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.6 on 2026-10-18 16:10
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+FILL_OPEN_MINUTES = """
+UPDATE search_searchdocument AS document SET open_minutes = location.open_minutes
+FROM services_service AS service
+JOIN service_providers_serviceproviderlocations AS location ON location.id = service.provider_location_id
+WHERE document.kind = 'service' AND document.object_id = service.id;
+
+UPDATE search_searchdocument AS document SET open_minutes = location.open_minutes
+FROM products_product AS product
+JOIN service_providers_serviceproviderlocations AS location ON location.id = product.service_provider_location_id
+WHERE document.kind = 'product' AND document.object_id = product.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0003_alter_searchdocument_location'),
+        ('service_providers', '0003_serviceproviderlocations_open_minutes'),
+        ('services', '0006_serviceratessummary'),
+        ('products', '0006_productratessummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchdocument',
+            name='open_minutes',
+            field=django.contrib.postgres.fields.ranges.IntegerRangeField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name='searchdocument',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['open_minutes'], name='search_document_open'),
+        ),
+        migrations.RunSQL(FILL_OPEN_MINUTES, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.6 on 2026-10-18 21:45
+
+from django.db import migrations
+
+
+# same documents as the rebuild_search_index command (SearchDocument.from_service / from_product),
+# the ones already written by search.signals are kept
+FILL_SEARCH_DOCUMENTS = """
+INSERT INTO search_searchdocument (
+    kind, object_id, en_title, ar_title, document, price, category_id, location, open_minutes, average_rate
+    , updated_at)
+SELECT 'service', service.id, service.en_title, service.ar_title
+    , setweight(to_tsvector('english'::regconfig, COALESCE(service.en_title, '')), 'A')
+        || setweight(to_tsvector('arabic'::regconfig, COALESCE(service.ar_title, '')), 'A')
+    , service.price, service.category_id, location.location, location.open_minutes
+    , (SELECT AVG(rate) FROM services_servicerates WHERE service_id = service.id), NOW()
+FROM services_service AS service
+JOIN service_providers_serviceproviderlocations AS location ON location.id = service.provider_location_id
+ON CONFLICT (kind, object_id) DO NOTHING;
+
+INSERT INTO search_searchdocument (
+    kind, object_id, en_title, ar_title, document, price, category_id, location, open_minutes, average_rate
+    , updated_at)
+SELECT 'product', product.id, product.en_title, product.ar_title
+    , setweight(to_tsvector('english'::regconfig, COALESCE(product.en_title, '')), 'A')
+        || setweight(to_tsvector('arabic'::regconfig, COALESCE(product.ar_title, '')), 'A')
+    , product.price, provider.category_id, location.location, location.open_minutes
+    , (SELECT AVG(rate) FROM products_productrates WHERE product_id = product.id), NOW()
+FROM products_product AS product
+JOIN service_providers_serviceproviderlocations AS location ON location.id = product.service_provider_location_id
+JOIN service_providers_serviceprovider AS provider ON provider.users_ptr_id = location.service_provider_id
+ON CONFLICT (kind, object_id) DO NOTHING;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0004_searchdocument_open_minutes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(FILL_SEARCH_DOCUMENTS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,118 @@
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.fields import IntegerRangeField
+from django.db.models import Avg, OuterRef, Subquery
+from django.contrib.gis.db import models
+
+from category.models import Category
+from products.models import Product, ProductRates
+from services.models import Service, ServiceRates
+
+
+# english and arabic stemming of both titles, so a search matches in either language
+DOCUMENT_VECTOR = (
+    SearchVector("en_title", config="english", weight="A")
+    + SearchVector("ar_title", config="arabic", weight="A"))
+
+
+class SearchDocument(models.Model):
+    """
+    denormalized row for every service and product, used by the services & products search
+    kept in sync by search.signals, rebuilt by the rebuild_search_index command
+    """
+    
+    class Kinds(models.TextChoices):
+        SERVICE = ("service", "Service")
+        PRODUCT = ("product", "Product")
+    
+    kind = models.CharField(max_length=8, choices=Kinds.choices, null=False)
+    object_id = models.PositiveBigIntegerField(null=False)
+    en_title = models.CharField(max_length=128, null=False)
+    ar_title = models.CharField(max_length=128, null=False)
+    document = SearchVectorField(null=True)
+    price = models.DecimalField(null=False, max_digits=8, decimal_places=2)
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, related_name="+")
+    location = models.PointField(srid=4326, geography=True, null=True)
+    open_minutes = IntegerRangeField(null=True)
+    average_rate = models.FloatField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id", ], name="search_document_object"),
+        ]
+        indexes = [
+            GinIndex(fields=["document", ], name="search_document_gin"),
+            models.Index(fields=["kind", "price", ], name="search_document_price"),
+            models.Index(fields=["kind", "average_rate", ], name="search_document_rate"),
+            # keyset pagination of the merged search by price
+            models.Index(fields=["price", "id", ], name="search_document_price_id"),
+            # open now / open at filter, see service_providers.helpers.open_at
+            GistIndex(fields=["open_minutes", ], name="search_document_open"),
+        ]
+    
+    def __str__(self) -> str:
+        return f"{self.kind} {self.object_id}: {self.en_title}"
+    
+    @classmethod
+    def from_service(cls, service: Service) -> "SearchDocument":
+        return cls(
+            kind=cls.Kinds.SERVICE, object_id=service.id
+            , en_title=service.en_title, ar_title=service.ar_title
+            , price=service.price, category_id=service.category_id
+            , location=service.provider_location.location
+            , open_minutes=service.provider_location.open_minutes
+            , average_rate=rates_average(service))
+    
+    @classmethod
+    def from_product(cls, product: Product) -> "SearchDocument":
+        location = product.service_provider_location
+        return cls(
+            kind=cls.Kinds.PRODUCT, object_id=product.id
+            , en_title=product.en_title, ar_title=product.ar_title
+            , price=product.price, category_id=location.service_provider.category_id
+            , location=location.location, open_minutes=location.open_minutes
+            , average_rate=rates_average(product))
+    
+    @classmethod
+    def upsert(cls, documents: list["SearchDocument"], batch_size: int = 1000) -> None:
+        """
+        insert or update the documents, then compute their search vectors in the database
+        """
+        update_fields = [
+            "en_title", "ar_title", "price", "category", "location", "open_minutes", "average_rate", "updated_at"]
+        
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start: start + batch_size]
+            cls.objects.bulk_create(
+                batch, update_conflicts=True
+                , unique_fields=["kind", "object_id"], update_fields=update_fields)
+            
+            for kind in cls.Kinds.values:
+                object_ids = [document.object_id for document in batch if document.kind == kind]
+                if object_ids:
+                    cls.objects.filter(kind=kind, object_id__in=object_ids).update(document=DOCUMENT_VECTOR)
+    
+    @classmethod
+    def refresh_rate(cls, kind: str, object_id: int) -> None:
+        """
+        one UPDATE with the average computed in a subquery, null when nothing is rated
+        """
+        if kind == cls.Kinds.SERVICE:
+            rates = ServiceRates.objects.filter(service=OuterRef("object_id")).values("service")
+        else:
+            rates = ProductRates.objects.filter(product=OuterRef("object_id")).values("product")
+        
+        average = rates.order_by().annotate(avg=Avg("rate")).values("avg")
+        cls.objects.filter(kind=kind, object_id=object_id).update(average_rate=Subquery(average))
+
+
+def rates_average(instance: Service | Product):
+    """
+    the rates summary is select_related by the Service and Product managers
+    """
+    summary = getattr(instance, "rates_summary", None)
+    if summary is None or not summary.rates_count:
+        return None
+    
+    return summary.average_rate
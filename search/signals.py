@@ -0,0 +1,78 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from service_providers.models import ServiceProvider, ServiceProviderLocations
+from products.models import Product, ProductRates
+from services.models import Service, ServiceRates
+
+from products.signals import rated_products
+from services.signals import rated_services
+
+from .models import SearchDocument
+
+
+
+@receiver(post_save, sender=Service)
+def index_service(sender, instance: Service, raw: bool = False, **kwargs):
+    if not raw:
+        SearchDocument.upsert([SearchDocument.from_service(instance)])
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance: Product, raw: bool = False, **kwargs):
+    if not raw:
+        SearchDocument.upsert([SearchDocument.from_product(instance)])
+
+
+@receiver(post_delete, sender=Service)
+def unindex_service(sender, instance: Service, **kwargs):
+    SearchDocument.objects.filter(kind=SearchDocument.Kinds.SERVICE, object_id=instance.id).delete()
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product(sender, instance: Product, **kwargs):
+    SearchDocument.objects.filter(kind=SearchDocument.Kinds.PRODUCT, object_id=instance.id).delete()
+
+
+@receiver([post_save, post_delete], sender=ServiceRates)
+def index_service_rate(sender, instance: ServiceRates, **kwargs):
+    for service_id in rated_services(instance):
+        SearchDocument.refresh_rate(SearchDocument.Kinds.SERVICE, service_id)
+
+
+@receiver([post_save, post_delete], sender=ProductRates)
+def index_product_rate(sender, instance: ProductRates, **kwargs):
+    for product_id in rated_products(instance):
+        SearchDocument.refresh_rate(SearchDocument.Kinds.PRODUCT, product_id)
+
+
+@receiver(post_save, sender=ServiceProviderLocations)
+def index_location(sender, instance: ServiceProviderLocations, raw: bool = False, **kwargs):
+    """
+    the location point and opening hours are copied to every service and product document of this location
+    """
+    if raw:
+        return
+    
+    services = Service.objects.filter(provider_location=instance).values("id")
+    products = Product.objects.filter(service_provider_location=instance).values("id")
+    
+    SearchDocument.objects.filter(
+        kind=SearchDocument.Kinds.SERVICE, object_id__in=services).update(
+            location=instance.location, open_minutes=instance.open_minutes)
+    SearchDocument.objects.filter(
+        kind=SearchDocument.Kinds.PRODUCT, object_id__in=products).update(
+            location=instance.location, open_minutes=instance.open_minutes)
+
+
+@receiver(post_save, sender=ServiceProvider)
+def index_provider_category(sender, instance: ServiceProvider, raw: bool = False, **kwargs):
+    """
+    products take the category of their provider
+    """
+    if raw:
+        return
+    
+    products = Product.objects.filter(service_provider_location__service_provider=instance).values("id")
+    SearchDocument.objects.filter(
+        kind=SearchDocument.Kinds.PRODUCT, object_id__in=products).update(category=instance.category_id)
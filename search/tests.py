@@ -0,0 +1,64 @@
+from hypothesis.extra.django import TestCase
+
+from decimal import Decimal
+
+from category.models import Category
+from core.views import search_func
+from products.models import Product
+from services.models import Service
+from utils import testing
+
+from .models import SearchDocument
+
+
+class TestSearchDocuments(TestCase):
+    def setUp(self) -> None:
+        self.category = Category.objects.create(en_name="pharmacy", ar_name="صيدلية")
+        self.location = testing.create_location(testing.create_provider(self.category))
+    
+    def create_product(self, en_title: str) -> Product:
+        return testing.create_product(self.location, en_title=en_title)
+    
+    def create_service(self, en_title: str) -> Service:
+        return testing.create_service(self.location, self.category, en_title=en_title)
+    
+    def document(self, kind: str, object_id: int) -> SearchDocument:
+        return SearchDocument.objects.filter(kind=kind, object_id=object_id).first()
+    
+    def test_product_document_follows_the_product(self):
+        product = self.create_product("aspirin")
+        document = self.document(SearchDocument.Kinds.PRODUCT, product.id)
+        assert document.en_title == "aspirin"
+        assert document.category_id == self.category.id
+        assert document.open_minutes == self.location.open_minutes
+        
+        product.en_title, product.price = "paracetamol", Decimal("12.50")
+        product.save()
+        document = self.document(SearchDocument.Kinds.PRODUCT, product.id)
+        assert (document.en_title, document.price) == ("paracetamol", Decimal("12.50"))
+        
+        product_id = product.id
+        product.delete()
+        assert self.document(SearchDocument.Kinds.PRODUCT, product_id) is None
+    
+    def test_service_document_follows_the_service(self):
+        service = self.create_service("checkup")
+        assert self.document(SearchDocument.Kinds.SERVICE, service.id).en_title == "checkup"
+        
+        service.en_title = "dental checkup"
+        service.save()
+        assert self.document(SearchDocument.Kinds.SERVICE, service.id).en_title == "dental checkup"
+        
+        service_id = service.id
+        service.delete()
+        assert self.document(SearchDocument.Kinds.SERVICE, service_id) is None
+    
+    def test_search_matches_services_and_products_in_one_query(self):
+        product, service = self.create_product("vitamin tablets"), self.create_service("vitamin injection")
+        self.create_product("bandage")
+        
+        q_expr, documents = search_func({"search": "vitamin"}, SearchDocument.objects.all())
+        with self.assertNumQueries(1):
+            found = set(documents.filter(q_expr).values_list("kind", "object_id"))
+        
+        assert found == {(SearchDocument.Kinds.PRODUCT, product.id), (SearchDocument.Kinds.SERVICE, service.id)}
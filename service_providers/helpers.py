@@ -0,0 +1,49 @@
+from rest_framework import exceptions
+
+from django.db.models import Q
+from django.conf import settings
+
+from datetime import datetime, time
+from typing import Any, Optional
+from zoneinfo import ZoneInfo
+
+
+def requested_time(query_params: dict[str, Any]) -> Optional[time]:
+    """
+    ?open_at=HH:MM or ?open_now=true (the project time zone), None when neither is given
+    """
+    open_at = query_params.get("open_at")
+    if open_at:
+        try:
+            return time.fromisoformat(open_at)
+        except ValueError:
+            raise exceptions.ValidationError({"error": "open_at should be HH:MM"})
+    
+    if query_params.get("open_now") in ("true", "1"):
+        return datetime.now(ZoneInfo(settings.TIME_ZONE)).time().replace(microsecond=0)
+    
+    return None
+
+
+def requested_category(query_params: dict[str, Any]) -> Optional[int]:
+    """
+    ?category=<id>, None when not given
+    """
+    category = query_params.get("category")
+    if not category:
+        return None
+    
+    if not category.isdigit():
+        raise exceptions.ValidationError({"error": "category should be a category id"})
+    
+    return int(category)
+
+
+def open_at(time_of_day: time, field: str = "open_minutes") -> Q:
+    """
+    open at this time, `field` is the path to a location open_minutes range (GiST indexed)
+    the minute is looked up on both days, for the ranges that end after midnight
+    """
+    minute = time_of_day.hour * 60 + time_of_day.minute
+    
+    return Q(**{f"{field}__contains": minute}) | Q(**{f"{field}__contains": minute + 24 * 60})
@@ -4,15 +4,21 @@ from rest_framework.response import Response
 
 from django.contrib.postgres.search import SearchVector
 from django.http import HttpRequest
-from django.db.models import Q
+from django.db.models import Q, F, Avg, Count
+from django.db.models.functions import Floor
+from django.conf import settings
 
 from functools import reduce
 
 from . import permissions as local_permissions
-from . import models, serializers
+from . import models, serializers, helpers
+from . import stats as stats_helpers
 
 from users.serializers import ServiceProviderSerializer
+from core.pagination_classes.cursor_paginator import cursor_paginated_response
+from utils import geo
 from notification.models import Notification
+from notification.dispatcher import notify
 
 
 
@@ -57,7 +63,7 @@ class CreateLocation(generics.CreateAPIView):
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=request.user.email
             , receiver_type="Service_Provider"
@@ -72,15 +78,99 @@ class CreateLocation(generics.CreateAPIView):
 @decorators.permission_classes([permissions.AllowAny, ])
 def show_providers_locations(request: HttpRequest):
     """
-    get all service providers locations in the Database
+    get all service providers locations in the Database (cursor paginated)
     for everybody
     """
     queryset = models.ServiceProviderLocations.objects.all()
-    serializer = serializers.LocationSerializerSafe(queryset, many=True)
+    
+    return cursor_paginated_response(request, queryset, serializers.LocationSerializerSafe, ordering="id")
+
+
+@decorators.api_view(["GET", ])
+@decorators.permission_classes([permissions.AllowAny, ])
+def nearest_locations(request: HttpRequest):
+    """
+    the k nearest locations, nearest first (KNN on the locations GiST index)
+    ?longitude=<float>&latitude=<float> required
+    &k=<int> (10 by default, 100 at most) &category=<id> &open_at=HH:MM or &open_now=true &radius=<meters>
+    for everybody
+    """
+    query_params = request.query_params
+    longitude, latitude = query_params.get("longitude"), query_params.get("latitude")
+    if not (longitude and latitude):
+        return Response(
+            {"error": "longitude and latitude parameters are required"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    point = geo.point_from(longitude, latitude)
+    k = query_params.get("k", "10")
+    if not k.isdigit() or int(k) < 1:
+        return Response({"error": "k should be a positive number"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    queryset = models.ServiceProviderLocations.objects.select_related("service_provider").filter(
+        location__isnull=False)
+    
+    category = helpers.requested_category(query_params)
+    if category is not None:
+        queryset = queryset.filter(service_provider__category=category)
+    
+    time_of_day = helpers.requested_time(query_params)
+    if time_of_day is not None:
+        queryset = queryset.filter(helpers.open_at(time_of_day))
+    
+    if query_params.get("radius"):
+        queryset = queryset.filter(geo.within("location", point, geo.radius_from(query_params.get("radius"))))
+    
+    queryset = queryset.annotate(distance=geo.distance_to("location", point)).order_by("distance")
+    serializer = serializers.NearestLocationSerializer(queryset[:min(int(k), 100)], many=True)
     
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@decorators.api_view(["GET", ])
+@decorators.permission_classes([permissions.AllowAny, ])
+def locations_clusters(request: HttpRequest):
+    """
+    the locations inside the map viewport grouped in grid cells (count and center per cell), one GROUP BY
+    from settings.GEO_SEARCH["cluster_max_zoom"] on, the locations themselves
+    ?bbox=<min lon>,<min lat>,<max lon>,<max lat>&zoom=<int 0..22> required, &category=<id>
+    for everybody
+    """
+    query_params = request.query_params
+    bbox = geo.bbox_from(query_params.get("bbox"))
+    zoom = query_params.get("zoom", "")
+    if not zoom.isdigit() or int(zoom) > 22:
+        return Response({"error": "zoom should be a number from 0 to 22"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    zoom = int(zoom)
+    queryset = models.ServiceProviderLocations.objects.annotate(
+        longitude=geo.Longitude("location"), latitude=geo.Latitude("location")
+        ).filter(geo.in_bbox("location", bbox))
+    
+    category = helpers.requested_category(query_params)
+    if category is not None:
+        queryset = queryset.filter(service_provider__category=category)
+    
+    if zoom >= settings.GEO_SEARCH["cluster_max_zoom"]:
+        points = queryset.order_by("id").values(
+            "id", "service_provider_id", "service_provider__business_name", "longitude", "latitude")
+        return Response(
+            {"zoom": zoom, "points": list(points[:settings.GEO_SEARCH["cluster_max_points"]])}
+            , status=status.HTTP_200_OK)
+    
+    size = geo.grid_cell_size(zoom)
+    clusters = queryset.annotate(
+        cell_x=Floor(F("longitude") / size), cell_y=Floor(F("latitude") / size)
+        ).values("cell_x", "cell_y").annotate(
+            count=Count("id"), center_longitude=Avg("longitude"), center_latitude=Avg("latitude")
+        ).order_by()
+    
+    clusters = [
+        {"longitude": x["center_longitude"], "latitude": x["center_latitude"], "count": x["count"]}
+        for x in clusters
+    ]
+    return Response({"zoom": zoom, "clusters": clusters}, status=status.HTTP_200_OK)
+
+
 @decorators.api_view(["GET", ])
 @decorators.permission_classes([permissions.AllowAny, ])
 def show_provider_locations(request: HttpRequest, pk: int):
@@ -95,6 +185,29 @@ def show_provider_locations(request: HttpRequest, pk: int):
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@decorators.api_view(["GET", ])
+@decorators.permission_classes([permissions.AllowAny, ])
+def provider_stats(request: HttpRequest, pk: int):
+    """
+    prices, categories and rates of the services and products of specific service provider
+    pk here is service_provider id
+    returns {services: {prices, categories, rates}, products: {prices, rates}}
+    cached per provider until its services, products or rates change (service_providers.stats)
+    """
+    language = request.META.get("Accept-Language")
+    stats = stats_helpers.provider_stats_cache.stats(pk)
+    
+    data = {
+        "services": {
+            **stats["services"]
+            , "categories": stats_helpers.localized_categories(stats["services"]["categories"], language)
+        }
+        , "products": stats["products"]
+    }
+    
+    return Response(data, status=status.HTTP_200_OK)
+
+
 @decorators.api_view(["GET", ])
 @decorators.permission_classes([permissions.AllowAny, ])
 def show_category_locations(request: HttpRequest, pk):
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.6 on 2026-10-18 15:05
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service_providers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='serviceproviderlocations',
+            name='location',
+            field=django.contrib.gis.db.models.fields.PointField(geography=True, null=True, srid=4326),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.6 on 2026-10-18 16:10
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+# same ranges as service_providers.models.opening_minutes
+FILL_OPEN_MINUTES = """
+UPDATE service_providers_serviceproviderlocations SET open_minutes = int4range(
+    (EXTRACT(HOUR FROM opening) * 60 + EXTRACT(MINUTE FROM opening))::int
+    , (EXTRACT(HOUR FROM closing) * 60 + EXTRACT(MINUTE FROM closing))::int
+        + CASE WHEN closing <= opening THEN 1440 ELSE 0 END
+    , '[)')
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service_providers', '0002_alter_serviceproviderlocations_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='serviceproviderlocations',
+            name='open_minutes',
+            field=django.contrib.postgres.fields.ranges.IntegerRangeField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name='serviceproviderlocations',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['open_minutes'], name='location_open_minutes'),
+        ),
+        migrations.RunSQL(FILL_OPEN_MINUTES, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.6 on 2026-10-18 21:30
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+import utils.geo
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service_providers', '0003_serviceproviderlocations_open_minutes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='serviceproviderlocations',
+            index=django.contrib.postgres.indexes.GistIndex(utils.geo.PlanarGeometry('location'), name='location_geometry'),
+        ),
+    ]
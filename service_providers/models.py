@@ -1,7 +1,13 @@
+from django.db.backends.postgresql.psycopg_any import NumericRange
+from django.contrib.postgres.fields import IntegerRangeField
+from django.contrib.postgres.indexes import GistIndex
 from django.contrib.gis.db import models
 
+from datetime import time
+
 from users.models import Users, Admins
 from category.models import Category
+from utils.geo import PlanarGeometry
 
 
 
@@ -36,18 +42,46 @@ class ServiceProvider(Users):
 
 class ServiceProviderLocations(models.Model):
     service_provider = models.ForeignKey(ServiceProvider, on_delete=models.CASCADE, related_name="locations")
-    location = models.PointField(srid=4326, null=True) # null must be False
+    location = models.PointField(srid=4326, geography=True, null=True) # null must be False
     opening = models.TimeField(null=False)
     closing = models.TimeField(null=False)
+    # opening hours in minutes since midnight, set by save() (see opening_minutes)
+    open_minutes = IntegerRangeField(null=True)
     crew = models.TextField(null=False)
     created_at = models.DateTimeField(auto_now_add=True, null=False)
     
     class Meta:
         verbose_name = "ServiceProviderLocations"
         verbose_name_plural = "ServiceProviderLocations"
+        indexes = [
+            GistIndex(fields=["open_minutes", ], name="location_open_minutes"),
+            # the viewport filter (utils.geo.in_bbox) compares the planar points
+            GistIndex(PlanarGeometry("location"), name="location_geometry"),
+        ]
     
     def __str__(self):
         return self.service_provider.business_name
+    
+    def save(self, *args, **kwargs) -> None:
+        self.open_minutes = opening_minutes(self.opening, self.closing)
+        
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"opening", "closing"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "open_minutes"}
+        
+        super().save(*args, **kwargs)
+
+
+def opening_minutes(opening: time, closing: time) -> NumericRange:
+    """
+    [opening, closing) in minutes since midnight, a location open overnight (closing <= opening)
+    ends on the next day: 20:00 -> 02:00 is [1200, 1560), so a time is inside it as t or t + 1440
+    """
+    start, end = opening.hour * 60 + opening.minute, closing.hour * 60 + closing.minute
+    if end <= start:
+        end += 24 * 60
+    
+    return NumericRange(start, end, "[)")
 
 class UpdateProfileRequests(models.Model):
     class RecordStatus(models.TextChoices):
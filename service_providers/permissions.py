@@ -2,7 +2,7 @@ from rest_framework import permissions
 
 from django.http import HttpRequest
 
-from permissions.helpers import Groups
+from permissions.helpers import Groups, user_group
 from utils.method_truth import request_method_table
 
 
@@ -36,7 +36,7 @@ class LocationsPermissions(permissions.BasePermission):
         
         codename = f"{request_method_table(request.method)}_serviceproviderlocations"
         group = Groups()
-        result = group.has_permission(codename, request.user.groups.first())
+        result = group.has_permission(codename, user_group(request.user))
         
         return result
     
@@ -55,7 +55,7 @@ class UpdateRequestsPermission(permissions.BasePermission):
         if request.user.is_authenticated:
             codename = f"{request_method_table(request.method)}_updateprofilerequests"
             group = Groups()
-            result = group.has_permission(codename, request.user.groups.first())
+            result = group.has_permission(codename, user_group(request.user))
             
             return result
         
@@ -56,3 +56,26 @@ class LocationSerializer(serializers.ModelSerializer):
     class Meta:
         model = ServiceProviderLocations
         fields = '__all__'
+
+
+class NearestLocationSerializer(serializers.ModelSerializer):
+    """
+    locations annotated with `distance` (meters), the service provider must be select_related
+    """
+    
+    class Meta:
+        model = ServiceProviderLocations
+        fields = ("id", "service_provider", "location", "opening", "closing", )
+    
+    def to_representation(self, instance: ServiceProviderLocations):
+        return {
+            "id": instance.id
+            , "service_provider_id": instance.service_provider_id
+            , "business_name": instance.service_provider.business_name
+            , "category_id": instance.service_provider.category_id
+            , "longitude": instance.location.x
+            , "latitude": instance.location.y
+            , "opening": instance.opening
+            , "closing": instance.closing
+            , "distance": round(instance.distance)
+        }
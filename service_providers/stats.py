@@ -0,0 +1,144 @@
+from django.db.models import Q, Count, Min, Max
+from django.db import transaction
+from django.conf import settings
+
+from typing import Any, Callable, Optional
+import threading
+import time
+
+from services.models import Service
+from products.models import Product
+from utils.rates_summary import STARS
+
+from .models import ServiceProviderLocations
+
+
+def star_filter(star: int) -> Q:
+    """
+    the rated rows whose average rate rounds to `star` (x.5 goes up), read from the rates summary
+    """
+    rated = Q(rates_summary__rates_count__gt=0)
+    if star == STARS[-1]:
+        return rated & Q(rates_summary__average_rate__gte=star - 0.5)
+    
+    return rated & Q(
+        rates_summary__average_rate__gte=star - 0.5, rates_summary__average_rate__lt=star + 0.5)
+
+
+def summary_aggregations() -> dict[str, Any]:
+    """
+    prices and the stars histogram of a queryset of services or products, in one aggregate query
+    """
+    aggregations = {f"stars_{star}": Count("id", filter=star_filter(star)) for star in STARS}
+    aggregations["min_price"] = Min("price")
+    aggregations["max_price"] = Max("price")
+    
+    return aggregations
+
+
+def summarize(queryset) -> dict[str, Any]:
+    result = queryset.aggregate(**summary_aggregations())
+    
+    return {
+        "prices": {"min_price": result["min_price"], "max_price": result["max_price"]}
+        , "rates": {star: result[f"stars_{star}"] for star in STARS}
+    }
+
+
+def compute_provider_stats(provider_id: int) -> dict[str, Any]:
+    """
+    3 queries whatever the number of services, products and rates
+    categories keep both names, the views pick the one of the request language
+    """
+    services = Service.objects.filter(provider_location__service_provider=provider_id)
+    products = Product.objects.filter(service_provider_location__service_provider=provider_id)
+    
+    categories = services.order_by("category").values(
+        "category", "category__en_name", "category__ar_name").annotate(services_count=Count("id"))
+    
+    stats = {"services": summarize(services), "products": summarize(products)}
+    stats["services"]["categories"] = [
+        {
+            "category_id": category["category"]
+            , "en_name": category["category__en_name"]
+            , "ar_name": category["category__ar_name"]
+            , "services_count": category["services_count"]
+        }
+        for category in categories
+    ]
+    
+    return stats
+
+
+def localized_categories(categories: list[dict], language: str) -> list[dict]:
+    name = "en_name" if language == "en" else "ar_name"
+    return [
+        {
+            "category_id": category["category_id"]
+            , "category_name": category[name]
+            , "services_count": category["services_count"]
+        }
+        for category in categories
+    ]
+
+
+class ProviderStatsCache:
+    """
+    process local cache [provider id => provider stats]
+    
+    services.signals and products.signals invalidate a provider after a write to its services,
+    products or rates is committed; the ttl bounds how long another process keeps an old entry
+    """
+    
+    def __init__(self, ttl: float = 300, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self.clock = clock
+        self.versions: dict[int, int] = {}
+        self.entries: dict[int, tuple[int, float, dict[str, Any]]] = {}
+        self.lock = threading.Lock()
+    
+    def stats(self, provider_id: int) -> dict[str, Any]:
+        with self.lock:
+            version, expires_at, stats = self.entries.get(provider_id, (None, 0, None))
+            current_version = self.versions.get(provider_id, 0)
+        
+        if version == current_version and expires_at > self.clock():
+            return stats
+        
+        stats = compute_provider_stats(provider_id)
+        
+        with self.lock:
+            # an invalidation while computing makes this result old already, don't keep it
+            if self.versions.get(provider_id, 0) == current_version:
+                self.entries[provider_id] = (current_version, self.clock() + self.ttl, stats)
+        
+        return stats
+    
+    def invalidate(self, *provider_ids: int) -> None:
+        with self.lock:
+            for provider_id in provider_ids:
+                self.versions[provider_id] = self.versions.get(provider_id, 0) + 1
+                self.entries.pop(provider_id, None)
+    
+    def clear(self) -> None:
+        with self.lock:
+            self.versions.clear()
+            self.entries.clear()
+
+
+provider_stats_cache = ProviderStatsCache(**getattr(settings, "PROVIDER_STATS", {}))
+
+
+def locations_providers(*location_ids: Optional[int]) -> list[int]:
+    return list(ServiceProviderLocations.objects.filter(
+        id__in=[location_id for location_id in location_ids if location_id is not None]
+        ).values_list("service_provider", flat=True).distinct())
+
+
+def invalidate_on_commit(*provider_ids: Optional[int]) -> None:
+    """
+    after the commit, so a concurrent request can't cache the stats as they were before the write
+    """
+    provider_ids = [provider_id for provider_id in provider_ids if provider_id is not None]
+    if provider_ids:
+        transaction.on_commit(lambda: provider_stats_cache.invalidate(*provider_ids))
@@ -21,3 +21,262 @@
 #         approved_admin = service_provider.approved_by
 
 #         self.assertEqual(approved_admin, admin)
+
+
+from django.contrib.auth import get_user_model
+from django.db.models import Avg, Min, Max
+from django.db.backends.postgresql.psycopg_any import NumericRange
+from django.db import connection
+
+from hypothesis.extra.django import TestCase
+
+from collections import defaultdict
+from datetime import time
+from importlib import import_module
+
+from category.models import Category
+from products.models import Product, ProductRates
+from services.models import Service, ServiceRates
+from service_providers.models import ServiceProviderLocations, opening_minutes
+from service_providers import helpers, stats
+from utils import geo, testing
+
+Users = get_user_model()
+
+
+class TestViewportFilter(TestCase):
+    def setUp(self) -> None:
+        category = Category.objects.create(en_name="clinic", ar_name="عيادة")
+        self.provider_id = testing.create_provider(category)
+    
+    def create_location(self, longitude: float, latitude: float) -> ServiceProviderLocations:
+        return testing.create_location(self.provider_id, longitude, latitude)
+    
+    def test_point_near_the_equator_side_edge_is_inside(self):
+        # the great circle from (0, 10) to (60, 10) passes at ~11.5 degrees north at longitude 30
+        location = self.create_location(30, 10.5)
+        outside = self.create_location(30, 9.5)
+        
+        found = set(ServiceProviderLocations.objects.filter(
+            geo.in_bbox("location", (0, 10, 60, 50))).values_list("id", flat=True))
+        
+        assert location.id in found
+        assert outside.id not in found
+
+
+class TestCategoryParameter(TestCase):
+    def test_non_numeric_category_is_a_bad_request(self):
+        for url in ("/api/v1/service_providers/locations/nearest/", "/api/v1/service_providers/locations/clusters/"):
+            response = self.client.get(
+                url, {"longitude": "55.27", "latitude": "25.2", "bbox": "55,25,56,26", "zoom": "10"
+                      , "category": "clinic"})
+            
+            assert response.status_code == 400
+            assert "category" in response.json()["error"]
+
+
+def python_stars(rates) -> dict[int, int]:
+    """
+    the histogram of the per record average rates, as the views computed it before service_providers.stats
+    (with every star listed and an average of exactly 5 counted as 5 stars, as stats does on purpose)
+    """
+    limits = {(4.5, 5.01): 5, (3.5, 4.5): 4, (2.5, 3.5): 3, (1.5, 2.5): 2, (0.5, 1.5): 1, (0, 0.5): 0}
+    stars = {star: 0 for star in limits.values()}
+    
+    for row in rates:
+        for limit in limits:
+            if row["avg_rate"] >= limit[0] and row["avg_rate"] < limit[1]:
+                stars[limits[limit]] += 1
+                break
+    
+    return stars
+
+
+def python_provider_stats(provider_id: int) -> dict:
+    services = Service.objects.filter(provider_location__service_provider=provider_id)
+    products = Product.objects.filter(service_provider_location__service_provider=provider_id)
+    
+    frequencies = defaultdict(int)
+    for service in services:
+        frequencies[(service.category.id, service.category.en_name)] += 1
+    
+    return {
+        "services": {
+            "prices": services.aggregate(min_price=Min("price"), max_price=Max("price"))
+            , "rates": python_stars(ServiceRates.objects.filter(
+                service__provider_location__service_provider=provider_id).values("service").annotate(
+                avg_rate=Avg("rate")))
+            , "categories": sorted((
+                {"category_id": key[0], "category_name": key[1], "services_count": value}
+                for key, value in frequencies.items()), key=lambda category: category["category_id"])
+        }
+        , "products": {
+            "prices": products.aggregate(min_price=Min("price"), max_price=Max("price"))
+            , "rates": python_stars(ProductRates.objects.filter(
+                product__service_provider_location__service_provider=provider_id).values("product").annotate(
+                avg_rate=Avg("rate")))
+        }
+    }
+
+
+class TestProviderStats(TestCase):
+    def setUp(self) -> None:
+        clinic = Category.objects.create(en_name="clinic", ar_name="عيادة")
+        lab = Category.objects.create(en_name="lab", ar_name="مختبر")
+        self.provider_id = testing.create_provider(clinic)
+        location = testing.create_location(self.provider_id)
+        # another provider's records aren't counted
+        other = testing.create_location(testing.create_provider(clinic, 2))
+        testing.create_service(other, lab, price="99.00")
+        testing.create_product(other, price="1.00")
+        
+        patients = [
+            Users.objects.create(
+                email=f"patient_{number}@test.com", phone=f"+9716{number:08d}", password="password"
+                , user_type="USER")
+            for number in (1, 2)]
+        
+        # averages 4.5 (5 stars), 1.5 (2 stars) and not rated
+        for service, rates in (
+            (testing.create_service(location, clinic, price="10.00"), (5, 4))
+            , (testing.create_service(location, clinic, price="20.00"), (1, 2))
+            , (testing.create_service(location, lab, price="35.00"), ())):
+            for patient, rate in zip(patients, rates):
+                ServiceRates.objects.create(service=service, user=patient, rate=rate)
+        
+        # averages 3, 5 and 0.5 (1 star)
+        for product, rates in (
+            (testing.create_product(location, price="5.00"), (3, ))
+            , (testing.create_product(location, price="50.00"), (5, 5))
+            , (testing.create_product(location, price="7.00"), (0, 1))):
+            for patient, rate in zip(patients, rates):
+                ProductRates.objects.create(product=product, user=patient, rate=rate)
+    
+    def test_sql_stats_match_the_python_computation(self):
+        expected = python_provider_stats(self.provider_id)
+        
+        with self.assertNumQueries(3):
+            computed = stats.compute_provider_stats(self.provider_id)
+        
+        computed["services"]["categories"] = sorted(
+            stats.localized_categories(computed["services"]["categories"], "en")
+            , key=lambda category: category["category_id"])
+        assert computed == expected
+        assert computed["services"]["rates"] == {0: 0, 1: 0, 2: 1, 3: 0, 4: 0, 5: 1}
+        assert computed["products"]["rates"] == {0: 0, 1: 1, 2: 0, 3: 1, 4: 0, 5: 1}
+
+
+class TestProviderStatsInvalidation(TestCase):
+    def setUp(self) -> None:
+        self.category = Category.objects.create(en_name="clinic", ar_name="عيادة")
+        self.providers = [testing.create_provider(self.category, number) for number in (1, 2)]
+        self.locations = [testing.create_location(provider_id) for provider_id in self.providers]
+        
+        for provider_id in self.providers:
+            stats.provider_stats_cache.stats(provider_id)
+    
+    def cached(self) -> set[int]:
+        return set(stats.provider_stats_cache.entries)
+    
+    def test_moved_product_invalidates_both_providers(self):
+        product = testing.create_product(self.locations[0])
+        for provider_id in self.providers:
+            stats.provider_stats_cache.stats(provider_id)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            product.service_provider_location = self.locations[1]
+            product.save()
+        
+        assert self.cached() == set()
+    
+    def test_moved_service_invalidates_both_providers(self):
+        service = testing.create_service(self.locations[0], self.category)
+        for provider_id in self.providers:
+            stats.provider_stats_cache.stats(provider_id)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            service.provider_location = self.locations[1]
+            service.save()
+        
+        assert self.cached() == set()
+    
+    def test_saved_product_in_place_invalidates_its_provider_only(self):
+        product = testing.create_product(self.locations[0])
+        for provider_id in self.providers:
+            stats.provider_stats_cache.stats(provider_id)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            product.quantity = 5
+            product.save()
+        
+        assert self.cached() == {self.providers[1]}
+    
+    def test_saved_rate_invalidates_its_provider(self):
+        product = testing.create_product(self.locations[0])
+        patient = Users.objects.create(
+            email="patient@test.com", phone="+971600000001", password="password", user_type="USER")
+        for provider_id in self.providers:
+            stats.provider_stats_cache.stats(provider_id)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            ProductRates.objects.create(product=product, user=patient, rate=4)
+        
+        assert self.cached() == {self.providers[1]}
+        assert stats.provider_stats_cache.stats(self.providers[0])["products"]["rates"][4] == 1
+    
+    def test_renamed_category_invalidates_its_services_providers(self):
+        testing.create_service(self.locations[1], self.category)
+        for provider_id in self.providers:
+            stats.provider_stats_cache.stats(provider_id)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.en_name = "clinics"
+            self.category.save()
+        
+        assert self.cached() == {self.providers[0]}
+
+
+class TestOpeningMinutes(TestCase):
+    def test_day_hours(self):
+        assert opening_minutes(time(8), time(20)) == NumericRange(480, 1200, "[)")
+    
+    def test_closing_before_opening_ends_the_next_day(self):
+        assert opening_minutes(time(22), time(2)) == NumericRange(1320, 1560, "[)")
+        assert opening_minutes(time(22, 30), time(0)) == NumericRange(1350, 1440, "[)")
+    
+    def test_same_opening_and_closing_is_open_all_day(self):
+        assert opening_minutes(time(9), time(9)) == NumericRange(540, 1980, "[)")
+
+
+class TestOpenAt(TestCase):
+    def setUp(self) -> None:
+        provider_id = testing.create_provider(Category.objects.create(en_name="clinic", ar_name="عيادة"))
+        self.night = testing.create_location(provider_id, opening=time(22), closing=time(2))
+        self.day = testing.create_location(provider_id, opening=time(8), closing=time(20))
+    
+    def open_at(self, time_of_day: time) -> set[int]:
+        return set(ServiceProviderLocations.objects.filter(
+            helpers.open_at(time_of_day)).values_list("id", flat=True))
+    
+    def test_overnight_location_before_midnight(self):
+        assert self.open_at(time(23)) == {self.night.id}
+    
+    def test_overnight_location_after_midnight(self):
+        assert self.open_at(time(1)) == {self.night.id}
+    
+    def test_overnight_location_after_closing(self):
+        assert self.open_at(time(3)) == set()
+        assert self.open_at(time(2)) == set()
+    
+    def test_day_location(self):
+        assert self.open_at(time(12)) == {self.day.id}
+    
+    def test_migration_fills_the_same_ranges(self):
+        migration = import_module("service_providers.migrations.0003_serviceproviderlocations_open_minutes")
+        ServiceProviderLocations.objects.update(open_minutes=None)
+        
+        with connection.cursor() as cursor:
+            cursor.execute(migration.FILL_OPEN_MINUTES)
+        
+        for location in ServiceProviderLocations.objects.all():
+            assert location.open_minutes == opening_minutes(location.opening, location.closing)
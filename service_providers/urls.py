@@ -21,8 +21,11 @@ urlpatterns = [
     path("locations/category/<int:pk>/", maamoun_view.show_category_locations, name="show_provider_locations"),
     path("locations/<int:pk>/", maamoun_view.show_provider_locations, name="show_provider_locations"),
     path("category/<int:pk>/", maamoun_view.show_category_providers, name="show_category_providers"),
+    path("stats/<int:pk>/", maamoun_view.provider_stats, name="provider_stats"),
     
     path("locations/", maamoun_view.show_providers_locations, name="show_providers_locations"),
+    path("locations/nearest/", maamoun_view.nearest_locations, name="nearest_locations"),
+    path("locations/clusters/", maamoun_view.locations_clusters, name="locations_clusters"),
     
     # create location - authorized only
     path("locations/create/", maamoun_view.CreateLocation.as_view(), name="create_location"),
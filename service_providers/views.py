@@ -7,7 +7,7 @@ from django.http import HttpRequest
 from .models import UpdateProfileRequests
 from . import permissions, serializers
 
-from notification.models import Notification
+from notification.dispatcher import notify
 
 
 
@@ -45,7 +45,8 @@ class ServiceProviderUpdateRequestViewSet(viewsets.ModelViewSet):
             , "ar_content": "تعديل لملف شخصي بانتظار المراجعة"
             , "en_content": "Profile information editing is need revision"}
         
-        Notification.objects.bulk_create([Notification(**first_notf), Notification(**second_notf)])
+        notify(**first_notf)
+        notify(**second_notf)
         
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
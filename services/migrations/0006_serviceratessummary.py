@@ -0,0 +1,48 @@
+# Generated by Django 4.2.6 on 2026-10-18 09:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from utils.rates_summary import rates_aggregations, summary_fields
+
+
+def fill_summaries(apps, schema_editor):
+    Service = apps.get_model("services", "Service")
+    ServiceRatesSummary = apps.get_model("services", "ServiceRatesSummary")
+
+    rated = Service.objects.order_by().values("id").annotate(**rates_aggregations("service_rates__"))
+
+    ServiceRatesSummary.objects.bulk_create(
+        [ServiceRatesSummary(service_id=stats["id"], **summary_fields(stats)) for stats in rated.iterator()]
+        , batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0005_alter_service_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceRatesSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stars_0', models.PositiveIntegerField(default=0)),
+                ('stars_1', models.PositiveIntegerField(default=0)),
+                ('stars_2', models.PositiveIntegerField(default=0)),
+                ('stars_3', models.PositiveIntegerField(default=0)),
+                ('stars_4', models.PositiveIntegerField(default=0)),
+                ('stars_5', models.PositiveIntegerField(default=0)),
+                ('rates_count', models.PositiveIntegerField(default=0)),
+                ('rates_sum', models.PositiveIntegerField(default=0)),
+                ('average_rate', models.FloatField(default=0)),
+                ('service', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rates_summary', to='services.service')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,19 @@
+from django.db.models.query import QuerySet
 from django.db.models import Avg
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 
 from service_providers.models import ServiceProviderLocations
 from category.models import Category
+from utils.rates_summary import RatesSummary, rates_aggregations, summary_fields
 
 
+class ServiceManager(models.Manager):
+    def get_queryset(self) -> QuerySet:
+        # RUDServicesSerializer reads all of these for every row
+        result = super().get_queryset()
+        return result.select_related("rates_summary", "category", "provider_location__service_provider")
+
 
 class Service(models.Model):
     provider_location = models.ForeignKey(
@@ -21,6 +29,8 @@ class Service(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ServiceManager()
+    
     def __str__(self) -> str:
         return f"{self.en_title}, category: {self.category.en_name}, provider: {self.provider_location.service_provider.business_name}"
     
@@ -47,3 +57,32 @@ class ServiceRates(models.Model):
     
     def __str__(self) -> str:
         return f"{self.user.email} -> {self.service.en_title}"
+
+
+class ServiceRatesSummary(RatesSummary):
+    """
+    precomputed service rates, kept up to date by services.signals
+    rebuild all records with: python manage.py rebuild_rates_summary
+    """
+    service = models.OneToOneField(Service, on_delete=models.CASCADE, related_name="rates_summary")
+    
+    def __str__(self) -> str:
+        return f"{self.service_id} -> avg: {self.average_rate}, count: {self.rates_count}"
+    
+    @classmethod
+    def refresh(cls, service_id: int, create: bool = True):
+        """
+        the summary row is locked before the rates are aggregated, so concurrent rate writes
+        refresh it one after the other and the last one aggregates all of them
+        """
+        summary = cls.objects.filter(service_id=service_id)
+        
+        with transaction.atomic():
+            if create:
+                cls.objects.bulk_create([cls(service_id=service_id)], ignore_conflicts=True)
+            
+            if not summary.select_for_update().values_list("id", flat=True):
+                return
+            
+            stats = ServiceRates.objects.filter(service=service_id).aggregate(**rates_aggregations())
+            summary.update(**summary_fields(stats))
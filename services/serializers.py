@@ -1,11 +1,13 @@
 from rest_framework import serializers
 
-from django.db.models import QuerySet
+from django.core.exceptions import ObjectDoesNotExist
 
 from .helpers import FileMixin
 
 from . import models
 
+from utils.query_plan import RelatedPathsMixin
+
 
 class CreateServicesSerializer(serializers.ModelSerializer):
     
@@ -53,7 +55,7 @@ class RUDServicesSerializer(serializers.ModelSerializer, FileMixin):
     
     def to_representation(self, instance: models.Service):
         category = instance.category
-        rates: QuerySet[models.ServiceRates] = instance.service_rates.all()
+        rates = self.get_rates_summary(instance)
         
         return {
             "id": instance.id
@@ -69,18 +71,28 @@ class RUDServicesSerializer(serializers.ModelSerializer, FileMixin):
             , "created_at": instance.created_at
             , "updated_at": instance.updated_at
             , "rates" : {
-                "avg_rate": instance.average_rating
-                , "5 stars": rates.filter(rate=5).count()
-                , "4 stars": rates.filter(rate=4).count()
-                , "3 stars": rates.filter(rate=3).count()
-                , "2 stars": rates.filter(rate=2).count()
-                , "1 stars": rates.filter(rate=1).count()
-                , "0 stars": rates.filter(rate=0).count()
+                "avg_rate": rates.average_rate
+                , "5 stars": rates.stars_5
+                , "4 stars": rates.stars_4
+                , "3 stars": rates.stars_3
+                , "2 stars": rates.stars_2
+                , "1 stars": rates.stars_1
+                , "0 stars": rates.stars_0
             }
         }
+    
+    def get_rates_summary(self, instance: models.Service) -> models.ServiceRatesSummary:
+        """
+        the summary is select_related by the Service manager, services without rates have no summary
+        """
+        try:
+            return instance.rates_summary
+        except ObjectDoesNotExist:
+            return models.ServiceRatesSummary(service=instance)
 
 
-class ServiceRatesSerializer(serializers.ModelSerializer):
+class ServiceRatesSerializer(RelatedPathsMixin, serializers.ModelSerializer):
+    select_related_paths = ("user", "service", )
     class Meta:
         model = models.ServiceRates
         fields = "__all__"
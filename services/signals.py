@@ -0,0 +1,80 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from . import models
+
+from category.models import Category
+from service_providers import stats
+
+
+
+# the service of the rate before the update, memo from pre_save for the post_save receivers
+# (search.signals reads it too, so it isn't popped)
+PREVIOUS_ATTRIBUTE = "_previous_service_id"
+# the location of the service before the update, memo from pre_save for invalidate_provider_stats
+PREVIOUS_LOCATION_ATTRIBUTE = "_previous_location_id"
+LOCATION_FIELDS = {"provider_location", "provider_location_id"}
+
+
+def rated_services(instance: models.ServiceRates) -> list[int]:
+    """
+    the service of the rate, and its previous service when the rate was moved to another one
+    """
+    previous = instance.__dict__.get(PREVIOUS_ATTRIBUTE)
+    return [instance.service_id] + ([previous] if previous not in (None, instance.service_id) else [])
+
+
+@receiver(pre_save, sender=models.ServiceRates)
+def remember_previous_service(sender, instance: models.ServiceRates, raw: bool = False, **kwargs):
+    instance.__dict__[PREVIOUS_ATTRIBUTE] = None if raw or instance.pk is None else (
+        sender.objects.filter(pk=instance.pk).values_list("service", flat=True).first())
+
+
+@receiver(post_save, sender=models.ServiceRates)
+def refresh_rates_summary_on_save(sender, instance: models.ServiceRates, **kwargs):
+    # in id order, two rates moved between the same services lock their summaries in the same order
+    for service_id in sorted(rated_services(instance)):
+        models.ServiceRatesSummary.refresh(service_id)
+
+
+@receiver(post_delete, sender=models.ServiceRates)
+def refresh_rates_summary_on_delete(sender, instance: models.ServiceRates, **kwargs):
+    # don't create a summary here, the service itself may be in the middle of a cascade delete
+    models.ServiceRatesSummary.refresh(instance.service_id, create=False)
+
+
+@receiver(pre_save, sender=models.Service)
+def remember_previous_location(
+    sender, instance: models.Service, raw: bool = False, update_fields=None, **kwargs):
+    if raw or instance.pk is None:
+        return
+    
+    # a save of other fields (the price, the title) can't move it
+    if update_fields is not None and not LOCATION_FIELDS & set(update_fields):
+        return
+    
+    instance.__dict__[PREVIOUS_LOCATION_ATTRIBUTE] = sender.objects.filter(
+        pk=instance.pk).values_list("provider_location", flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=models.Service)
+def invalidate_provider_stats(sender, instance: models.Service, raw: bool = False, **kwargs):
+    # a service moved to another provider's location leaves the stats of both providers
+    previous = instance.__dict__.pop(PREVIOUS_LOCATION_ATTRIBUTE, None)
+    if not raw:
+        stats.invalidate_on_commit(*stats.locations_providers(instance.provider_location_id, previous))
+
+
+@receiver([post_save, post_delete], sender=models.ServiceRates)
+def invalidate_provider_stats_on_rate(sender, instance: models.ServiceRates, raw: bool = False, **kwargs):
+    if not raw:
+        stats.invalidate_on_commit(*models.Service.objects.filter(
+            id__in=rated_services(instance)).values_list("provider_location__service_provider", flat=True))
+
+
+@receiver(post_save, sender=Category)
+def invalidate_provider_stats_on_category(sender, instance: Category, raw: bool = False, **kwargs):
+    # the stats keep the category names
+    if not raw:
+        stats.invalidate_on_commit(*models.Service.objects.filter(
+            category=instance).values_list("provider_location__service_provider", flat=True).distinct())
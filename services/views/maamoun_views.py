@@ -3,23 +3,22 @@ from rest_framework.response import Response
 from rest_framework import status
 
 from django.contrib.postgres.search import SearchQuery, SearchVector
-from django.contrib.gis.db.models.functions import Distance
 from django.db.models import Q, Avg, QuerySet
-from django.db.models import Avg, Min, Max
-from django.contrib.gis.geos import Point
 from django.http import HttpRequest
 
-from collections import defaultdict
 from functools import reduce
 from typing import Any
 
 from services import models, serializers, helpers
 
 from products.file_handler import UploadImages, DeleteFiles
-from notification.models import Notification
+from notification.dispatcher import notify
 
 from utils.permission import HasPermission
 from utils.catch_helper import catch
+from utils import geo
+from service_providers.helpers import requested_time, open_at
+from service_providers.stats import provider_stats_cache, localized_categories
 
 from core.pagination_classes.nine_element_paginator import custom_pagination_function
 
@@ -41,7 +40,7 @@ class CreateService(generics.CreateAPIView, helpers.FileMixin):
         request.data["image"] = images_names
         resp = super().create(request, *args, **kwargs)
         
-        Notification.objects.create(
+        notify(
             sender="system", sender_type="System"
             , receiver=request.user.email, receiver_type="Service_Provider"
             , ar_content="تم إضافة خدمة جديدة إلى خدماتك"
@@ -72,7 +71,7 @@ class ServiceRUD(generics.RetrieveUpdateDestroyAPIView, helpers.FileMixin):
         delete_files = DeleteFiles()
         delete_files.delete_files(instance.image)
         
-        Notification.objects.create(
+        notify(
             sender="system", sender_type="System"
             , receiver=self.request.user.email, receiver_type="Service_Provider"
             , ar_content="تم حذف الخدمة"
@@ -99,7 +98,7 @@ class ServiceRUD(generics.RetrieveUpdateDestroyAPIView, helpers.FileMixin):
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
         
-        Notification.objects.create(
+        notify(
             sender="system", sender_type="System"
             , receiver=request.user.email, receiver_type="Service_Provider"
             , ar_content="تم تعديل الخدمة"
@@ -135,56 +134,20 @@ def provider_services(request: HttpRequest, provider_id: int= None):
 @decorators.api_view(["GET", ])
 @decorators.permission_classes([])
 def provider_services_by_category(request: HttpRequest, provider_id: int):
-    # all_cat = Category.objects.annotate(num_of_services=Count("services", filter=Q(services__gt=1)))
-    # for cat in all_cat: cat.id, cat.ar_name, cat.en_name, cat.num_services
     """
     number of services for each categories available in specific provider
-    returns {category_id, category_name, services_count}
+    returns {prices: {min_price, max_price}, categories: [{category_id, category_name, services_count}]
+            , rates: {star: services count}}
+    computed in SQL and cached per provider, see service_providers.stats
     """
     language = request.META.get("Accept-Language")
-    queryset = models.Service.objects.filter(provider_location__service_provider=provider_id)
-    prices = queryset.aggregate(min_price=Min("price"), max_price=Max("price"))
+    stats = provider_stats_cache.stats(provider_id)["services"]
     
-    def categories(queryset):
-        frequencies = defaultdict(int)
-        for query in queryset:
-            category_id = query.category.id
-            category_name = query.category.en_name if language == "en" else query.category.ar_name 
-            
-            frequencies[(category_id, category_name)] += 1
-            
-        def serialize_data(frequencies: defaultdict[tuple[int, str], int]):
-            data = []
-            for k, v in frequencies.items():
-                data.append({"category_id": k[0], "category_name": k[1], "services_count": v})
-            
-            return data
-        
-        return serialize_data(frequencies)
-    
-    def sizing_rates():
-        # first we filtered the provider services
-        # then we aggregate similar services and find it's average rate
-        queryset = models.ServiceRates.objects.filter(
-        service__provider_location__service_provider=provider_id).values(
-            "service").annotate(avg_rate=Avg("rate"))
-        
-        limits = { (4.5, 5): 5, (3.5, 4.5): 4, (2.5, 3.5): 3, (1.5, 2.5): 2, (0.5, 1.5): 1, (0, 0.5): 0 }
-        rates = defaultdict(int)
-        
-        for query in queryset:
-            for limit in limits:
-                if query["avg_rate"] >= limit[0] and query["avg_rate"] < limit[1]:
-                    rates[limits[limit]] += 1
-                    break
-        
-        return rates
-    
-    data = {}
-    
-    data["prices"] = {"min_price": prices["min_price"], "max_price": prices["max_price"]}
-    data["categories"] = categories(queryset)
-    data["rates"] = sizing_rates()
+    data = {
+        "prices": stats["prices"]
+        , "categories": localized_categories(stats["categories"], language)
+        , "rates": stats["rates"]
+    }
     
     return Response(data, status=status.HTTP_200_OK)
 
@@ -268,14 +231,20 @@ def check_rate(query_params: dict[str, Any], services_queryset: QuerySet):
     return q_expr, services_queryset
 
 def check_distance(query_params: dict[str, Any], services_queryset: QuerySet):
-    location = Point(query_params.get("distance"), srid=4326)
+    location, radius = query_params.get("distance")
     
-    services_q_expr = Q(provider_location__location__distance_lt=(location, 1000000))
+    services_q_expr = geo.within("provider_location__location", location, radius)
     services_queryset = services_queryset.annotate(
-        distance=Distance("provider_location__location", location)).order_by("distance")
+        distance=geo.distance_to("provider_location__location", location)).order_by("distance")
     
     return services_q_expr, services_queryset
 
+def check_open(query_params: dict[str, Any], services_queryset: QuerySet):
+    """
+    open at the requested time (?open_at=HH:MM or ?open_now=true), overnight hours included
+    """
+    return open_at(query_params.get("open"), "provider_location__open_minutes"), services_queryset
+
 def get_pagination(pagination_number: int):
     a = pagination_number // 2
     b = pagination_number - a
@@ -291,10 +260,18 @@ def get_callables(query_params: dict[str, Any]):
     else:
         pagination_number = int(pagination_number[0])
     
-    # switching longitude and latitude to distance within query_params
+    # switching longitude, latitude and radius (meters) to distance within query_params
+    radius = new_query_params.pop("radius", [None])[0]
     if new_query_params.get("longitude") and new_query_params.get("latitude"):
         longitude, latitude = new_query_params.pop("longitude")[0], new_query_params.pop("latitude")[0]
-        new_query_params["distance"] = float(longitude), float(latitude)
+        new_query_params["distance"] = geo.point_from(longitude, latitude), geo.radius_from(radius)
+    
+    # switching open_at or open_now to the requested time within query_params
+    time_of_day = requested_time(new_query_params)
+    new_query_params.pop("open_at", None)
+    new_query_params.pop("open_now", None)
+    if time_of_day is not None:
+        new_query_params["open"] = time_of_day
     
     # switching min_price and max_price to price__range within query_params
     if new_query_params.get("min_price") and new_query_params.get("max_price"):
@@ -304,7 +281,7 @@ def get_callables(query_params: dict[str, Any]):
     callables_hashtable = {
         "distance": check_distance, "search": search_func,
         "rates": check_rate, "range": check_range,
-        "categories": check_category
+        "categories": check_category, "open": check_open
     }
     
     callables = [callables_hashtable[key] for key in new_query_params.keys()]
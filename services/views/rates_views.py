@@ -5,7 +5,7 @@ from rest_framework import status
 from django.http import HttpRequest
 
 from utils.permission import authorization_with_method
-from notification.models import Notification
+from notification.dispatcher import notify
 from services import models, serializers
 
 
@@ -26,7 +26,7 @@ def update_delete_rate(request: HttpRequest, rate_id: int):
     
     def delete_instance(instance: models.ServiceRates):
         instance.delete()
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=instance.user.email, receiver_type="User"
             , ar_content="تم حذف التقييم", en_content="rate deleted")
@@ -40,7 +40,7 @@ def update_delete_rate(request: HttpRequest, rate_id: int):
         serializer.is_valid(raise_exception=True)
         serializer.save()
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=request.user.email, receiver_type="User"
             , ar_content="تم تعديل التقييم", en_content="rate updated")
@@ -81,7 +81,7 @@ def create_rate(request: HttpRequest):
             {"error": "this user already rate this service, user can't rate same service twice"}
             , status=status.HTTP_403_FORBIDDEN)
     
-    Notification.objects.create(
+    notify(
         sender="System", sender_type="System"
         , receiver=request.user.email, receiver_type="User"
         , ar_content="تمت إضافة التقييم", en_content="rate added")
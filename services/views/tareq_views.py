@@ -1,8 +1,6 @@
 from rest_framework import decorators, status, permissions
 from rest_framework.response import Response
 
-from django.contrib.gis.db.models.functions import Distance
-from django.contrib.gis.geos import Point
 from django.db.models import Q
 
 from django.http import HttpRequest
@@ -10,6 +8,8 @@ from django.http import HttpRequest
 from services import models as smodels, serializers as sserializer
 from services import serializers
 
+from utils import geo
+
 from functools import reduce
 
 
@@ -56,20 +56,22 @@ def services_by_distance(request: HttpRequest, service_name: str, longitude: str
         An api to list services filtered by distance ordered for nearest to farthest.
         lat and lon are required
         ?latitude=<integer>, longitude=<integer> & service_name=<string>
+        ?radius=<meters> (optional, settings.GEO_SEARCH)
         
         ### nearest_locations = Location.objects.annotate(
             ### distance=Distance('point', given_point)).order_by('distance')[:3] 
     """
     language = request.META.get("Accept-Language")
     
-    location = Point(float(longitude), float(latitude), srid=4326)
+    location = geo.point_from(longitude, latitude)
+    radius = geo.radius_from(request.query_params.get("radius"))
     service_name = service_name.split("_")
     Q_expr = (Q(en_title__icontains=x) | Q(ar_title__icontains=x) for x in service_name)
     Q_func = reduce(lambda x,y: x & y, Q_expr)
     
     services = smodels.Service.objects.filter(Q_func,
-        provider_location__location__distance_lt=(location, 1000000)
-        ).annotate(distance=Distance("provider_location__location", location)).order_by("distance")
+        geo.within("provider_location__location", location, radius)
+        ).annotate(distance=geo.distance_to("provider_location__location", location)).order_by("distance")
     
     if not services.exists():
         return Response(
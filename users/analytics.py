@@ -0,0 +1,98 @@
+from django.db import connection
+
+from collections import Counter
+from datetime import date, datetime, time
+from typing import Any
+
+from .models import Users, PlatformCounters, MonthlySignups
+
+
+def users_counter(user_type: str, is_active: bool) -> str:
+    return f"users:{user_type}:{'active' if is_active else 'inactive'}"
+
+
+def signup_month(date_joined: datetime) -> date:
+    return date_joined.date().replace(day=1)
+
+
+class PlatformChanges:
+    """
+    deltas of the platform counters and the monthly signups, written by apply_platform_changes
+    """
+    
+    def __init__(self) -> None:
+        self.counters: Counter = Counter()
+        self.months: Counter = Counter()
+    
+    def user(self, user_type: str, is_active: bool, date_joined: datetime, sign: int = 1) -> None:
+        """
+        a user created (sign=1) or deleted (sign=-1)
+        """
+        self.counters[users_counter(user_type, is_active)] += sign
+        self.months[signup_month(date_joined)] += sign
+    
+    def user_changed(self, old: tuple[str, bool], new: tuple[str, bool]) -> None:
+        """
+        (user type, is active) of a user changed, its signup month doesn't
+        """
+        if old != new:
+            self.counters[users_counter(*old)] -= 1
+            self.counters[users_counter(*new)] += 1
+
+
+def apply_platform_changes(changes: PlatformChanges) -> None:
+    """
+    adds the deltas to the counters, one upsert per table
+    the tables have no foreign keys, the rows can be created in a cascade delete too
+    """
+    upserts = (
+        (PlatformCounters, "name", "%s", changes.counters)
+        , (MonthlySignups, "month", "%s::date", changes.months)
+    )
+    
+    with connection.cursor() as cursor:
+        for model, key, placeholder, deltas in upserts:
+            rows = [(value, delta) for value, delta in deltas.items() if delta]
+            if not rows:
+                continue
+            
+            table = connection.ops.quote_name(model._meta.db_table)
+            values = ", ".join([f"({placeholder}, %s)"] * len(rows))
+            cursor.execute(
+                f"INSERT INTO {table} ({key}, count) VALUES {values} "
+                f"ON CONFLICT ({key}) DO UPDATE SET count = {table}.count + EXCLUDED.count"
+                , [value for row in rows for value in row])
+
+
+def platform_stats() -> dict[str, Any]:
+    """
+    the admin stats answered from the counters, two queries whatever the number of users
+    """
+    counters = dict(PlatformCounters.objects.values_list("name", "count"))
+    
+    def users(user_type: str, is_active: bool) -> int:
+        return counters.get(users_counter(user_type, is_active), 0)
+    
+    months = MonthlySignups.objects.filter(count__gt=0).order_by("-month")
+    
+    return {
+        "users_stats": {
+            "all_user": sum(count for name, count in counters.items() if name.startswith("users:"))
+            , "active_patients": users(Users.Types.USER, True)
+            , "active_service_providers": users(Users.Types.SERVICE_PROVIDER, True)
+            , "active_super_admins": users(Users.Types.SUPER_ADMIN, True)
+            , "active_admins": users(Users.Types.ADMIN, True)
+            , "non_active_patients": users(Users.Types.USER, False)
+            , "non_active_service_providers": users(Users.Types.SERVICE_PROVIDER, False)
+            , "non_active_super_admins": users(Users.Types.SUPER_ADMIN, False)
+            , "non_active_admins": users(Users.Types.ADMIN, False)
+        }
+        , "services_&_products_stats": {
+            "products_number": counters.get("products", 0)
+            , "services_number": counters.get("services", 0)
+        }
+        # the month as the start of the month, as TruncMonth("date_joined") returned it
+        , "months_stats": [
+            {"month": datetime.combine(signups.month, time.min), "users_count": signups.count}
+            for signups in months]
+    }
@@ -0,0 +1,34 @@
+from django.core.management import BaseCommand
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.db import transaction
+
+from users.analytics import users_counter
+from users.models import Users, PlatformCounters, MonthlySignups
+from products.models import Product
+from services.models import Service
+
+
+class Command(BaseCommand):
+    help = "rebuild the platform counters and the monthly signups, for the changes the signals don't see (bulk writes)"
+    
+    def handle(self, *args, **options):
+        users = Users.objects.order_by().values("user_type", "is_active").annotate(users_count=Count("id"))
+        months = Users.objects.order_by().values(month=TruncMonth("date_joined")).annotate(users_count=Count("id"))
+        
+        with transaction.atomic():
+            counters = [
+                PlatformCounters(name=users_counter(row["user_type"], row["is_active"]), count=row["users_count"])
+                for row in users]
+            counters += [
+                PlatformCounters(name="products", count=Product.objects.order_by().count())
+                , PlatformCounters(name="services", count=Service.objects.order_by().count())
+            ]
+            signups = [MonthlySignups(month=row["month"].date(), count=row["users_count"]) for row in months]
+            
+            PlatformCounters.objects.all().delete()
+            MonthlySignups.objects.all().delete()
+            PlatformCounters.objects.bulk_create(counters)
+            MonthlySignups.objects.bulk_create(signups)
+        
+        self.stdout.write(f"{len(counters)} PlatformCounters and {len(signups)} MonthlySignups records rebuilt")
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.6 on 2026-10-18 20:05
+
+from django.db import migrations, models
+
+
+# same rows as the rebuild_platform_counters command
+FILL_PLATFORM_COUNTERS = """
+INSERT INTO users_platformcounters (name, count)
+SELECT 'users:' || user_type || CASE WHEN is_active THEN ':active' ELSE ':inactive' END, COUNT(*)
+FROM users_users
+GROUP BY 1
+UNION ALL
+SELECT 'products', COUNT(*) FROM products_product
+UNION ALL
+SELECT 'services', COUNT(*) FROM services_service
+"""
+
+FILL_MONTHLY_SIGNUPS = """
+INSERT INTO users_monthlysignups (month, count)
+SELECT date_trunc('month', date_joined)::date, COUNT(*)
+FROM users_users
+GROUP BY 1
+"""
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('users', '0001_initial'),
+        ('products', '0006_productratessummary'),
+        ('services', '0006_serviceratessummary'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='PlatformCounters',
+            fields=[
+                ('name', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MonthlySignups',
+            fields=[
+                ('month', models.DateField(primary_key=True, serialize=False)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunSQL(FILL_PLATFORM_COUNTERS, migrations.RunSQL.noop),
+        migrations.RunSQL(FILL_MONTHLY_SIGNUPS, migrations.RunSQL.noop),
+    ]
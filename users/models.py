@@ -4,7 +4,7 @@ from django.contrib.auth.models import (
 from django.contrib.auth.hashers import make_password
 from django.db.models.query import QuerySet
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 
 from typing import Any
 
@@ -73,6 +73,11 @@ class Users(AbstractBaseUser, PermissionsMixin):
     def __str__(self) -> str:
         return str(self.email)
     
+    def save(self, *args, **kwargs) -> None:
+        # users.signals locks the row in pre_save until the platform counters are updated in post_save
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+    
     @property
     def re_password(self):
         return 
@@ -143,3 +148,26 @@ class PasswordReset(models.Model):
     code = models.CharField(max_length=6, unique=True, null=False)
     ip_address = models.CharField(max_length=32, unique=True, null=False)
     user = models.OneToOneField(settings.AUTH_USER_MODEL, null=False, on_delete=models.CASCADE)
+
+
+class PlatformCounters(models.Model):
+    """
+    running counters of the platform analytics [name => count], users.analytics keeps them in sync
+    names: users:<user type>:active, users:<user type>:inactive, products, services
+    """
+    name = models.CharField(max_length=64, primary_key=True)
+    count = models.BigIntegerField(default=0)
+    
+    def __str__(self) -> str:
+        return f"{self.name} => {self.count}"
+
+
+class MonthlySignups(models.Model):
+    """
+    existing users per month they joined (the first day of the month), users.analytics keeps them in sync
+    """
+    month = models.DateField(primary_key=True)
+    count = models.IntegerField(default=0)
+    
+    def __str__(self) -> str:
+        return f"{self.month} => {self.count}"
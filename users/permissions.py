@@ -21,7 +21,7 @@ class HavePermission(permissions.BasePermission):
         codename = f"{action_name}_{model_name.lower()}"
         
         group = helpers.Groups()
-        result = group.has_permission(codename, request.user.groups.first())
+        result = group.has_permission(codename, helpers.user_group(request.user))
         
         return result
 
@@ -32,7 +32,7 @@ class ListServiceProvider(permissions.BasePermission):
         code_name = f"list_service_providers"
         
         group = helpers.Groups()
-        result = group.has_permission(code_name, request.user.groups.first())
+        result = group.has_permission(code_name, helpers.user_group(request.user))
         
         return result
 
@@ -51,7 +51,7 @@ class IsAdminOrOwner(permissions.BasePermission):
         codename = f"{action_name}_{model_name.lower()}"
         
         group = helpers.Groups()
-        result = group.has_permission(codename, request.user.groups.first())
+        result = group.has_permission(codename, helpers.user_group(request.user))
         
         return (request.user.is_staff or obj.id == request.user.id) and result
 
@@ -60,7 +60,7 @@ class HasListUsers(permissions.BasePermission):
     
     def has_permission(self, request: HttpRequest, view):
         group = helpers.Groups()
-        result = group.has_permission("list_users", request.user.groups.first())
+        result = group.has_permission("list_users", helpers.user_group(request.user))
         
         return result
 
@@ -0,0 +1,79 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from service_providers.models import ServiceProvider
+from products.models import Product
+from services.models import Service
+
+from .analytics import PlatformChanges, apply_platform_changes
+from .models import Users, SuperAdmins, Admins
+
+
+# (user type, is active) of the user before the update, memo from pre_save for post_save
+PREVIOUS_ATTRIBUTE = "_previous_counted_state"
+COUNTED_FIELDS = {"user_type", "is_active"}
+
+
+# the service providers (multi table child) and the proxies send the signals with their own class
+@receiver(pre_save, sender=Users)
+@receiver(pre_save, sender=SuperAdmins)
+@receiver(pre_save, sender=Admins)
+@receiver(pre_save, sender=ServiceProvider)
+def remember_counted_state(sender, instance: Users, raw: bool = False, update_fields=None, **kwargs):
+    if raw or instance.pk is None:
+        return
+    
+    # the login updates last_login only, nothing counted changes
+    if update_fields is not None and not COUNTED_FIELDS & set(update_fields):
+        return
+    
+    # locked until the save commits (Users.save is atomic): a concurrent save of the same user
+    # waits and then reads this one's state, so a transition is never counted twice
+    instance.__dict__[PREVIOUS_ATTRIBUTE] = Users.objects.select_for_update().filter(
+        pk=instance.pk).values_list("user_type", "is_active").first()
+
+
+@receiver(post_save, sender=Users)
+@receiver(post_save, sender=SuperAdmins)
+@receiver(post_save, sender=Admins)
+@receiver(post_save, sender=ServiceProvider)
+def count_saved_user(sender, instance: Users, created: bool, raw: bool = False, **kwargs):
+    if raw:
+        return
+    
+    previous = instance.__dict__.pop(PREVIOUS_ATTRIBUTE, None)
+    changes = PlatformChanges()
+    
+    if created:
+        changes.user(instance.user_type, instance.is_active, instance.date_joined)
+    elif previous is not None:
+        changes.user_changed(previous, (instance.user_type, instance.is_active))
+    
+    apply_platform_changes(changes)
+
+
+# deleting a service provider deletes its users row too, that one is counted
+@receiver(post_delete, sender=Users)
+@receiver(post_delete, sender=SuperAdmins)
+@receiver(post_delete, sender=Admins)
+def count_deleted_user(sender, instance: Users, **kwargs):
+    changes = PlatformChanges()
+    changes.user(instance.user_type, instance.is_active, instance.date_joined, sign=-1)
+    apply_platform_changes(changes)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Service)
+def count_created_catalog(sender, instance, created: bool, raw: bool = False, **kwargs):
+    if created and not raw:
+        changes = PlatformChanges()
+        changes.counters["products" if sender is Product else "services"] += 1
+        apply_platform_changes(changes)
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Service)
+def count_deleted_catalog(sender, instance, **kwargs):
+    changes = PlatformChanges()
+    changes.counters["products" if sender is Product else "services"] -= 1
+    apply_platform_changes(changes)
@@ -1,6 +1,9 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+
 from rest_framework.test import APIClient
 
 from hypothesis import given, strategies as st
@@ -8,7 +11,10 @@ from hypothesis.extra.django import TestCase
 from mixer.backend.django import mixer
 import pytest
 
+from datetime import date, datetime
+
 from service_providers.models import ServiceProvider
+from users.analytics import PlatformChanges, platform_stats
 from category.models import Category
 
 User = get_user_model()
@@ -166,3 +172,32 @@ class TestUsersAPIView(TestCase):
         
         assert response.status_code == 200
         # assert len(response.json()) == 2
+
+
+class TestPlatformChanges(TestCase):
+    def test_signup_counts_type_state_and_month(self):
+        changes = PlatformChanges()
+        changes.user("USER", False, datetime(2026, 10, 18, 12))
+        
+        assert changes.counters == {"users:USER:inactive": 1}
+        assert changes.months == {date(2026, 10, 1): 1}
+    
+    def test_activation_moves_one_count(self):
+        changes = PlatformChanges()
+        changes.user_changed(("SERVICE_PROVIDER", False), ("SERVICE_PROVIDER", True))
+        changes.user_changed(("USER", True), ("USER", True))
+        
+        assert changes.counters == {"users:SERVICE_PROVIDER:inactive": -1, "users:SERVICE_PROVIDER:active": 1}
+        assert not changes.months
+    
+    def test_activation_reads_the_previous_state_locked(self):
+        user = User.objects.create(
+            email="patient@test.com", phone="+971600000001", password="password", user_type="USER")
+        
+        user.is_active = True
+        with CaptureQueriesContext(connection) as context:
+            user.save()
+        
+        assert any(query["sql"].endswith("FOR UPDATE") for query in context.captured_queries)
+        assert platform_stats()["users_stats"]["active_patients"] == 1
+        assert platform_stats()["users_stats"]["non_active_patients"] == 0
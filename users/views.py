@@ -1,8 +1,7 @@
 from django.contrib.auth import get_user_model, authenticate
 from django.contrib.auth.hashers import make_password
-from django.db.models.functions import TruncMonth
 from django.core.mail import send_mail
-from django.db.models import Q, Count
+from django.db.models import Q
 from django.http import HttpRequest
 
 from rest_framework import permissions, decorators
@@ -17,13 +16,12 @@ from typing import Any
 
 from . import models, permissions as local_permissions
 from . import throttles as local_throttles
-from . import serializers, helpers
+from . import serializers, helpers, analytics
 
 from utils.permission import authorization_with_method, HasPermission
+from core.pagination_classes.cursor_paginator import cursor_paginated_response
 from service_providers.models import ServiceProvider
-from notification.models import Notification
-from products.models import Product
-from services.models import Service
+from notification.dispatcher import notify
 
 Users = get_user_model()
 
@@ -32,11 +30,10 @@ Users = get_user_model()
 @authorization_with_method("list", "users")
 def list_all_users(request: HttpRequest):
     """
-    get all users and show them to admins
+    get all users and show them to admins (cursor paginated)
     """
     queryset = Users.objects.filter()
-    serializer = serializers.UserSerializer(queryset, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    return cursor_paginated_response(request, queryset, serializers.UserSerializer, ordering="id")
 
 #
 class UsersView(generics.RetrieveUpdateDestroyAPIView):
@@ -60,7 +57,7 @@ class UsersView(generics.RetrieveUpdateDestroyAPIView):
     def perform_update(self, serializer):
         instance = serializer.save()
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=instance.email, receiver_type="User"
             , en_content="Your profile information updated successfully"
@@ -133,7 +130,7 @@ def accept_provider_account(request: HttpRequest, provider_id: int, respond: str
             , from_email="med-sal-adminstration@gmail.com"
             , recipient_list=[provider.user.email, ])
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System", receiver_type="Service_Provider", receiver=provider.user.email
             , en_content="Your account has been revised and activated, wellcome"
             , ar_content="تمت مراجعة حسابك و تفعيله, أهلاً وسهلاً")
@@ -161,7 +158,7 @@ class ServiceProviderRUD(generics.RetrieveUpdateDestroyAPIView):
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System"
             , receiver=instance.user.email, receiver_type="Service_Provider"
             , ar_content="تم تحديث معلومات حسابك بنجاح"
@@ -247,7 +244,7 @@ def email_confirmation(request: HttpRequest):
         if user_type == "Service_Provider":
             ar_content, en_content = "حسابك بانتظار المراجعة من قبل المشرفين", "Your account is under revision"
         
-        Notification.objects.create(
+        notify(
             sender="System", sender_type="System", receiver=user.email
             , receiver_type=user_type, ar_content=ar_content, en_content=en_content)
     
@@ -558,45 +555,13 @@ def logout(req: HttpRequest):
 
 
 @decorators.api_view(["GET", ])
-@decorators.permission_classes([])
-# @decorators.permission_classes([permissions.IsAdminUser, ])
+@decorators.permission_classes([permissions.IsAdminUser, ])
 def active_users_stats(req: HttpRequest):
-    users_diagram = Users.objects.annotate(month=TruncMonth("date_joined")).values(
-        "month").annotate(users_count=Count("id")).order_by("-month")
-    
-    products_stats, services_stats = Service.objects.all().count(), Product.objects.all().count()
-    
-    user_stats = Users.objects.all().aggregate(
-            active_service_providers=Count("id", filter=(Q(user_type="SERVICE_PROVIDER") & Q(is_active=True))),
-            active_super_admins=Count("id", filter=(Q(user_type="SUPER_ADMIN") & Q(is_active=True))),
-            active_admins=Count("id", filter=(Q(user_type="ADMIN") & Q(is_active=True))),
-            active_users=Count("id", filter=(Q(user_type="USER") & Q(is_active=True))),
-            all=Count("id"),
-            nonactive_service_providers=Count("id", filter=(Q(user_type="SERVICE_PROVIDER") & Q(is_active=False))),
-            nonactive_super_admins=Count("id", filter=(Q(user_type="SUPER_ADMIN") & Q(is_active=False))),
-            nonactive_admins=Count("id", filter=(Q(user_type="ADMIN") & Q(is_active=False))),
-            nonactive_users=Count("id", filter=(Q(user_type="USER") & Q(is_active=False)))
-        )
-    
-    response_data = {
-        "users_stats": {
-            "all_user": user_stats["all"], "active_patients": user_stats["active_users"],
-            "active_service_providers": user_stats["active_service_providers"],
-            "active_super_admins": user_stats["active_super_admins"],
-            "active_admins": user_stats["active_admins"],
-            "non_active_patients": user_stats["nonactive_users"],
-            "non_active_service_providers": user_stats["nonactive_service_providers"],
-            "non_active_super_admins": user_stats["nonactive_super_admins"],
-            "non_active_admins": user_stats["nonactive_admins"],
-            },
-        "services_&_products_stats": {
-            "products_number": products_stats,
-            "services_number": services_stats
-            },
-        "months_stats": [{key: query[key] for key in query} for query in users_diagram]
-        }
-    
-    return Response(data=response_data, status=status.HTTP_200_OK)
+    """
+    users per type and active state, products and services numbers and users per signup month
+    read from the running counters (users.analytics), not counted from the tables
+    """
+    return Response(data=analytics.platform_stats(), status=status.HTTP_200_OK)
 
 
 @decorators.api_view(["GET", ])
@@ -0,0 +1,101 @@
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework import exceptions
+
+from django.http import HttpRequest, StreamingHttpResponse
+from django.db.models import QuerySet
+from django.conf import settings
+
+from itertools import islice
+from typing import Any, Iterator, Optional
+import json
+import csv
+
+
+CONTENT_TYPES = {
+    "csv": "text/csv"
+    , "ndjson": "application/x-ndjson"
+}
+
+
+def export_format(request: HttpRequest) -> Optional[str]:
+    """
+    ?export=csv or ?export=ndjson, None for the normal (paginated) response
+    """
+    format = request.query_params.get("export")
+    if format is None:
+        return None
+    
+    if format not in CONTENT_TYPES:
+        raise exceptions.ValidationError({"error": f"export should be one of {list(CONTENT_TYPES)}"})
+    
+    return format
+
+
+class Echo:
+    """
+    the file the csv writer writes to, each row is returned instead of being kept
+    """
+    def write(self, value: str) -> str:
+        return value
+
+
+def flat(row: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """
+    nested objects become dotted columns, lists stay as json in one column
+    """
+    result = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            result.update(flat(value, f"{prefix}{key}."))
+        elif isinstance(value, list):
+            result[f"{prefix}{key}"] = json.dumps(value, cls=JSONEncoder, ensure_ascii=False)
+        else:
+            result[f"{prefix}{key}"] = value
+    
+    return result
+
+
+def serialized_rows(
+    queryset: QuerySet, serializer_class, chunk_size: int, **serializer_kwargs) -> Iterator[dict[str, Any]]:
+    """
+    the rows are read from a server side cursor and serialized chunk by chunk,
+    so only one chunk of records is in memory whatever the number of rows
+    """
+    if hasattr(serializer_class, "plan_queryset"):
+        queryset = serializer_class.plan_queryset(queryset)
+    
+    records = queryset.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(records, chunk_size)):
+        yield from serializer_class(chunk, many=True, **serializer_kwargs).data
+
+
+def csv_lines(rows: Iterator[dict[str, Any]]) -> Iterator[str]:
+    writer, header = csv.writer(Echo()), None
+    
+    for row in rows:
+        row = flat(row)
+        if header is None:
+            header = list(row)
+            yield writer.writerow(header)
+        
+        yield writer.writerow([row.get(column) for column in header])
+
+
+def ndjson_lines(rows: Iterator[dict[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, cls=JSONEncoder, ensure_ascii=False) + "\n"
+
+
+def streaming_export(
+    queryset: QuerySet, serializer_class, format: str, filename: str, **serializer_kwargs) -> StreamingHttpResponse:
+    """
+    streams the serialized queryset as csv or ndjson (one json object per line), ordered by id
+    """
+    chunk_size = settings.EXPORT["chunk_size"]
+    rows = serialized_rows(queryset.order_by("id"), serializer_class, chunk_size, **serializer_kwargs)
+    lines = csv_lines(rows) if format == "csv" else ndjson_lines(rows)
+    
+    response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES[format])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{format}"'
+    
+    return response
@@ -0,0 +1,124 @@
+from rest_framework import exceptions
+
+from django.contrib.gis.db.models import GeometryField, PointField
+from django.contrib.gis.measure import D
+from django.contrib.gis.geos import Point
+from django.db.models import BooleanField, F, FloatField, Func, Q, Value
+from django.conf import settings
+
+from typing import Optional
+
+
+"""
+the locations columns are geography(Point, 4326), so distances are in meters:
+- `within` is ST_DWithin, it prefilters with the GiST index (bounding boxes) before the exact distance
+- `distance_to` is the KNN operator <->, ordering by it walks the GiST index nearest first
+- `in_bbox` compares the planar points (location::geometry) with the viewport, through the
+  expression GiST index of that cast; a geography polygon would have great circle edges
+"""
+
+
+class KNNDistance(Func):
+    """
+    `location <-> point` in meters (on geography), index assisted in ORDER BY
+    """
+    arg_joiner = " <-> "
+    template = "%(expressions)s"
+    output_field = FloatField()
+
+
+class PlanarGeometry(Func):
+    """
+    `location::geometry`, the longitude/latitude plane of a geography column
+    """
+    template = "(%(expressions)s)::geometry"
+    output_field = GeometryField(srid=4326)
+
+
+class Envelope(Func):
+    """
+    `ST_MakeEnvelope(min x, min y, max x, max y, 4326)`, a planar rectangle
+    """
+    template = "ST_MakeEnvelope(%(expressions)s, 4326)"
+    output_field = GeometryField(srid=4326)
+
+
+class BBoxOverlaps(Func):
+    """
+    `a && b`, bounding boxes overlap, index assisted
+    """
+    arg_joiner = " && "
+    template = "%(expressions)s"
+    output_field = BooleanField()
+
+
+class Longitude(Func):
+    template = "ST_X(%(expressions)s::geometry)"
+    output_field = FloatField()
+
+
+class Latitude(Func):
+    template = "ST_Y(%(expressions)s::geometry)"
+    output_field = FloatField()
+
+
+def point_from(longitude, latitude) -> Point:
+    try:
+        return Point(float(longitude), float(latitude), srid=4326)
+    except (TypeError, ValueError):
+        raise exceptions.ValidationError({"error": "longitude and latitude should be numbers"})
+
+
+def radius_from(radius: Optional[str]) -> D:
+    """
+    ?radius=<meters>, the default one when not given, never more than the max one
+    """
+    radius = radius or settings.GEO_SEARCH["default_radius"]
+    try:
+        radius = float(radius)
+    except (TypeError, ValueError):
+        raise exceptions.ValidationError({"error": "radius should be a number of meters"})
+    
+    if radius <= 0:
+        raise exceptions.ValidationError({"error": "radius should be more than 0"})
+    
+    return D(m=min(radius, settings.GEO_SEARCH["max_radius"]))
+
+
+def bbox_from(bbox: Optional[str]) -> tuple[float, float, float, float]:
+    """
+    ?bbox=<min longitude>,<min latitude>,<max longitude>,<max latitude>
+    """
+    try:
+        min_x, min_y, max_x, max_y = (float(value) for value in bbox.split(","))
+    except (AttributeError, ValueError):
+        raise exceptions.ValidationError(
+            {"error": "bbox should be min_longitude,min_latitude,max_longitude,max_latitude"})
+    
+    if min_x >= max_x or min_y >= max_y:
+        raise exceptions.ValidationError({"error": "bbox minimums should be less than its maximums"})
+    
+    return min_x, min_y, max_x, max_y
+
+
+def in_bbox(field: str, bbox: tuple[float, float, float, float]) -> Q:
+    """
+    the points inside the viewport, its edges are lines of constant longitude and latitude
+    (for a point its bounding box is the point, so the overlap is exact)
+    """
+    return Q(BBoxOverlaps(PlanarGeometry(field), Envelope(*[Value(float(value)) for value in bbox])))
+
+
+def grid_cell_size(zoom: int) -> float:
+    """
+    degrees, `cluster_cells_per_tile` cells across a web map tile at this zoom
+    """
+    return 360 / 2 ** zoom / settings.GEO_SEARCH["cluster_cells_per_tile"]
+
+
+def within(field: str, point: Point, radius: D) -> Q:
+    return Q(**{f"{field}__dwithin": (point, radius)})
+
+
+def distance_to(field: str, point: Point) -> KNNDistance:
+    return KNNDistance(F(field), Value(point, output_field=PointField(srid=4326, geography=True)))
@@ -29,7 +29,7 @@ class HasPermission(permissions.BasePermission):
         codename = f"{method_name}_{self.model_name.lower()}"
         
         group = helpers.Groups()
-        result = group.has_permission(codename, request.user.groups.first())
+        result = group.has_permission(codename, helpers.user_group(request.user))
         return result
 
 class HasPermissionAndOwner(permissions.BasePermission):
@@ -63,7 +63,7 @@ class HasPermissionAndOwner(permissions.BasePermission):
         codename = f"{method_name}_{self.model_name.lower()}"
         
         group = helpers.Groups()
-        result = group.has_permission(codename, request.user.groups.first())
+        result = group.has_permission(codename, helpers.user_group(request.user))
         return result
 
 
@@ -81,7 +81,7 @@ def authorization(model_name: str):
             codename = f"{method_name}_{model_name}"
             
             group = helpers.Groups()
-            result = group.has_permission(codename, request.user.groups.first())
+            result = group.has_permission(codename, helpers.user_group(request.user))
             if result is True:
                 return original_func(*args, **kwargs)
             
@@ -105,7 +105,7 @@ def authorization_with_method(method_name: str, model_name: str):
             codename = f"{method_name}_{model_name}"
             
             group = helpers.Groups()
-            result = group.has_permission(codename, request.user.groups.first())
+            result = group.has_permission(codename, helpers.user_group(request.user))
             if result is True:
                 return original_func(*args, **kwargs)
             
@@ -0,0 +1,41 @@
+from django.db.models import Manager, QuerySet
+
+
+class RelatedPathsMixin:
+    """
+    serializers declare the relations their to_representation reads:
+        select_related_paths = ("order__patient", "product")
+        prefetch_related_paths = ("items", )
+    
+    a queryset given to the serializer with many=True gets them before it's evaluated,
+    so a list costs the same queries whatever the number of rows;
+    views that slice the queryset first (pagination) call plan_queryset themselves
+    """
+    select_related_paths: tuple[str, ...] = ()
+    prefetch_related_paths: tuple[str, ...] = ()
+    
+    @classmethod
+    def plan_queryset(cls, queryset: QuerySet | Manager) -> QuerySet:
+        if isinstance(queryset, Manager):
+            queryset = queryset.all()
+        
+        # an evaluated (or prefetched) queryset would be fetched again by a clone
+        if queryset._result_cache is not None:
+            return queryset
+        
+        if cls.select_related_paths:
+            queryset = queryset.select_related(*cls.select_related_paths)
+        
+        if cls.prefetch_related_paths:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_paths)
+        
+        return queryset
+    
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        if args and isinstance(args[0], (QuerySet, Manager)):
+            args = (cls.plan_queryset(args[0]), *args[1:])
+        elif isinstance(kwargs.get("instance"), (QuerySet, Manager)):
+            kwargs["instance"] = cls.plan_queryset(kwargs["instance"])
+        
+        return super().many_init(*args, **kwargs)
@@ -0,0 +1,53 @@
+from django.db.models import Count, Sum, Q
+from django.db import models
+
+from typing import Any
+
+
+STARS = range(6)
+
+
+class RatesSummary(models.Model):
+    """
+    abstract table for precomputed rates [count per star, sum, average]
+    concrete tables add a one to one field to the rated model
+    """
+    stars_0 = models.PositiveIntegerField(default=0)
+    stars_1 = models.PositiveIntegerField(default=0)
+    stars_2 = models.PositiveIntegerField(default=0)
+    stars_3 = models.PositiveIntegerField(default=0)
+    stars_4 = models.PositiveIntegerField(default=0)
+    stars_5 = models.PositiveIntegerField(default=0)
+    rates_count = models.PositiveIntegerField(default=0)
+    rates_sum = models.PositiveIntegerField(default=0)
+    average_rate = models.FloatField(default=0)
+    
+    class Meta:
+        abstract = True
+    
+    def stars(self, star: int) -> int:
+        return getattr(self, f"stars_{star}")
+
+
+def rates_aggregations(prefix: str = "") -> dict[str, Any]:
+    """
+    aggregation expressions that fill a RatesSummary record
+    prefix is the lookup path to the rates table (ex: "product_rates__")
+    """
+    rate = f"{prefix}rate"
+    
+    aggregations = {f"stars_{star}": Count(rate, filter=Q(**{rate: star})) for star in STARS}
+    aggregations["rates_count"] = Count(rate)
+    aggregations["rates_sum"] = Sum(rate, default=0)
+    
+    return aggregations
+
+
+def summary_fields(stats: dict[str, Any]) -> dict[str, Any]:
+    """
+    takes the result of rates_aggregations and adds the average rate
+    """
+    fields = {key: stats[key] for key in rates_aggregations()}
+    fields["average_rate"] = fields["rates_sum"] / fields["rates_count"] if fields["rates_count"] else 0
+    
+    return fields
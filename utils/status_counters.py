@@ -0,0 +1,110 @@
+from django.db import connection
+from django.db import models
+from django.conf import settings
+
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from typing import Any, Optional
+from zoneinfo import ZoneInfo
+
+
+STATUSES = ("pending", "accepted", "rejected")
+
+
+class StatusCounters(models.Model):
+    """
+    abstract table for per provider counters [all, count per status, created on the last day]
+    concrete tables add a one to one `provider` field, the dashboards read one row instead of
+    counting the provider whole history
+    """
+    all_count = models.IntegerField(default=0)
+    pending = models.IntegerField(default=0)
+    accepted = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+    # day_count records were created on day, older days are not kept
+    day = models.DateField(null=True)
+    day_count = models.IntegerField(default=0)
+    
+    class Meta:
+        abstract = True
+    
+    def today(self, today: date) -> int:
+        return self.day_count if self.day == today else 0
+
+
+class Changes:
+    """
+    counters deltas of status transitions, grouped by provider and written by apply_changes
+    a None status is a record that doesn't exist (before its creation, after its deletion)
+    """
+    
+    def __init__(self) -> None:
+        self.deltas: defaultdict[int, Counter] = defaultdict(Counter)
+    
+    def transition(self, provider_id: int, old: Optional[str], new: Optional[str], count: int = 1) -> None:
+        if old == new:
+            return
+        
+        deltas = self.deltas[provider_id]
+        if old is None:
+            deltas["all_count"] += count
+            deltas["day_count"] += count
+        else:
+            deltas[old.lower()] -= count
+        
+        if new is None:
+            deltas["all_count"] -= count
+        else:
+            deltas[new.lower()] += count
+
+
+def local_today() -> date:
+    return datetime.now(ZoneInfo(settings.TIME_ZONE)).date()
+
+
+def apply_changes(model: type[StatusCounters], changes: Changes, today: date, create: bool = True) -> None:
+    """
+    adds the deltas to the providers counters in one query, the day count restarts on a new day
+    without create the missing counters are not inserted (the provider may be in the middle of a cascade delete)
+    """
+    rows = [(provider_id, deltas) for provider_id, deltas in changes.deltas.items() if any(deltas.values())]
+    if not rows:
+        return
+    
+    columns = ("all_count", *STATUSES, "day_count")
+    table = connection.ops.quote_name(model._meta.db_table)
+    values = ", ".join(["(%s, %s, %s, %s, %s, %s, %s::date)"] * len(rows))
+    params = [
+        value for provider_id, deltas in rows
+        for value in (provider_id, *[deltas[column] for column in columns], today)]
+    
+    def assignments(current: str, change: str) -> str:
+        return (
+            ", ".join(f"{column} = {current}.{column} + {change}.{column}" for column in columns[:-1])
+            + f", day_count = CASE WHEN {change}.day_count = 0 THEN {current}.day_count"
+            f" WHEN {current}.day = {change}.day THEN {current}.day_count + {change}.day_count"
+            f" ELSE {change}.day_count END"
+            f", day = CASE WHEN {change}.day_count = 0 THEN {current}.day ELSE {change}.day END")
+    
+    if create:
+        sql = (
+            f"INSERT INTO {table} (provider_id, {', '.join(columns)}, day) VALUES {values} "
+            f"ON CONFLICT (provider_id) DO UPDATE SET {assignments(table, 'EXCLUDED')}")
+    else:
+        sql = (
+            f"UPDATE {table} SET {assignments(table, 'change')} "
+            f"FROM (VALUES {values}) AS change (provider_id, {', '.join(columns)}, day) "
+            f"WHERE {table}.provider_id = change.provider_id")
+    
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def counts_of(model: type[StatusCounters], provider_id: int, today: date) -> dict[str, Any]:
+    counters = model.objects.filter(provider=provider_id).first() or model()
+    
+    return {
+        "all": counters.all_count
+        , "today": counters.today(today)
+        , **{status: getattr(counters, status) for status in STATUSES}
+    }
@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+
+from datetime import time
+from decimal import Decimal
+
+from category.models import Category
+from service_providers.models import ServiceProvider, ServiceProviderLocations
+from products.models import Product
+from services.models import Service
+
+Users = get_user_model()
+
+
+def create_provider(category: Category, number: int = 1, **fields) -> int:
+    """
+    a service provider and its users row, `number` keeps the unique fields apart, returns its id
+    ServiceProvider is a multi table child of Users, saved raw on its users row (as benchmarks.dataset)
+    """
+    user = Users.objects.create(
+        email=f"provider_{number}@test.com", phone=f"+9714{number:08d}", password="password"
+        , user_type="SERVICE_PROVIDER", is_active=True)
+    ServiceProvider(
+        users_ptr_id=user.id, user_id=user.id, category=category
+        , business_name=f"provider {number}", bank_name="bank"
+        , iban=f"AE{number:020d}", swift_code=f"TEST{number:04d}", **fields
+        ).save_base(raw=True)
+    
+    return user.id
+
+
+def create_location(
+    provider_id: int, longitude: float = 55.27, latitude: float = 25.2
+    , opening: time = time(8), closing: time = time(20)) -> ServiceProviderLocations:
+    return ServiceProviderLocations.objects.create(
+        service_provider_id=provider_id, location=Point(longitude, latitude, srid=4326)
+        , opening=opening, closing=closing, crew="crew")
+
+
+def create_product(
+    location: ServiceProviderLocations, quantity: int = 1, price: str = "10.00", en_title: str = "product"
+    ) -> Product:
+    return Product.objects.create(
+        service_provider_location=location, quantity=quantity
+        , en_title=en_title, ar_title="منتج", en_description="product", ar_description="منتج"
+        , images="", price=Decimal(price))
+
+
+def create_service(
+    location: ServiceProviderLocations, category: Category, price: str = "20.00", en_title: str = "service"
+    ) -> Service:
+    return Service.objects.create(
+        provider_location=location, category=category
+        , en_title=en_title, ar_title="خدمة", en_description="service", ar_description="خدمة"
+        , image="", price=Decimal(price))